@@ -0,0 +1,217 @@
+"""
+Offline agent benchmark suite.
+
+Replaces Gemini with the deterministic ScriptedChatModel and measures, for
+the example scenarios of the CLI:
+  framework_overhead - AgentExecutor cost per LLM step with a zero-latency model
+  callback_cost      - extra cost of the logging / capture / streaming handlers
+  tool_dispatch      - LangChain tool invocation cost over the raw function
+  throughput         - end-to-end /agent/execute requests per second through
+                       an in-process ASGI transport
+
+No network access is needed. The JSON report is meant to be diffed across
+commits.
+
+Usage:
+    python scripts/benchmark_agent.py [--iterations 20] [--requests 200]
+                                      [--concurrency 16] [--output report.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+
+from src.core.agent import (
+    CaptureCallbackHandler, CustomCallbackHandler, StreamingCallbackHandler, SynapseAgent
+)
+from src.core.pool import init_agent_pool
+from src.core.scripted_llm import DEFAULT_SCRIPTS, ScriptedChatModel
+from src.main import EXAMPLE_SCENARIOS
+from src.tools.registry import TOOLS_BY_NAME, clear_tool_caches
+
+
+def _stats(samples: list) -> dict:
+    """Summarise millisecond samples."""
+    ordered = sorted(samples)
+    return {
+        "mean_ms": round(statistics.mean(ordered), 4),
+        "p50_ms": round(statistics.median(ordered), 4),
+        "p95_ms": round(ordered[max(0, int(len(ordered) * 0.95) - 1)], 4),
+        "samples": len(ordered)
+    }
+
+
+def build_agent() -> SynapseAgent:
+    """An agent on the scripted model that always takes the LLM path."""
+    agent = SynapseAgent(llm=ScriptedChatModel())
+    agent.router = None
+    return agent
+
+
+async def _timed_run(agent: SynapseAgent, scenario: str, callbacks: list) -> float:
+    start = time.perf_counter()
+    await agent.agent_executor.ainvoke({"input": scenario}, config={"callbacks": callbacks})
+    return (time.perf_counter() - start) * 1000
+
+
+async def bench_framework_overhead(iterations: int) -> dict:
+    """Executor cost per LLM step with no handlers and an instant model."""
+    agent = build_agent()
+    agent.agent_executor.callbacks = []
+    results = {}
+    for scenario in EXAMPLE_SCENARIOS:
+        steps = len(agent.llm._script_for(scenario)) + 1
+        samples = [await _timed_run(agent, scenario, []) for _ in range(iterations)]
+        summary = _stats(samples)
+        summary["llm_steps"] = steps
+        summary["per_step_ms"] = round(summary["p50_ms"] / steps, 4)
+        results[scenario] = summary
+    return results
+
+
+async def bench_callback_cost(iterations: int) -> dict:
+    """Added latency per scenario for each handler configuration."""
+    agent = build_agent()
+    agent.agent_executor.callbacks = []
+    variants = {
+        "none": lambda: [],
+        "logging": lambda: [CustomCallbackHandler()],
+        "capture": lambda: [CaptureCallbackHandler()],
+        "capture+streaming": lambda: [CaptureCallbackHandler(), StreamingCallbackHandler()],
+    }
+    results = {}
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        for name, handlers in variants.items():
+            samples = []
+            for _ in range(iterations):
+                for scenario in EXAMPLE_SCENARIOS:
+                    samples.append(await _timed_run(agent, scenario, handlers()))
+            results[name] = _stats(samples)
+    baseline = results["none"]["p50_ms"]
+    for summary in results.values():
+        summary["added_p50_ms"] = round(summary["p50_ms"] - baseline, 4)
+    return results
+
+
+async def bench_tool_dispatch(iterations: int) -> dict:
+    """LangChain invocation overhead per tool compared with calling the function."""
+    sample_args = {}
+    for _, steps in DEFAULT_SCRIPTS:
+        for step in steps:
+            for name, args in step:
+                sample_args.setdefault(name, {k: v.replace("{observation}", "") for k, v in args.items()})
+
+    results = {}
+    for name, args in sorted(sample_args.items()):
+        tool = TOOLS_BY_NAME[name]
+        raw, dispatched = [], []
+        for _ in range(iterations):
+            clear_tool_caches()
+            start = time.perf_counter()
+            tool.func(**args)
+            raw.append((time.perf_counter() - start) * 1000)
+
+            clear_tool_caches()
+            start = time.perf_counter()
+            await tool.ainvoke(args)
+            dispatched.append((time.perf_counter() - start) * 1000)
+        results[name] = {
+            "raw_p50_ms": round(statistics.median(raw), 4),
+            "ainvoke_p50_ms": round(statistics.median(dispatched), 4),
+            "dispatch_overhead_ms": round(statistics.median(dispatched) - statistics.median(raw), 4)
+        }
+    return results
+
+
+async def bench_throughput(requests: int, concurrency: int) -> dict:
+    """End-to-end /agent/execute throughput through an in-process ASGI transport."""
+    from src.mcp.server import app
+
+    gate = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def one(i: int):
+            async with gate:
+                start = time.perf_counter()
+                response = await client.post(
+                    "/agent/execute", json={"scenario": EXAMPLE_SCENARIOS[i % len(EXAMPLE_SCENARIOS)]}
+                )
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            init_agent_pool(factory=build_agent)
+            start = time.perf_counter()
+            await asyncio.gather(*[one(i) for i in range(requests)])
+            elapsed = time.perf_counter() - start
+
+    summary = _stats(latencies)
+    summary["requests"] = requests
+    summary["concurrency"] = concurrency
+    summary["requests_per_second"] = round(requests / elapsed, 2)
+    return summary
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=project_root,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+async def run(args) -> dict:
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "iterations": args.iterations
+        }
+    }
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        report["framework_overhead"] = await bench_framework_overhead(args.iterations)
+        report["tool_dispatch"] = await bench_tool_dispatch(args.iterations)
+    report["callback_cost"] = await bench_callback_cost(args.iterations)
+    report["throughput"] = await bench_throughput(args.requests, args.concurrency)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+        print(f"Report written to {args.output}")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
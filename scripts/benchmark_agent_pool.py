@@ -0,0 +1,72 @@
+"""
+Benchmark per-request agent setup: building a fresh SynapseAgent (cold)
+versus taking a pre-built one from the shared AgentPool (warm).
+
+Usage:
+    python scripts/benchmark_agent_pool.py [--iterations 50] [--pool-size 2]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Building the agent never calls the API, so a placeholder key is enough offline
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-placeholder-key")
+
+from src.core.agent import SynapseAgent
+from src.core.pool import AgentPool
+
+
+def _summarise(label: str, samples_ms: list):
+    """Print mean / p50 / p95 for a list of millisecond samples."""
+    ordered = sorted(samples_ms)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(f"{label:<8} mean={statistics.mean(ordered):9.3f} ms  "
+          f"p50={statistics.median(ordered):9.3f} ms  p95={p95:9.3f} ms")
+
+
+def bench_cold(iterations: int) -> list:
+    """Time the old per-request path: a new agent for every request."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        SynapseAgent()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def bench_warm(iterations: int, pool: AgentPool) -> list:
+    """Time the pooled path: hand out an already-built agent."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        pool.acquire()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--pool-size", type=int, default=2)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    pool = AgentPool(size=args.pool_size)
+    warmup_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Pool warm-up ({pool.size} agents): {warmup_ms:.1f} ms (paid once at startup)")
+    _summarise("cold", bench_cold(args.iterations))
+    _summarise("warm", bench_warm(args.iterations, pool))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,99 @@
+"""
+Measure /tools throughput: per-request listing vs the precomputed catalog.
+
+Three variants are timed in-process through an ASGI transport:
+
+- legacy: the listing dict is rebuilt and serialised with JSONResponse on
+  every request (the server's behaviour before the catalog)
+- cached: the precomputed orjson body is returned with its ETag (200)
+- revalidated: the client sends If-None-Match and gets an empty 304
+
+Usage:
+    python scripts/benchmark_catalog.py [--requests 2000] [--concurrency 20]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+
+async def _measure(client, path: str, requests: int, concurrency: int, headers=None):
+    """Return (requests per second, latencies ms, response bytes)."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, sizes = [], []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+            sizes.append(len(response.content))
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one() for _ in range(requests)])
+    return requests / (time.perf_counter() - start), latencies, sizes[0]
+
+
+async def run(args) -> int:
+    import httpx
+    from fastapi import Request
+    from fastapi.responses import JSONResponse
+
+    from src.mcp.catalog import get_tool_catalog
+    from src.mcp.server import app
+    from src.tools.registry import ALL_TOOLS
+
+    @app.get("/benchmark/legacy-tools", response_class=JSONResponse)
+    async def legacy_tools(request: Request):
+        tools_info = {}
+        for tool in ALL_TOOLS:
+            tools_info[tool.name] = {
+                "description": tool.description,
+                "args": getattr(tool, 'args', {})
+            }
+        return JSONResponse(tools_info)
+
+    etag = get_tool_catalog().tools.etag
+    variants = [
+        ("legacy", "/benchmark/legacy-tools", None),
+        ("cached", "/tools", None),
+        ("revalidated", "/tools", {"If-None-Match": etag}),
+    ]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{args.requests} GETs per variant, {args.concurrency} concurrent\n")
+        print(f"{'variant':>12} {'req/s':>9} {'speedup':>8} {'p50 ms':>8} {'p99 ms':>8} {'bytes':>7}")
+        baseline = None
+        for name, path, headers in variants:
+            # Warm up the route before timing it
+            await _measure(client, path, 50, args.concurrency, headers)
+            rps, latencies, size = await _measure(client, path, args.requests, args.concurrency, headers)
+            baseline = baseline or rps
+            latencies.sort()
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            print(f"{name:>12} {rps:9.0f} {rps / baseline:7.2f}x {statistics.median(latencies):8.2f} "
+                  f"{p99:8.2f} {size:7d}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    os.environ.setdefault("LLM_PROVIDER", "scripted")
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    exit(main())
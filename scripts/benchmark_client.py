@@ -0,0 +1,83 @@
+"""
+Micro-benchmark the per-call overhead of the synchronous MCP client helpers.
+
+Starts the MCP server in-process on a local port and compares:
+  before - asyncio.run() plus a new SynapseMCPClient for every call
+  after  - sync_* helpers on the shared background loop and pooled client
+
+Usage:
+    python scripts/benchmark_client.py [--calls 200] [--port 8765]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import uvicorn
+
+from src.core.config import Config
+from src.mcp.client import SynapseMCPClient, sync_traffic_check
+
+
+def start_server(port: int) -> uvicorn.Server:
+    """Run the MCP server on a daemon thread and wait until it accepts requests."""
+    from src.mcp.server import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="error"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def call_before(route: str) -> str:
+    """The previous sync wrapper: a fresh event loop and client per call."""
+    async def call():
+        async with SynapseMCPClient() as client:
+            return await client.call_tool("check_traffic", route=route)
+    return asyncio.run(call())
+
+
+def measure(label: str, fn, calls: int):
+    """Time ``calls`` sequential invocations and print a summary."""
+    fn("warm-up")
+    samples = []
+    for i in range(calls):
+        start = time.perf_counter()
+        fn(f"route-{i}")
+        samples.append((time.perf_counter() - start) * 1000)
+    ordered = sorted(samples)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(f"{label:<7} mean={statistics.mean(ordered):7.3f} ms  "
+          f"p50={statistics.median(ordered):7.3f} ms  p95={p95:7.3f} ms")
+    return statistics.mean(ordered)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    # Point the default client URL at the benchmark server
+    Config.MCP_SERVER_PORT = args.port
+    server = start_server(args.port)
+
+    before = measure("before", call_before, args.calls)
+    after = measure("after", sync_traffic_check, args.calls)
+    print(f"\nPer-call overhead saved: {before - after:.3f} ms ({before / after:.1f}x faster)")
+
+    server.should_exit = True
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,87 @@
+"""
+Benchmark scenario latency on the deterministic fast path versus the full
+LLM agent for the rule-bound scenario classes.
+
+The fast path always runs offline. The agent path needs a real
+GOOGLE_API_KEY and is skipped without one (or with --fast-only).
+
+Usage:
+    python scripts/benchmark_fast_path.py [--iterations 20] [--fast-only]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.router import FastPathRouter
+
+SCENARIOS = [
+    "Customer C-1042 says the delivery OTP never arrived; driver D-77 is waiting at the door",
+    "Customer CUST-3107: driver cannot find the address: Room 301, Near big temple",
+    "Customer CUST-2001 says driver DRV-88 never arrived but marked as failed delivery",
+]
+
+
+async def time_fast_path(router: FastPathRouter, scenario: str, iterations: int) -> list:
+    """Time the fast path for one scenario."""
+    route = router.classify(scenario)
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await router.resolve(route, scenario)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def time_agent_path(agent, scenario: str, iterations: int) -> list:
+    """Time the full agent (LLM) path for one scenario."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await agent.process_scenario(scenario)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def run(iterations: int, fast_only: bool):
+    router = FastPathRouter()
+
+    agent = None
+    if not fast_only and os.getenv("GOOGLE_API_KEY"):
+        from src.core.agent import SynapseAgent
+        agent = SynapseAgent()
+        agent.router = None  # force every scenario through the LLM
+
+    print(f"{'route':<22} {'fast p50 ms':>12} {'agent p50 ms':>14} {'speed-up':>10}")
+    for scenario in SCENARIOS:
+        route = router.classify(scenario)
+        fast = statistics.median(await time_fast_path(router, scenario, iterations))
+        if agent:
+            slow = statistics.median(await time_agent_path(agent, scenario, max(1, iterations // 10)))
+            print(f"{route.name:<22} {fast:12.3f} {slow:14.1f} {slow / fast:9.0f}x")
+        else:
+            print(f"{route.name:<22} {fast:12.3f} {'skipped':>14} {'-':>10}")
+
+    if not agent:
+        print("\nAgent path skipped (set GOOGLE_API_KEY and omit --fast-only to compare).")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--fast-only", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations, args.fast_only))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,89 @@
+"""
+Measure the caller-side cost of a log call: the queue-backed logger versus
+the previous synchronous print() to stdout.
+
+stdout is redirected to a pipe drained by a separate thread, so both
+variants pay for a real file descriptor write.
+
+Usage:
+    python scripts/benchmark_logging.py [--calls 100000]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils import logger
+from src.utils.logger import bcolors, configure_logging, flush_logs, log_tool_call
+
+
+def print_tool_call(tool_name: str, tool_input: str):
+    """The previous synchronous implementation of log_tool_call."""
+    print(f"\n{bcolors.WARNING}{bcolors.BOLD}🛠️ Calling Tool: {tool_name}")
+    if tool_input:
+        print(f"{bcolors.WARNING}   Input: {tool_input}")
+
+
+def per_call_us(fn, calls: int) -> float:
+    """
+    Average caller-side microseconds per call.
+
+    Calls are issued in bursts that fit in the log queue, and the queue is
+    drained between bursts outside the timed region, so no record is dropped.
+    """
+    tool_input = {"merchant_name": "Pizza Palace"}
+    burst = max(1, logger._writer.queue.maxsize // 2)
+    elapsed = 0.0
+    remaining = calls
+    while remaining:
+        size = min(burst, remaining)
+        start = time.perf_counter()
+        for _ in range(size):
+            fn("get_merchant_status", tool_input)
+        elapsed += time.perf_counter() - start
+        remaining -= size
+        flush_logs()
+    return elapsed / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100000)
+    args = parser.parse_args()
+
+    # Send stdout into a pipe that another thread drains, like a container log pipe
+    read_fd, write_fd = os.pipe()
+    threading.Thread(target=lambda: [None for _ in iter(lambda: os.read(read_fd, 65536), b"")],
+                     daemon=True).start()
+    real_stdout = sys.stdout
+    sys.stdout = os.fdopen(write_fd, "w", buffering=1, encoding="utf-8")
+
+    results = {}
+    try:
+        results["print (before)"] = per_call_us(print_tool_call, args.calls)
+        for mode in ("cli", "json"):
+            configure_logging(mode=mode, sample_rate=1.0)
+            results[f"queued {mode}"] = per_call_us(log_tool_call, args.calls)
+            flush_logs()
+        configure_logging(sample_rate=0.1)
+        results["queued, 10% sampled"] = per_call_us(log_tool_call, args.calls)
+        flush_logs()
+    finally:
+        sys.stdout.flush()
+        sys.stdout = real_stdout
+
+    for label, value in results.items():
+        print(f"{label:<22} {value:8.2f} us/call")
+    print(f"\nRecords dropped on a full queue: {logger._writer.dropped}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,116 @@
+"""
+Benchmark concurrent versus sequential execution of same-step tool calls.
+
+A scripted model emits two agent steps with several independent tool calls
+each (merchant status, traffic and alternatives, then notify and reroute).
+Every tool is slowed down by --tool-latency seconds to simulate real
+backends. The same executor then runs with the tool pool in sequential
+mode (one worker) and in parallel mode (PARALLEL_TOOL_CALLS). The script
+checks that both modes capture the same calls, in the same order, all
+successful.
+
+Usage:
+    python scripts/benchmark_parallel_tools.py [--tool-latency 0.2] [--iterations 5]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from langchain.agents import AgentExecutor, create_tool_calling_agent
+
+from src.core.agent import CaptureCallbackHandler
+from src.core.config import Config
+from src.core.prompts import create_agent_prompt
+from src.core.scripted_llm import ScriptedChatModel
+from src.tools.base import configure_tool_executor, rewrap_tool
+from src.tools.registry import TOOLS_BY_NAME
+
+SCENARIO = "Order delayed: restaurant is overloaded and there is traffic on the route"
+
+STEPS = [
+    [("get_merchant_status", {"merchant_name": "Pizza Palace"}),
+     ("check_traffic", {"route": "Pizza Palace to Customer"}),
+     ("get_nearby_merchants", {"cuisine_type": "Italian"})],
+    [("notify_customer", {"customer_id": "CUST-001", "message": "Your order is running late."}),
+     ("reroute_driver", {"driver_id": "DRV-001", "new_task_description": "Pick up a nearby order."})],
+]
+
+
+def slow_tools(latency: float) -> list:
+    """The scripted tools with a fixed blocking delay added to each call."""
+    tools = []
+    for name in {name for step in STEPS for name, _ in step}:
+        tool = TOOLS_BY_NAME[name]
+
+        def run(_func=tool.func, **kwargs):
+            time.sleep(latency)
+            return _func(**kwargs)
+
+        tools.append(rewrap_tool(tool, run))
+    return tools
+
+
+def build_executor(latency: float) -> AgentExecutor:
+    tools = slow_tools(latency)
+    llm = ScriptedChatModel(scripts=[(r".*", STEPS)])
+    agent = create_tool_calling_agent(llm, tools, create_agent_prompt(tools))
+    return AgentExecutor(agent=agent, tools=tools, verbose=False)
+
+
+async def run_mode(executor: AgentExecutor, parallel: bool, iterations: int):
+    """Return (latency samples in ms, captured calls of the last run)."""
+    configure_tool_executor(parallel=parallel)
+    samples, calls = [], []
+    for _ in range(iterations):
+        capture = CaptureCallbackHandler()
+        start = time.perf_counter()
+        await executor.ainvoke({"input": SCENARIO}, config={"callbacks": [capture]})
+        samples.append((time.perf_counter() - start) * 1000)
+        calls = [(execution["tool"], execution["status"]) for execution in capture.finalize()]
+    return samples, calls
+
+
+async def run(latency: float, iterations: int) -> int:
+    executor = build_executor(latency)
+    expected = [(name, "success") for step in STEPS for name, _ in step]
+
+    results = {}
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        for mode, parallel in (("sequential", False), ("parallel", True)):
+            results[mode] = await run_mode(executor, parallel, iterations)
+    configure_tool_executor()
+
+    calls_per_step = [len(step) for step in STEPS]
+    print(f"Tool latency {latency * 1000:.0f} ms, calls per step {calls_per_step}, "
+          f"pool size {Config.TOOL_EXECUTOR_WORKERS}\n")
+    print(f"{'mode':<12} {'p50 ms':>9} {'per step ms':>12} {'calls ok':>9}")
+    for mode, (samples, calls) in results.items():
+        p50 = statistics.median(samples)
+        print(f"{mode:<12} {p50:9.1f} {p50 / len(STEPS):12.1f} {str(calls == expected):>9}")
+
+    sequential = statistics.median(results["sequential"][0])
+    parallel = statistics.median(results["parallel"][0])
+    print(f"\nStep latency reduction: {1 - parallel / sequential:.0%} ({sequential / parallel:.1f}x)")
+    return 0 if all(calls == expected for _, calls in results.values()) else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tool-latency", type=float, default=0.2, help="Seconds added to every tool call")
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+    return asyncio.run(run(args.tool_latency, args.iterations))
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,183 @@
+"""
+Exercise tool timeouts, hedging and circuit breakers against fake backends.
+
+A local fake backend answers with a heavy-tailed latency distribution
+(most calls fast, a few percent stuck for seconds), and can be switched
+into an outage. The same calls are run through resilient_tool with:
+- no deadline;
+- a deadline;
+- a deadline plus hedging.
+The script reports p50/p99 latency and the number of degraded answers for
+each. It then takes the backend down to show the circuit opening and
+failing fast, and brings it back to show half-open recovery.
+
+Exits with status 1 if hedging does not cut p99 or the breaker does not
+open and recover.
+
+Usage:
+    python scripts/benchmark_resilience.py [--calls 1000] [--concurrency 50] [--seed 7]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from langchain_core.tools import StructuredTool
+
+from src.core.config import Config
+from src.tools.base import is_degraded
+from src.tools.resilience import CIRCUIT_BREAKERS, resilient_tool
+
+
+class FakeBackend:
+    """Async backend with injected latency distribution and outages."""
+
+    def __init__(self, seed: int, fast: float = 0.02, slow: float = 2.0, slow_ratio: float = 0.05):
+        self.rng = random.Random(seed)
+        self.fast = fast
+        self.slow = slow
+        self.slow_ratio = slow_ratio
+        self.down = False
+        self.calls = 0
+
+    async def lookup(self, area: str) -> str:
+        self.calls += 1
+        if self.down:
+            await asyncio.sleep(self.fast)
+            raise ConnectionError("backend unavailable")
+        if self.rng.random() < self.slow_ratio:
+            delay = self.slow * self.rng.uniform(0.5, 1.5)
+        else:
+            delay = self.rng.lognormvariate(0, 0.4) * self.fast
+        await asyncio.sleep(delay)
+        return f"Traffic in {area}: light."
+
+
+def _fake_tool(backend: FakeBackend, name: str) -> StructuredTool:
+    async def lookup(area: str) -> str:
+        """Look up traffic in an area."""
+        return await backend.lookup(area)
+
+    return StructuredTool.from_function(coroutine=lookup, name=name, description="Look up traffic in an area.")
+
+
+def _percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def _measure(tool: StructuredTool, calls: int, concurrency: int):
+    """Run calls through a tool; return (latencies ms, degraded answers)."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, degraded = [], 0
+
+    async def one(i):
+        nonlocal degraded
+        async with semaphore:
+            start = time.perf_counter()
+            result = await tool.ainvoke({"area": f"zone-{i}"})
+            latencies.append((time.perf_counter() - start) * 1000)
+            degraded += is_degraded(result)
+
+    await asyncio.gather(*[one(i) for i in range(calls)])
+    return latencies, degraded
+
+
+async def _latency_modes(calls: int, concurrency: int, seed: int, timeout: float, hedge_delay: float):
+    modes = {
+        "no deadline": dict(timeout=3600.0, hedge=False),
+        f"deadline {timeout:g}s": dict(timeout=timeout, hedge=False),
+        f"deadline + hedge after {hedge_delay:g}s": dict(timeout=timeout, hedge=True),
+    }
+    results = {}
+    for index, (mode, settings) in enumerate(modes.items()):
+        name = f"fake_traffic_{index}"
+        Config.TOOL_TIMEOUTS[name] = settings["timeout"]
+        Config.TOOL_HEDGING_ENABLED = settings["hedge"]
+        Config.TOOL_HEDGE_DELAY_SECONDS = hedge_delay
+        backend = FakeBackend(seed)
+        tool = resilient_tool(_fake_tool(backend, name), idempotent=True)
+        latencies, degraded = await _measure(tool, calls, concurrency)
+        results[mode] = (statistics.median(latencies), _percentile(latencies, 99), degraded, backend.calls)
+
+    print(f"{calls} calls, {concurrency} concurrent; backend ~20 ms with a 5% tail of ~2 s\n")
+    print(f"{'mode':<34} {'p50 ms':>8} {'p99 ms':>8} {'degraded':>9} {'backend calls':>14}")
+    for mode, (p50, p99, degraded, backend_calls) in results.items():
+        print(f"{mode:<34} {p50:8.0f} {p99:8.0f} {degraded:9d} {backend_calls:14d}")
+    return list(results.values())
+
+
+async def _breaker_cycle(threshold: int, reset: float) -> bool:
+    Config.TOOL_HEDGING_ENABLED = False
+    Config.TOOL_TIMEOUTS["fake_outage"] = 1.0
+    backend = FakeBackend(0, slow_ratio=0)
+    tool = resilient_tool(_fake_tool(backend, "fake_outage"), idempotent=True)
+    breaker = CIRCUIT_BREAKERS["fake_outage"]
+    breaker.failure_threshold = threshold
+    breaker.reset_timeout = reset
+
+    print(f"\nOutage (threshold {threshold} failures, reset after {reset:g}s)")
+    backend.down = True
+    for _ in range(threshold):
+        await tool.ainvoke({"area": "zone-1"})
+    calls_before = backend.calls
+    start = time.perf_counter()
+    answer = await tool.ainvoke({"area": "zone-1"})
+    fast_fail_ms = (time.perf_counter() - start) * 1000
+    opened = breaker.state == "open" and backend.calls == calls_before
+    print(f"  after {threshold} failures: circuit {breaker.state}, next call answered in "
+          f"{fast_fail_ms:.2f} ms without reaching the backend")
+    print(f"  answer: {answer}")
+
+    backend.down = False
+    await asyncio.sleep(reset)
+    answer = await tool.ainvoke({"area": "zone-1"})
+    recovered = breaker.state == "closed" and not is_degraded(answer)
+    print(f"  backend restored, after {reset:g}s: trial call -> circuit {breaker.state}: {answer}")
+    return opened and recovered
+
+
+async def run(args) -> int:
+    results = await _latency_modes(args.calls, args.concurrency, args.seed, args.timeout, args.hedge_delay)
+    breaker_ok = await _breaker_cycle(args.threshold, args.reset)
+
+    baseline_p99, deadline_p99, hedged_p99 = (p99 for _, p99, _, _ in results)
+    deadline_degraded, hedged_degraded = results[1][2], results[2][2]
+    failures = []
+    if deadline_p99 > args.timeout * 1000 * 1.5:
+        failures.append("deadline did not bound p99")
+    if hedged_p99 >= baseline_p99 or hedged_degraded >= max(deadline_degraded, 1):
+        failures.append("hedging did not cut p99")
+    if not breaker_ok:
+        failures.append("circuit breaker did not open and recover")
+    if failures:
+        print(f"\nFAIL: {'; '.join(failures)}")
+        return 1
+    print(f"\nOK: p99 {baseline_p99:.0f} ms -> {hedged_p99:.0f} ms with hedging; "
+          f"breaker fails fast and recovers")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--timeout", type=float, default=0.5, help="Per-call deadline in seconds")
+    parser.add_argument("--hedge-delay", type=float, default=0.1, help="Seconds before a hedged attempt")
+    parser.add_argument("--threshold", type=int, default=5, help="Failures that open the circuit")
+    parser.add_argument("--reset", type=float, default=0.5, help="Seconds before a half-open trial")
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    exit(main())
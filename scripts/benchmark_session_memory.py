@@ -0,0 +1,143 @@
+"""
+Measure per-step input tokens across a multi-turn dispute session.
+
+The same dispute (mediation, evidence, analysis, refund, customer
+follow-ups) is run turn by turn on one order with the scripted LLM and the
+simulated tools. For each turn the average input tokens of its LLM steps
+(messages sent to the model, counted with the prompt budget tokenizer) are
+reported for three configurations:
+
+- stateless: no session memory; every turn starts from scratch
+- unbounded: every earlier turn is replayed with full tool results, no compaction
+- compacted: the defaults (last SESSION_MEMORY_MAX_TURNS turns, compacted
+  results, compacted scratchpad)
+
+A second table feeds the scratchpad formatter alone steps with long (2 KB)
+observations, as verbose real backends return, and compares per-step tokens
+with and without compaction.
+
+Usage:
+    python scripts/benchmark_session_memory.py [--turns 12]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+TURNS = [
+    "The customer reports a spilled drink and damaged packaging.",
+    "Customer follow-up: they uploaded photos of the damaged bag.",
+    "The customer asks whether the damaged order will be refunded.",
+    "The restaurant is overloaded with a 40 minute prep time for the replacement order.",
+    "Heavy traffic on the route for the replacement delivery.",
+    "The customer says the replacement drink also spilled.",
+]
+
+
+def _configure(name: str):
+    from src.core import memory
+    from src.core.config import Config
+
+    Config.SESSION_MEMORY_ENABLED = name != "stateless"
+    Config.SCRATCHPAD_COMPACTION_ENABLED = name == "compacted"
+    if name == "unbounded":
+        Config.SESSION_MEMORY_MAX_TURNS = 10_000
+        Config.SCRATCHPAD_COMPACT_CHARS = 10_000_000
+    else:
+        Config.SESSION_MEMORY_MAX_TURNS = int(os.getenv("SESSION_MEMORY_MAX_TURNS", 6))
+        Config.SCRATCHPAD_COMPACT_CHARS = int(os.getenv("SCRATCHPAD_COMPACT_CHARS", 160))
+    memory._memory = None
+
+
+async def run_session(name: str, turns: int):
+    """Return the average input tokens per LLM step for each turn."""
+    from langchain_core.callbacks import AsyncCallbackHandler
+
+    from src.core.agent import SynapseAgent
+    from src.utils.tokens import count_tokens
+
+    class StepTokens(AsyncCallbackHandler):
+        def __init__(self):
+            self.steps = []
+
+        async def on_chat_model_start(self, serialized, messages, **kwargs):
+            self.steps.append(sum(count_tokens(str(m.content)) + count_tokens(str(getattr(m, "tool_calls", "")))
+                                  for m in messages[0]))
+
+    _configure(name)
+    agent = SynapseAgent()
+    averages = []
+    for turn in range(turns):
+        counter = StepTokens()
+        result = await agent.process_scenario(
+            TURNS[turn % len(TURNS)], {"order_id": "ORD-42", "seed": turn}, callbacks=[counter]
+        )
+        if not result["success"] or not counter.steps:
+            raise RuntimeError(f"{name}: turn {turn + 1} did not reach the LLM")
+        averages.append(sum(counter.steps) / len(counter.steps))
+    return averages
+
+
+def formatter_table(steps: int, observation_chars: int):
+    """Return per-step scratchpad tokens with and without compaction."""
+    from langchain.agents.format_scratchpad.tools import format_to_tool_messages
+    from langchain.agents.output_parsers.tools import ToolAgentAction
+
+    from src.core.config import Config
+    from src.core.memory import compact_scratchpad
+    from src.utils.tokens import count_tokens
+
+    Config.SCRATCHPAD_COMPACT_CHARS = int(os.getenv("SCRATCHPAD_COMPACT_CHARS", 160))
+    observation = ("Evidence item: photo metadata, GPS trace and chat transcript. " * 40)[:observation_chars]
+    intermediate = [
+        (ToolAgentAction(tool="collect_evidence", tool_input={"customer_id": "C1"}, log="", message_log=[],
+                         tool_call_id=f"call_{index}"), observation)
+        for index in range(steps)
+    ]
+    rows = []
+    for step in range(1, steps + 1):
+        full = sum(count_tokens(str(m.content)) for m in format_to_tool_messages(intermediate[:step]))
+        compact = sum(count_tokens(str(m.content)) for m in compact_scratchpad(intermediate[:step]))
+        rows.append((step, full, compact))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--turns", type=int, default=12)
+    parser.add_argument("--steps", type=int, default=8, help="Steps in the scratchpad formatter table")
+    args = parser.parse_args()
+
+    os.environ["LLM_PROVIDER"] = "scripted"
+    os.environ["LLM_CACHE_ENABLED"] = "false"
+    os.environ["FAST_PATH_ENABLED"] = "false"
+
+    configs = ["stateless", "unbounded", "compacted"]
+    results = {}
+    # The agent's console callbacks would flood the report
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        for name in configs:
+            results[name] = asyncio.run(run_session(name, args.turns))
+
+    print(f"Average input tokens per LLM step, {args.turns} turns on one order\n")
+    print(f"{'turn':>4} " + " ".join(f"{name:>10}" for name in configs))
+    for turn in range(args.turns):
+        print(f"{turn + 1:4d} " + " ".join(f"{results[name][turn]:10.0f}" for name in configs))
+
+    print(f"\nScratchpad tokens per step with 2 KB observations (keep last "
+          f"{int(os.getenv('SCRATCHPAD_KEEP_RECENT_STEPS', 2))} in full)\n")
+    print(f"{'step':>4} {'full':>8} {'compacted':>10}")
+    for step, full, compact in formatter_table(args.steps, 2000):
+        print(f"{step:4d} {full:8d} {compact:10d}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,163 @@
+"""
+Measure server cold start, readiness and first-request latency.
+
+Everything runs in fresh interpreters so no module is already imported:
+  import      - time to import src.mcp.server, checked against a budget
+  profile     - the slowest top-level imports (python -X importtime)
+  cold start  - time from spawning uvicorn until /ready returns 200
+  requests    - latency of the first and second /agent/execute calls
+
+The server runs with LLM_PROVIDER=scripted, so no API key or network is
+needed. Exits with status 1 if the import time exceeds the budget.
+
+Usage:
+    python scripts/benchmark_startup.py [--runs 5] [--budget-ms 1200] [--port 8765]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.config import Config
+
+IMPORT_SNIPPET = (
+    "import time; start = time.perf_counter(); import src.mcp.server; "
+    "print((time.perf_counter() - start) * 1000)"
+)
+
+SCENARIO = "Heavy traffic and a road obstruction on the route to the customer"
+
+
+def _env() -> dict:
+    return {**os.environ, "LLM_PROVIDER": "scripted", "LLM_CACHE_ENABLED": "false"}
+
+
+def measure_import(runs: int) -> list:
+    """Import time of the server module in fresh interpreters, in ms."""
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET], cwd=project_root, env=_env(),
+            capture_output=True, text=True, check=True
+        ).stdout
+        samples.append(float(output.strip().splitlines()[-1]))
+    return samples
+
+
+def import_profile(top: int) -> list:
+    """Slowest modules first imported by src.mcp.server itself (cumulative ms)."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.mcp.server"], cwd=project_root,
+        env=_env(), capture_output=True, text=True, check=True
+    ).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nesting is encoded as two spaces per level after the separator
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            modules.append((name.strip(), int(cumulative) / 1000))
+    return sorted(modules, key=lambda item: item[1], reverse=True)[:top]
+
+
+def _get(url: str, timeout: float = 1.0):
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, None
+    except (urllib.error.URLError, ConnectionError, OSError):
+        return None, None
+
+
+def _post(url: str, payload: dict) -> float:
+    request = urllib.request.Request(
+        url, data=json.dumps(payload).encode(), headers={"Content-Type": "application/json"}
+    )
+    start = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=30) as response:
+        response.read()
+    return (time.perf_counter() - start) * 1000
+
+
+def measure_cold_start(port: int) -> dict:
+    """Spawn uvicorn and time readiness and the first two scenario requests."""
+    base = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.mcp.server:app", "--port", str(port), "--log-level", "warning"],
+        cwd=project_root, env=_env(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        first_response = None
+        while True:
+            status, body = _get(f"{base}/ready")
+            elapsed = (time.perf_counter() - start) * 1000
+            if status is not None and first_response is None:
+                first_response = elapsed
+            if status == 200:
+                ready = elapsed
+                break
+            if process.poll() is not None or elapsed > 60000:
+                raise RuntimeError("Server did not become ready")
+            time.sleep(0.01)
+
+        return {
+            "first_response_ms": round(first_response, 1),
+            "ready_ms": round(ready, 1),
+            "warmup_ms": body.get("warmup_ms", {}),
+            "first_request_ms": round(_post(f"{base}/agent/execute", {"scenario": SCENARIO}), 1),
+            "second_request_ms": round(_post(f"{base}/agent/execute", {"scenario": SCENARIO}), 1)
+        }
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=Config.IMPORT_TIME_BUDGET_MS)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--top", type=int, default=8, help="Number of imports to list in the profile")
+    args = parser.parse_args()
+
+    samples = measure_import(args.runs)
+    import_ms = statistics.median(samples)
+    print(f"Import src.mcp.server: {import_ms:.0f} ms median over {args.runs} runs "
+          f"(budget {args.budget_ms:.0f} ms)")
+    print("\nSlowest direct imports (cumulative):")
+    for name, cumulative in import_profile(args.top):
+        print(f"  {cumulative:8.1f} ms  {name}")
+
+    cold = measure_cold_start(args.port)
+    print("\nCold start (uvicorn, LLM_PROVIDER=scripted):")
+    print(f"  first response     {cold['first_response_ms']:8.1f} ms")
+    print(f"  ready              {cold['ready_ms']:8.1f} ms")
+    for step, duration in cold["warmup_ms"].items():
+        print(f"    warm-up {step:<10} {duration:8.1f} ms")
+    print(f"  first request      {cold['first_request_ms']:8.1f} ms")
+    print(f"  second request     {cold['second_request_ms']:8.1f} ms")
+
+    if import_ms > args.budget_ms:
+        print(f"\nFAIL: import time exceeds budget by {import_ms - args.budget_ms:.0f} ms")
+        return 1
+    print("\nOK: import time within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,95 @@
+"""
+Compare per-category tool subsets against the all-tools agent.
+
+For each example scenario this reports the category picked by the
+classifier and the fixed input tokens per LLM step (system prompt + tool
+schemas) for the subset agent and the all-tools agent. Token counts run
+offline.
+
+With --live and a real GOOGLE_API_KEY it also times each scenario end to
+end through Gemini on both executors. Without a key only the offline
+numbers are printed.
+
+Usage:
+    python scripts/benchmark_tool_subsets.py [--live] [--iterations 3]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.classifier import ScenarioClassifier
+from src.core.prompts import prompt_token_report
+from src.main import EXAMPLE_SCENARIOS
+from src.tools.registry import ALL_TOOLS, get_tools_for_category
+
+SCENARIOS = EXAMPLE_SCENARIOS + ["Heavy traffic and a road obstruction on the route to the customer"]
+
+
+async def time_executor(executor, scenario: str, iterations: int) -> float:
+    """Median end-to-end latency of an executor on one scenario, in ms."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await executor.ainvoke({"input": scenario})
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def run(live: bool, iterations: int):
+    classifier = ScenarioClassifier()
+    full = prompt_token_report(ALL_TOOLS)
+    print(f"Token counting: {full['method']}\n")
+
+    agent = None
+    if live and os.getenv("GOOGLE_API_KEY"):
+        from src.core.agent import SynapseAgent
+        agent = SynapseAgent()
+
+    header = f"{'category':<18} {'tools':>5} {'tokens':>7} {'all':>6} {'saved':>7}"
+    if agent:
+        header += f" {'subset ms':>10} {'all ms':>9}"
+    print(header)
+
+    saved = []
+    for scenario in SCENARIOS:
+        category = classifier.classify(scenario)
+        tools = get_tools_for_category(category)
+        subset = prompt_token_report(tools)
+        reduction = 1 - subset["total_tokens"] / full["total_tokens"]
+        saved.append(reduction)
+        line = (f"{category or 'all':<18} {len(tools):>5} {subset['total_tokens']:>7} "
+                f"{full['total_tokens']:>6} {reduction:>6.0%}")
+        if agent:
+            with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                _, executor = agent.select_executor(scenario)
+                subset_ms = await time_executor(executor, scenario, iterations)
+                all_ms = await time_executor(agent.agent_executor, scenario, iterations)
+            line += f" {subset_ms:>10.0f} {all_ms:>9.0f}"
+        print(line)
+
+    print(f"\nMean input-token reduction per LLM step: {statistics.mean(saved):.0%}")
+    if not agent:
+        print("Latency skipped (set GOOGLE_API_KEY and pass --live to time both executors).")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--live", action="store_true", help="Time both executors against Gemini")
+    parser.add_argument("--iterations", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args.live, args.iterations))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
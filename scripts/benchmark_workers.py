@@ -0,0 +1,167 @@
+"""
+Measure /agent/execute throughput of the production serve mode by worker count.
+
+For each worker count the server is started with SERVER_MODE=production
+and LLM_PROVIDER=scripted, in a fresh temporary state directory. It is
+loaded with concurrent scenario requests and then stopped with SIGTERM.
+The scripted model makes each run CPU-bound agent work (no network), so
+throughput should grow with workers up to the number of cores.
+
+Graceful drain is checked last. Requests are started against a server
+whose tools have injected latency, the server is sent SIGTERM while they
+are in flight, and every one of them must still complete.
+
+Usage:
+    python scripts/benchmark_workers.py [--workers 1,2,4] [--requests 400] [--concurrency 32]
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+
+SCENARIO = "Heavy traffic and an obstruction on the route to the customer."
+
+
+def start_server(port: int, workers: int, state_dir: str, **extra_env) -> subprocess.Popen:
+    """Start the server in production mode and wait until it reports ready."""
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(project_root),
+        "LLM_PROVIDER": "scripted",
+        "LLM_CACHE_ENABLED": "false",
+        "SERVER_MODE": "production",
+        "SERVER_WORKERS": str(workers),
+        "PORT": str(port),
+        "JOB_STORE_PATH": os.path.join(state_dir, "jobs.sqlite"),
+        "SHARED_STATE_PATH": os.path.join(state_dir, "shared_state.sqlite"),
+        "AGENT_MAX_QUEUE_DEPTH": "10000",
+        **extra_env
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "src.mcp.server"], cwd=project_root, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/ready", timeout=1).status_code == 200:
+                # Workers warm up independently; give the slower ones a moment
+                time.sleep(1 + workers * 0.5)
+                return process
+        except httpx.HTTPError:
+            pass
+        if process.poll() is not None:
+            break
+        time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"Server with {workers} worker(s) did not become ready")
+
+
+def stop_server(process: subprocess.Popen) -> float:
+    """Send SIGTERM and return how long the server took to exit, in seconds."""
+    start = time.perf_counter()
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=60)
+    except subprocess.TimeoutExpired:
+        process.kill()
+    return time.perf_counter() - start
+
+
+async def load(port: int, requests: int, concurrency: int):
+    """Return (requests per second, latencies ms, failed requests)."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, failed = [], 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60, limits=limits) as client:
+        async def one(index: int):
+            nonlocal failed
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post("/agent/execute", json={"scenario": f"{SCENARIO} #{index}"})
+                latencies.append((time.perf_counter() - start) * 1000)
+                failed += response.status_code != 200 or not response.json().get("success")
+
+        # Warm every worker's connection path before timing
+        await asyncio.gather(*[one(-i) for i in range(1, concurrency + 1)])
+        latencies.clear()
+        failed = 0
+        start = time.perf_counter()
+        await asyncio.gather(*[one(index) for index in range(requests)])
+        wall = time.perf_counter() - start
+    return requests / wall, latencies, failed
+
+
+async def check_drain(port: int, in_flight: int) -> bool:
+    """SIGTERM a server while requests are running; return True if all of them completed."""
+    with tempfile.TemporaryDirectory() as state_dir:
+        process = start_server(port, 1, state_dir, SIMULATION_LATENCY_MS="default=1000",
+                               SIMULATION_LATENCY_SIGMA="0")
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60) as client:
+            calls = [
+                asyncio.create_task(client.post("/agent/execute", json={"scenario": f"{SCENARIO} #{i}"}))
+                for i in range(in_flight)
+            ]
+            await asyncio.sleep(0.5)
+            stopping = asyncio.create_task(asyncio.to_thread(stop_server, process))
+            responses = await asyncio.gather(*calls, return_exceptions=True)
+            shutdown = await stopping
+
+    completed = sum(
+        not isinstance(r, Exception) and r.status_code == 200 and r.json().get("success") for r in responses
+    )
+    print(f"\nGraceful drain: SIGTERM with {in_flight} requests in flight (~2 s each); "
+          f"{completed}/{in_flight} completed, server exited after {shutdown:.1f} s")
+    return completed == in_flight
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    counts = [int(count) for count in args.workers.split(",")]
+    print(f"{args.requests} scenarios per run, {args.concurrency} concurrent, "
+          f"{os.cpu_count()} CPU core(s) available\n")
+    print(f"{'workers':>7} {'req/s':>8} {'speedup':>8} {'p50 ms':>8} {'p99 ms':>8} {'failed':>7}")
+
+    baseline = None
+    for workers in counts:
+        with tempfile.TemporaryDirectory() as state_dir:
+            process = start_server(args.port, workers, state_dir)
+            try:
+                rps, latencies, failed = asyncio.run(load(args.port, args.requests, args.concurrency))
+            finally:
+                stop_server(process)
+        baseline = baseline or rps
+        latencies.sort()
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"{workers:7d} {rps:8.1f} {rps / baseline:7.2f}x {statistics.median(latencies):8.0f} "
+              f"{p99:8.0f} {failed:7d}")
+
+    drained = asyncio.run(check_drain(args.port, in_flight=8))
+    if not drained:
+        print("FAIL: in-flight requests were dropped on shutdown")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
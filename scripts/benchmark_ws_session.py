@@ -0,0 +1,180 @@
+"""
+Compare per-request HTTP scenarios with one multiplexed /ws/session.
+
+A server is started with LLM_PROVIDER=scripted and injected tool latency.
+The same scenarios are then sent three ways:
+
+- http: one POST /agent/execute per scenario on a new connection, up to
+  --concurrency at a time (an operator console without keep-alive)
+- http-keepalive: the same through one pooled client
+- ws: all scenarios multiplexed on one /ws/session connection, each tagged
+  with a request_id, at most --concurrency in flight
+
+Backpressure is checked last. A client sends a burst of scenarios on a
+session with a tiny send queue (WS_SEND_QUEUE_SIZE=8) and stops reading
+for a few seconds, so the socket buffers fill. The server's queued events
+must stay within the bound while the runs wait, and every result must
+still arrive once the client reads again.
+
+Usage:
+    python scripts/benchmark_ws_session.py [--scenarios 200] [--concurrency 8]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+import websockets
+
+from scripts.benchmark_workers import start_server, stop_server
+
+SCENARIOS = [
+    "The restaurant is overloaded with a 40 minute prep time.",
+    "Heavy traffic and an obstruction on the route to the customer.",
+    "A customer reports a spilled drink and damaged packaging.",
+]
+
+
+def _summary(name: str, count: int, wall: float, latencies) -> str:
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return (f"{name:>15} {count / wall:8.1f} {statistics.median(latencies):8.0f} "
+            f"{p99:8.0f} {count - len(latencies):7d}")
+
+
+async def run_http(port: int, scenarios: int, concurrency: int, keep_alive: bool) -> str:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    shared = httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60) if keep_alive else None
+
+    async def one(index: int):
+        async with semaphore:
+            start = time.perf_counter()
+            body = {"scenario": SCENARIOS[index % len(SCENARIOS)]}
+            if shared:
+                response = await shared.post("/agent/execute", json=body)
+            else:
+                async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60) as client:
+                    response = await client.post("/agent/execute", json=body)
+            if response.status_code == 200 and response.json().get("success"):
+                latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one(index) for index in range(scenarios)])
+    wall = time.perf_counter() - start
+    if shared:
+        await shared.aclose()
+    return _summary("http-keepalive" if keep_alive else "http", scenarios, wall, latencies)
+
+
+async def run_ws(port: int, scenarios: int, concurrency: int):
+    """Multiplex scenarios on one session; return (wall seconds, latencies ms)."""
+    latencies, sent_at = [], {}
+    slots = asyncio.Semaphore(concurrency)
+
+    async with websockets.connect(f"ws://127.0.0.1:{port}/ws/session", max_queue=1) as ws:
+        json.loads(await ws.recv())  # session event
+
+        async def send_all():
+            for index in range(scenarios):
+                await slots.acquire()
+                sent_at[f"r{index}"] = time.perf_counter()
+                await ws.send(json.dumps({
+                    "type": "scenario", "request_id": f"r{index}",
+                    "scenario": SCENARIOS[index % len(SCENARIOS)]
+                }))
+
+        start = time.perf_counter()
+        sender = asyncio.create_task(send_all())
+        finished = 0
+        while finished < scenarios:
+            message = json.loads(await ws.recv())
+            if message["event"] in ("result", "error"):
+                finished += 1
+                slots.release()
+                if message["event"] == "result" and message["data"].get("success"):
+                    latencies.append((time.perf_counter() - sent_at[message["request_id"]]) * 1000)
+        wall = time.perf_counter() - start
+        await sender
+    return wall, latencies
+
+
+async def check_backpressure(port: int, scenarios: int, pause: float):
+    """Burst scenarios, stop reading for ``pause`` s; return (results, peak queued events, fewest runs seen)."""
+    peak_queued, samples = 0, []
+    async with websockets.connect(f"ws://127.0.0.1:{port}/ws/session", max_queue=1) as ws, \
+            httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+        await ws.recv()  # session event
+        for index in range(scenarios):
+            await ws.send(json.dumps({
+                "type": "scenario", "request_id": f"r{index}",
+                "scenario": SCENARIOS[index % len(SCENARIOS)]
+            }))
+        deadline = time.monotonic() + pause
+        while time.monotonic() < deadline:
+            stats = (await client.get("/resources/sessions")).json()
+            peak_queued = max(peak_queued, stats["events_queued"])
+            samples.append(stats["scenarios_running"])
+            await asyncio.sleep(0.1)
+        results = 0
+        while results < scenarios:
+            message = json.loads(await ws.recv())
+            results += message["event"] == "result" and message["data"].get("success", False)
+            results += message["event"] == "error"
+    return results, peak_queued, min(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", default="default=20", help="SIMULATION_LATENCY_MS for the tools")
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+
+    print(f"{args.scenarios} scenarios, {args.concurrency} in flight, tool latency {args.latency!r}\n")
+    print(f"{'transport':>15} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'failed':>7}")
+    with tempfile.TemporaryDirectory() as state_dir:
+        process = start_server(args.port, 1, state_dir, SIMULATION_LATENCY_MS=args.latency)
+        try:
+            for keep_alive in (False, True):
+                print(asyncio.run(run_http(args.port, args.scenarios, args.concurrency, keep_alive)))
+            wall, latencies = asyncio.run(run_ws(args.port, args.scenarios, args.concurrency))
+            print(_summary("ws", args.scenarios, wall, latencies))
+        finally:
+            stop_server(process)
+
+    queue_size, burst = 8, 500
+    with tempfile.TemporaryDirectory() as state_dir:
+        process = start_server(args.port, 1, state_dir, SIMULATION_LATENCY_MS="default=1",
+                               WS_SEND_QUEUE_SIZE=str(queue_size), WS_MAX_INFLIGHT_PER_SESSION=str(burst))
+        try:
+            results, peak, least_running = asyncio.run(check_backpressure(args.port, burst, pause=4))
+            waits = [
+                line.split()[-1] for line in httpx.get(f"http://127.0.0.1:{args.port}/metrics").text.splitlines()
+                if line.startswith("synapse_ws_backpressure_total")
+            ]
+        finally:
+            stop_server(process)
+
+    print(f"\nSlow reader: {burst} scenarios, reading paused 4 s: peak {peak} queued events "
+          f"(bound {queue_size}), {least_running} runs still waiting at the end of the pause, "
+          f"{waits[0] if waits else 0} backpressure waits, {results}/{burst} results")
+    if results != burst or peak > queue_size:
+        print("FAIL: slow reader lost results or the send queue exceeded its bound")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
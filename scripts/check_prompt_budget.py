@@ -0,0 +1,67 @@
+"""
+Check the fixed per-step input tokens of the agent prompt against a budget.
+
+Counts the compiled system prompt and the tool schemas sent with every LLM
+call, prints the breakdown and exits with status 1 if the total exceeds
+PROMPT_TOKEN_BUDGET (or --budget), or if a directive of the original
+prompt no longer reaches the model. Runs offline; see src/utils/tokens.py
+for how tokens are counted.
+
+Usage:
+    python scripts/check_prompt_budget.py [--budget 2000] [--json] [--show-prompt]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.prompts import (
+    SYSTEM_PROMPT, check_baseline_directives, check_directive_tools, prompt_token_report
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget", type=int, help="Override PROMPT_TOKEN_BUDGET")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--show-prompt", action="store_true", help="Print the compiled system prompt")
+    args = parser.parse_args()
+
+    report = prompt_token_report(budget=args.budget)
+    unknown = check_directive_tools()
+    missing = check_baseline_directives()
+
+    if args.show_prompt:
+        print(SYSTEM_PROMPT)
+        print()
+    if args.json:
+        print(json.dumps({**report, "unknown_directive_tools": unknown,
+                          "missing_baseline_directives": missing}, indent=2))
+    else:
+        print(f"Token counting:       {report['method']}")
+        print(f"Tools bound:          {report['tools']}")
+        print(f"Directives included:  {', '.join(report['directives'])}")
+        print(f"System prompt tokens: {report['system_prompt_tokens']}")
+        print(f"Tool schema tokens:   {report['tool_schema_tokens']}")
+        print(f"Total per LLM step:   {report['total_tokens']} / {report['budget']}")
+        for reference in unknown:
+            print(f"Unknown tool in directive {reference}")
+        for heading in missing:
+            print(f"Original directive missing from the prompt: {heading}")
+
+    if unknown or missing or not report["within_budget"]:
+        if not args.json and not unknown and not missing:
+            print(f"FAIL: prompt exceeds budget by {report['total_tokens'] - report['budget']} tokens")
+        return 1
+    if not args.json:
+        print("OK: prompt is within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,127 @@
+"""
+Show that concurrent slow tools no longer serialise on the server's event loop.
+
+Two demo tools with the same simulated I/O latency are registered with the
+server: one blocking sync implementation and one async-native one. Each
+gets N concurrent POST /tools/{name} requests. For comparison, the sync
+tool is also called the old way (tool.invoke inside the async handler),
+which blocks the loop. While each burst runs, /health is polled to measure how
+long the event loop stalls.
+
+Exits with status 1 if the offloaded sync tool or the async tool still
+serialise. The same check runs in CI as tests/test_async_tools.py.
+
+Usage:
+    python scripts/demo_async_tools.py [--calls 10] [--latency 0.2]
+"""
+
+import argparse
+import asyncio
+import math
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+from langchain_core.tools import tool
+
+from src.core.config import Config
+from src.mcp.server import TOOL_REGISTRY, app
+from src.tools.registry import prepare_tool
+
+LATENCY = 0.2
+
+
+@tool
+def slow_sync_lookup(order_id: str) -> str:
+    """Look up an order in a slow blocking backend."""
+    time.sleep(LATENCY)
+    return f"Order {order_id} located (sync backend)."
+
+
+@tool
+async def slow_async_lookup(order_id: str) -> str:
+    """Look up an order in a slow async backend."""
+    await asyncio.sleep(LATENCY)
+    return f"Order {order_id} located (async backend)."
+
+
+async def _probe_health(client: httpx.AsyncClient, stop: asyncio.Event) -> float:
+    """Worst event-loop stall in ms (a /health call plus a 10 ms sleep) while a burst runs."""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/health")
+        await asyncio.sleep(0.01)
+        worst = max(worst, (time.perf_counter() - start) * 1000 - 10)
+    return worst
+
+
+async def _burst(client: httpx.AsyncClient, make_call, calls: int):
+    """Run ``calls`` concurrent calls; return (wall ms, worst loop stall ms)."""
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe_health(client, stop))
+    await asyncio.sleep(0.02)
+    start = time.perf_counter()
+    await asyncio.gather(*[make_call(i) for i in range(calls)])
+    wall = (time.perf_counter() - start) * 1000
+    stop.set()
+    return wall, await probe
+
+
+async def run(calls: int) -> int:
+    TOOL_REGISTRY["slow_sync_lookup"] = prepare_tool(slow_sync_lookup)
+    TOOL_REGISTRY["slow_async_lookup"] = prepare_tool(slow_async_lookup)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://demo") as client:
+        async def blocking(i):
+            # What the handler used to do: a sync invoke on the event loop
+            slow_sync_lookup.invoke({"order_id": f"ORD-{i}"})
+
+        def endpoint(name):
+            async def call(i):
+                response = await client.post(f"/tools/{name}", json={"args": {"order_id": f"ORD-{i}"}})
+                assert response.json()["success"], response.text
+            return call
+
+        results = {
+            "sync, invoke on loop (before)": await _burst(client, blocking, calls),
+            "sync, offloaded to pool": await _burst(client, endpoint("slow_sync_lookup"), calls),
+            "async-native": await _burst(client, endpoint("slow_async_lookup"), calls),
+        }
+
+    ideal = LATENCY * 1000
+    pool_rounds = math.ceil(calls / (Config.TOOL_EXECUTOR_WORKERS if Config.PARALLEL_TOOL_CALLS else 1))
+    print(f"{calls} concurrent calls, {ideal:.0f} ms simulated I/O each, "
+          f"tool pool {Config.TOOL_EXECUTOR_WORKERS} workers\n")
+    print(f"{'mode':<32} {'wall ms':>9} {'worst stall ms':>15}")
+    for mode, (wall, health) in results.items():
+        print(f"{mode:<32} {wall:9.0f} {health:15.1f}")
+
+    serialised = [
+        mode for mode, (wall, _) in list(results.items())[1:]
+        if wall > 2 * ideal * (pool_rounds if "pool" in mode else 1)
+    ]
+    if serialised:
+        print(f"\nFAIL: still serialised: {', '.join(serialised)}")
+        return 1
+    print("\nOK: concurrent slow tools overlap and the event loop stays responsive")
+    return 0
+
+
+def main():
+    global LATENCY
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=LATENCY, help="Simulated I/O seconds per call")
+    args = parser.parse_args()
+    LATENCY = args.latency
+    return asyncio.run(run(args.calls))
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -2,156 +2,412 @@
 Main agent implementation and callback handlers.
 """
 
-from langchain_google_genai import ChatGoogleGenerativeAI
+import asyncio
+import time
+
 from langchain.agents import AgentExecutor, create_tool_calling_agent
-from langchain.callbacks.base import BaseCallbackHandler
+from langchain.agents.agent import RunnableMultiActionAgent
+from langchain.callbacks.base import AsyncCallbackHandler
 
 from .config import Config
+from .llm_cache import get_llm_cache
+from .classifier import ScenarioClassifier
+from .memory import compact_scratchpad, get_session_memory, session_key
 from .prompts import create_agent_prompt
-from ..tools.registry import ALL_TOOLS
+from .router import FastPathRouter
+from ..tools.backends import simulation_seed
+from ..tools.base import is_degraded
+from ..tools.registry import ALL_TOOLS, CATEGORY_TOOL_GROUPS, get_tools_for_category
 from ..utils.logger import log_tool_call, log_tool_output, log_error
+from ..utils.metrics import (
+    AGENT_STEPS, LLM_CALLS, LLM_LATENCY, LLM_TOKENS, SCENARIO_LATENCY, SCENARIOS,
+    SCENARIOS_IN_FLIGHT
+)
 
 
-class CustomCallbackHandler(BaseCallbackHandler):
+class CustomCallbackHandler(AsyncCallbackHandler):
     """Custom callback handler to intercept and format the agent's output."""
     
-    def on_agent_action(self, action, **kwargs):
+    async def on_agent_action(self, action, **kwargs):
         """Called when the agent is about to use a tool."""
         log_tool_call(action.tool, action.tool_input)
 
-    def on_tool_end(self, output, **kwargs):
+    async def on_tool_end(self, output, **kwargs):
         """Called when a tool finishes running."""
         log_tool_output(output)
 
 
-class SynapseAgent:
-    """Main Synapse agent for delivery coordination."""
+class CaptureCallbackHandler(AsyncCallbackHandler):
+    """
+    Record the tool executions of a single agent run.
+    
+    ``on_agent_action`` announces each tool call in order; the matching tool
+    run is then bound to it by its LangChain ``run_id`` in ``on_tool_start``,
+    so results land on the right call even when several tools of the same
+    step run concurrently.
+    """
     
     def __init__(self):
-        """Initialize the agent with configuration and tools."""
-        Config.validate()
+        """Initialize an empty capture."""
+        self.executions = []
+        self._pending = []
+        self._by_run_id = {}
+    
+    async def on_agent_action(self, action, **kwargs):
+        """Called when the agent is about to use a tool."""
+        execution = {
+            "tool": action.tool,
+            "params": action.tool_input,
+            "reasoning": f"Using {action.tool} to resolve the scenario",
+            "result": None,
+            "status": "pending"
+        }
+        self.executions.append(execution)
+        self._pending.append(execution)
+    
+    async def on_tool_start(self, serialized, input_str, *, run_id, inputs=None, **kwargs):
+        """Bind a tool run to the oldest announced call it belongs to."""
+        name = (serialized or {}).get("name")
+        candidates = [e for e in self._pending if e["tool"] == name]
+        exact = [e for e in candidates if inputs is not None and e["params"] == inputs]
+        matched = exact or candidates or self._pending
+        if not matched:
+            return
         
-        # Initialize the language model
-        self.llm = ChatGoogleGenerativeAI(
+        execution = matched[0]
+        self._pending.remove(execution)
+        execution["run_id"] = str(run_id)
+        # Unknown tool names are answered by LangChain's invalid_tool stand-in
+        execution["status"] = "running" if name == execution["tool"] else "invalid"
+        self._by_run_id[run_id] = execution
+    
+    async def on_tool_end(self, output, *, run_id, **kwargs):
+        """Called when a tool finishes running."""
+        execution = self._by_run_id.pop(run_id, None)
+        if execution is None:
+            return
+        execution["result"] = output
+        if execution["status"] == "invalid":
+            execution["status"] = "error"
+            execution["error"] = str(output)
+        else:
+            execution["status"] = "degraded" if is_degraded(output) else "success"
+    
+    async def on_tool_error(self, error, *, run_id, **kwargs):
+        """Called when a tool raises an error."""
+        execution = self._by_run_id.pop(run_id, None)
+        if execution is None:
+            return
+        execution["result"] = f"Error: {str(error)}"
+        execution["status"] = "error"
+        execution["error"] = str(error)
+    
+    def finalize(self) -> list:
+        """Flag calls that never produced a result and return all executions."""
+        for execution in self.executions:
+            if execution["status"] in ("pending", "running", "invalid"):
+                execution["status"] = "missing"
+                execution["error"] = "No result was recorded for this tool call"
+        return self.executions
+
+
+class StreamingCallbackHandler(AsyncCallbackHandler):
+    """
+    Push agent events onto an asyncio queue as they happen.
+    
+    Each item is an ``(event, payload)`` tuple; consumers such as the SSE
+    endpoint read from ``queue`` while the run is still in progress. Runs
+    with a handler that wants tokens skip the LLM cache, whose replies
+    could only be published as one whole message.
+    """
+    
+    def __init__(self, queue: asyncio.Queue = None, tokens: bool = True):
+        """
+        Initialize the handler.
+        
+        Args:
+            queue: Queue to publish to (a new one by default)
+            tokens: Publish ``token`` events; without them the run may be
+                served from the LLM cache
+        """
+        self.queue = queue or asyncio.Queue()
+        self.tokens = tokens
+        self._tool_names = {}
+        self._streamed_runs = set()
+    
+    async def on_llm_new_token(self, token, *, run_id=None, **kwargs):
+        """Called for every token delta streamed by the LLM."""
+        if token and self.tokens:
+            self._streamed_runs.add(run_id)
+            await self.queue.put(("token", {"delta": token}))
+    
+    async def on_llm_end(self, response, *, run_id=None, **kwargs):
+        """Publish the whole message when the model did not stream the call."""
+        if not self.tokens:
+            return
+        if run_id in self._streamed_runs:
+            self._streamed_runs.discard(run_id)
+            return
+        try:
+            text = response.generations[0][0].text
+        except (AttributeError, IndexError):
+            return
+        if text:
+            await self.queue.put(("token", {"delta": text}))
+    
+    async def on_agent_action(self, action, **kwargs):
+        """Called when the agent is about to use a tool."""
+        await self.queue.put(("agent_action", {
+            "tool": action.tool,
+            "params": action.tool_input,
+            "log": action.log
+        }))
+    
+    async def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        """Remember which tool a run belongs to."""
+        self._tool_names[run_id] = (serialized or {}).get("name")
+    
+    async def on_tool_end(self, output, *, run_id, **kwargs):
+        """Called when a tool finishes running."""
+        await self.queue.put(("tool_end", {
+            "tool": self._tool_names.pop(run_id, None),
+            "result": output
+        }))
+    
+    async def on_tool_error(self, error, *, run_id, **kwargs):
+        """Called when a tool raises an error."""
+        await self.queue.put(("tool_error", {
+            "tool": self._tool_names.pop(run_id, None),
+            "error": str(error)
+        }))
+
+
+class MetricsCallbackHandler(AsyncCallbackHandler):
+    """Record latency, outcome and token usage of every LLM call."""
+    
+    def __init__(self):
+        """Initialize the per-run start times."""
+        self._started = {}
+    
+    def _begin(self, run_id, kwargs):
+        params = kwargs.get("invocation_params") or {}
+        model = (params.get("model") or params.get("model_name") or params.get("_type")
+                 or Config.MODEL_NAME)
+        self._started[run_id] = (time.perf_counter(), model)
+    
+    async def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        """Called when a chat model call starts."""
+        self._begin(run_id, kwargs)
+    
+    async def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        """Called when a completion model call starts."""
+        self._begin(run_id, kwargs)
+    
+    async def on_llm_end(self, response, *, run_id, **kwargs):
+        """Observe latency and input/output tokens of a finished call."""
+        start, model = self._started.pop(run_id, (None, Config.MODEL_NAME))
+        if start is not None:
+            LLM_LATENCY.observe(time.perf_counter() - start, model=model)
+        LLM_CALLS.inc(model=model, status="success")
+        
+        usage = None
+        try:
+            usage = response.generations[0][0].message.usage_metadata
+        except (AttributeError, IndexError):
+            pass
+        if not usage:
+            token_usage = (response.llm_output or {}).get("token_usage") or {}
+            usage = {
+                "input_tokens": token_usage.get("prompt_tokens"),
+                "output_tokens": token_usage.get("completion_tokens")
+            }
+        for direction in ("input", "output"):
+            count = usage.get(f"{direction}_tokens")
+            if count is not None:
+                LLM_TOKENS.observe(count, model=model, direction=direction)
+    
+    async def on_llm_error(self, error, *, run_id, **kwargs):
+        """Count a failed call."""
+        start, model = self._started.pop(run_id, (None, Config.MODEL_NAME))
+        if start is not None:
+            LLM_LATENCY.observe(time.perf_counter() - start, model=model)
+        LLM_CALLS.inc(model=model, status="error")
+
+
+def create_llm():
+    """Create the chat model selected by Config.LLM_PROVIDER."""
+    Config.validate()
+    
+    if Config.LLM_PROVIDER == "scripted":
+        from .scripted_llm import ScriptedChatModel
+        llm = ScriptedChatModel(latency=Config.SCRIPTED_LLM_LATENCY)
+    else:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        llm = ChatGoogleGenerativeAI(
             model=Config.MODEL_NAME,
             temperature=Config.MODEL_TEMPERATURE
         )
+    
+    # Replay identical temperature-0 calls from the persistent cache
+    llm.cache = get_llm_cache()
+    return llm
+
+
+class SynapseAgent:
+    """Main Synapse agent for delivery coordination."""
+    
+    def __init__(self, llm=None):
+        """
+        Initialize the agent with configuration and tools.
+        
+        Args:
+            llm: Chat model to use instead of the one selected by Config
+        """
+        # Initialize the language model
+        self.llm = llm or create_llm()
         
         # Create the agent prompt
         self.prompt = create_agent_prompt()
         
         # Create the agent
-        self.agent = create_tool_calling_agent(
-            self.llm, 
-            ALL_TOOLS, 
-            self.prompt
-        )
+        self.agent = self._create_agent(ALL_TOOLS, self.prompt)
+        
+        # Create the agent executors: cached runs plan with ainvoke, runs
+        # streaming tokens to a client stream every LLM call
+        self.agent_executor = self._build_executor(self.agent, ALL_TOOLS)
+        self.streaming_executor = self._build_executor(self.agent, ALL_TOOLS, stream=True)
         
-        # Create the agent executor
-        self.agent_executor = AgentExecutor(
-            agent=self.agent,
-            tools=ALL_TOOLS,
+        # One precompiled executor per scenario category, bound to just the
+        # tools (and prompt directives) that category needs
+        self.category_executors = {}
+        self.streaming_category_executors = {}
+        self.classifier = None
+        if Config.TOOL_SUBSETS_ENABLED:
+            self.classifier = ScenarioClassifier()
+            for category in CATEGORY_TOOL_GROUPS:
+                tools = get_tools_for_category(category)
+                agent = self._create_agent(tools, create_agent_prompt(tools))
+                self.category_executors[category] = self._build_executor(agent, tools)
+                self.streaming_category_executors[category] = self._build_executor(agent, tools, stream=True)
+        
+        # Rule-bound scenarios are resolved without calling the LLM
+        self.router = FastPathRouter() if Config.FAST_PATH_ENABLED else None
+    
+    def _create_agent(self, tools: list, prompt):
+        # Older tool observations are compacted before every LLM step
+        if Config.SCRATCHPAD_COMPACTION_ENABLED:
+            return create_tool_calling_agent(self.llm, tools, prompt, message_formatter=compact_scratchpad)
+        return create_tool_calling_agent(self.llm, tools, prompt)
+    
+    def _build_executor(self, agent, tools: list, stream: bool = False) -> AgentExecutor:
+        # Streamed calls bypass the LLM cache, so plan with ainvoke when one
+        # is set, unless the executor serves token streams
+        if self.llm.cache and not stream:
+            agent = RunnableMultiActionAgent(runnable=agent, stream_runnable=False)
+        return AgentExecutor(
+            agent=agent,
+            tools=tools,
             verbose=False,
             callbacks=[CustomCallbackHandler()]
         )
     
-    def process_scenario(self, scenario: str) -> str:
+    async def warm_up(self):
+        """Initialise lazily created clients and templates before the first request."""
+        # The Gemini async client is only built on first access inside a running loop
+        getattr(self.llm, "async_client", None)
+        await self.prompt.ainvoke({"input": "warm-up", "agent_scratchpad": []})
+    
+    def select_executor(self, scenario: str, stream: bool = False):
         """
-        Process a delivery disruption scenario.
+        Return ``(category, executor)`` for a scenario; category is None for all tools.
         
-        Args:
-            scenario: Description of the delivery disruption
-            
-        Returns:
-            Agent's response and resolution
+        With ``stream`` the executor streams every LLM call (bypassing the
+        LLM cache) so clients receive token deltas.
         """
-        try:
-            result = self.agent_executor.invoke({"input": scenario})
-            return result['output']
-        except Exception as e:
-            log_error(f"An error occurred during agent execution: {e}")
-            raise
-
-    async def process_scenario(self, scenario: str, context: dict = None) -> dict:
+        category = self.classifier.classify(scenario) if self.classifier else None
+        if category in self.category_executors:
+            executors = self.streaming_category_executors if stream else self.category_executors
+            return category, executors[category]
+        return None, self.streaming_executor if stream else self.agent_executor
+    
+    async def process_scenario(self, scenario: str, context: dict = None,
+                               callbacks: list = None) -> dict:
         """
         Process a delivery disruption scenario with detailed output.
         
+        The agent and executor built in ``__init__`` are reused, so a single
+        instance can serve many requests; anything request-specific is passed
+        in as callbacks for this run only. Scenarios matching a deterministic
+        rule are handled by the fast-path router instead of the LLM; the
+        ``path`` key of the result says which one ran.
+        
+        A context naming a ``session_id``, ``order_id`` or ``customer_id``
+        makes the scenario a turn of that session: the agent sees the
+        session's earlier turns, and a successful turn is remembered.
+        
         Args:
             scenario: Description of the delivery disruption
-            context: Additional context for the scenario
+            context: Additional context for the scenario; ``seed`` replays the
+                simulated tool backend outcomes of an earlier run
+            callbacks: Extra callback handlers to attach to this run
             
         Returns:
-            Dictionary with reasoning, actions, and execution results
+            Dictionary with reasoning, actions, execution results, the
+            simulation seed used and the session key (None if stateless)
         """
+        start = time.perf_counter()
+        key = session_key(context) if Config.SESSION_MEMORY_ENABLED else None
+        memory = get_session_memory()
+        SCENARIOS_IN_FLIGHT.inc()
         try:
-            # Capture tool executions and reasoning
-            tool_executions = []
-            current_tool_index = -1
+            with simulation_seed((context or {}).get("seed")) as seed:
+                result = await self._process(scenario, context, callbacks, history=memory.history(key))
+            result["seed"] = seed
+            result["session"] = key
+            if result.get("success"):
+                memory.record(key, scenario, result.get("reasoning", ""), result.get("execution_results", []))
+        finally:
+            SCENARIOS_IN_FLIGHT.dec()
+        
+        path = result.get("path", "agent")
+        SCENARIO_LATENCY.observe(time.perf_counter() - start, path=path)
+        SCENARIOS.inc(path=path, status="success" if result.get("success") else "error")
+        AGENT_STEPS.observe(len(result.get("actions", [])), path=path)
+        return result
+    
+    async def _process(self, scenario: str, context: dict = None, callbacks: list = None,
+                       history: list = None) -> dict:
+        """Resolve a scenario on the fast path or the agent executor (with the session history)."""
+        try:
+            route = self.router.classify(scenario, context) if self.router else None
+            if route:
+                return await self.router.resolve(route, scenario, context, callbacks=callbacks)
             
-            # Create a custom callback handler to capture tool usage
-            class CaptureCallbackHandler(BaseCallbackHandler):
-                def on_agent_action(self, action, **kwargs):
-                    nonlocal current_tool_index
-                    current_tool_index += 1
-                    tool_executions.append({
-                        "tool": action.tool,
-                        "params": action.tool_input,
-                        "reasoning": f"Using {action.tool} to resolve the scenario",
-                        "result": None,
-                        "status": "pending"
-                    })
-                
-                def on_tool_end(self, output, **kwargs):
-                    nonlocal current_tool_index
-                    if current_tool_index >= 0 and current_tool_index < len(tool_executions):
-                        tool_executions[current_tool_index]["result"] = output
-                        tool_executions[current_tool_index]["status"] = "success"
-                
-                def on_tool_error(self, error, **kwargs):
-                    nonlocal current_tool_index
-                    if current_tool_index >= 0 and current_tool_index < len(tool_executions):
-                        tool_executions[current_tool_index]["result"] = f"Error: {str(error)}"
-                        tool_executions[current_tool_index]["status"] = "error"
-                        tool_executions[current_tool_index]["error"] = str(error)
+            # Capture tool executions, correlated by the run_id of each tool run
+            capture = CaptureCallbackHandler()
             
-            # Create temporary executor with custom callback
-            temp_executor = AgentExecutor(
-                agent=self.agent,
-                tools=ALL_TOOLS,
-                verbose=True,  # Enable verbose to help with debugging
-                callbacks=[CaptureCallbackHandler()]
+            # Execute the scenario on the shared executor for its category
+            # without blocking the event loop. Per-request handlers go through
+            # the run config so they are inherited by tool runs.
+            stream = any(isinstance(handler, StreamingCallbackHandler) and handler.tokens
+                         for handler in callbacks or [])
+            category, executor = self.select_executor(scenario, stream=stream)
+            run_callbacks = [capture, MetricsCallbackHandler(), *(callbacks or [])]
+            result = await executor.ainvoke(
+                {"input": scenario, "chat_history": history or []},
+                config={"callbacks": run_callbacks}
             )
             
-            # Execute the scenario
-            result = temp_executor.invoke({"input": scenario})
-            
-            # Post-process to ensure all tools have results
-            for i, execution in enumerate(tool_executions):
-                if execution["result"] is None and execution["status"] == "pending":
-                    # Try to execute the tool manually to get a result
-                    try:
-                        tool_found = None
-                        for tool in ALL_TOOLS:
-                            if tool.name == execution["tool"]:
-                                tool_found = tool
-                                break
-                        
-                        if tool_found:
-                            manual_result = tool_found.invoke(execution["params"])
-                            tool_executions[i]["result"] = manual_result
-                            tool_executions[i]["status"] = "success_manual"
-                        else:
-                            tool_executions[i]["result"] = "Tool not found"
-                            tool_executions[i]["status"] = "error"
-                    except Exception as e:
-                        tool_executions[i]["result"] = f"Manual execution failed: {str(e)}"
-                        tool_executions[i]["status"] = "error"
+            # Calls that never reported back are flagged, never re-executed
+            tool_executions = capture.finalize()
             
             return {
                 "reasoning": result.get('output', 'Agent processed the scenario successfully'),
                 "actions": tool_executions,
                 "execution_results": tool_executions,
-                "success": True
+                "success": True,
+                "path": "agent",
+                "category": category
             }
             
         except Exception as e:
@@ -160,5 +416,6 @@ class SynapseAgent:
                 "reasoning": f"Error processing scenario: {str(e)}",
                 "actions": [],
                 "execution_results": [],
-                "success": False
+                "success": False,
+                "path": "agent"
             }
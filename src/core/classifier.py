@@ -0,0 +1,54 @@
+"""
+Keyword classifier mapping scenarios to the tool-subset categories of the registry.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from ..tools.registry import CATEGORY_TOOL_GROUPS
+
+# Any one pattern matching puts a scenario in the category
+CATEGORY_PATTERNS: Dict[str, List[str]] = {
+    "delay": [
+        r"\b(overloaded|busy|prep(aration)?[- ]time|kitchen|delay(ed)?|running late|closed)\b",
+        r"\b(traffic|congestion|road ?block|obstruction|accident|detour|reroute)\b",
+    ],
+    "damage_dispute": [
+        r"\b(spill(ed|t)?|damaged?|broken|leak(ed|ing)?|crushed|dispute|tampered)\b",
+    ],
+    "failed_delivery": [
+        r"\b(never|didn'?t|did not)\s+(arrive|show|come|turn up)",
+        r"\bfailed delivery\b",
+        r"\b(otp|qr code|one[- ]time (password|code|pin))\b",
+    ],
+    "recipient_access": [
+        r"\b(can'?t|cannot|can not|unable to|could ?n[o']t)\s+(find|locate|reach)\b",
+        r"\b(address|not (at )?home|unavailable|not answering|locker|safe drop|concierge|doorman)\b",
+    ],
+}
+
+
+class ScenarioClassifier:
+    """Cheap regex classifier choosing the tool subset for a scenario."""
+
+    def __init__(self, patterns: Dict[str, List[str]] = None):
+        """Initialize the classifier with ``{category: [regex, ...]}`` rules."""
+        patterns = patterns or CATEGORY_PATTERNS
+        self.patterns = {
+            category: [re.compile(pattern, re.IGNORECASE) for pattern in rules]
+            for category, rules in patterns.items()
+            if category in CATEGORY_TOOL_GROUPS
+        }
+
+    def classify(self, scenario: str) -> Optional[str]:
+        """
+        Return the category of a scenario.
+
+        Only an unambiguous match is returned; scenarios matching no category
+        or several categories return None and should use all tools.
+        """
+        matches = [
+            category for category, rules in self.patterns.items()
+            if any(rule.search(scenario) for rule in rules)
+        ]
+        return matches[0] if len(matches) == 1 else None
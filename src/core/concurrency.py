@@ -0,0 +1,72 @@
+"""
+Admission control for concurrent agent scenarios.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from .config import Config
+
+
+class QueueFullError(Exception):
+    """Raised when a scenario arrives and the wait queue is already full."""
+
+
+class ScenarioLimiter:
+    """
+    Bound how many scenarios run at once on this worker.
+
+    Up to ``max_concurrency`` scenarios run concurrently; further scenarios
+    wait in line, and once ``max_queue_depth`` are waiting new arrivals are
+    rejected with QueueFullError instead of piling up.
+    """
+
+    def __init__(self, max_concurrency: int = None, max_queue_depth: int = None):
+        """Initialize the limiter from arguments or Config defaults."""
+        self.max_concurrency = max(1, max_concurrency or Config.AGENT_MAX_CONCURRENCY)
+        self.max_queue_depth = max(0, Config.AGENT_MAX_QUEUE_DEPTH if max_queue_depth is None else max_queue_depth)
+        self.in_flight = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    @asynccontextmanager
+    async def slot(self):
+        """Wait for a free execution slot and hold it for the duration of the block."""
+        if self._semaphore.locked() and self.waiting >= self.max_queue_depth:
+            raise QueueFullError(
+                f"Agent queue is full ({self.waiting} scenarios waiting)"
+            )
+
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def snapshot(self) -> dict:
+        """Return the current load of the limiter."""
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.waiting,
+            "max_concurrency": self.max_concurrency,
+            "max_queue_depth": self.max_queue_depth
+        }
+
+
+_limiter: Optional[ScenarioLimiter] = None
+
+
+def get_scenario_limiter() -> ScenarioLimiter:
+    """Return the process-wide scenario limiter."""
+    global _limiter
+    if _limiter is None:
+        _limiter = ScenarioLimiter()
+    return _limiter
@@ -2,12 +2,46 @@
 Configuration settings for the Project Synapse agent.
 """
 
+import math
 import os
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+
+def _parse_tool_settings(value: str) -> dict:
+    """Parse per-tool numbers given as ``"tool=value,tool=value"``."""
+    settings = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, number = item.split("=", 1)
+            settings[name.strip()] = float(number)
+    return settings
+
+
+def _available_cpus() -> int:
+    """
+    Return the number of CPUs this process may use.
+
+    os.cpu_count() reports every core of the host, even inside a container
+    limited to a few. The affinity mask and a cgroup v2 CPU quota say what
+    the process can actually run on.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()[:2]
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(1, cpus)
+
+
 class Config:
     """Configuration class for the application."""
     
@@ -17,6 +51,8 @@ class Config:
     # Model Configuration
     MODEL_NAME = "gemini-1.5-pro-latest"
     MODEL_TEMPERATURE = 0
+    LLM_PROVIDER = os.getenv("LLM_PROVIDER", "google")  # "google" or "scripted" (offline)
+    SCRIPTED_LLM_LATENCY = float(os.getenv("SCRIPTED_LLM_LATENCY", 0))
     
     # Agent Configuration
     AGENT_NAME = "Synapse"
@@ -26,10 +62,118 @@ class Config:
     MCP_SERVER_NAME = "synapse-tools"
     MCP_SERVER_VERSION = "1.0.0"
     MCP_SERVER_PORT = int(os.getenv("PORT", 8000))
+    # Budget for importing the server module, checked by scripts/benchmark_startup.py
+    IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", 1200))
+    
+    # Serve Mode Configuration
+    # "development" runs one auto-reloading process; "production" runs SERVER_WORKERS processes
+    SERVER_MODE = os.getenv("SERVER_MODE", "development")
+    SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", _available_cpus()))
+    # Seconds a stopping worker waits for in-flight agent runs and jobs before cancelling them
+    SERVER_DRAIN_SECONDS = float(os.getenv("SERVER_DRAIN_SECONDS", 30))
+    # Share tool caches and rate-limit counters between worker processes through SQLite
+    SHARED_STATE_ENABLED = os.getenv(
+        "SHARED_STATE_ENABLED", str(SERVER_MODE == "production" and SERVER_WORKERS > 1)
+    ).lower() == "true"
+    SHARED_STATE_PATH = os.getenv("SHARED_STATE_PATH", ".cache/shared_state.sqlite")
+    # Seconds between each worker publishing its metrics to the shared store for /metrics
+    METRICS_PUBLISH_SECONDS = float(os.getenv("METRICS_PUBLISH_SECONDS", 5))
+    # Scenarios a client may start per minute across all workers (0 disables the limit)
+    AGENT_RATE_LIMIT_PER_MINUTE = int(os.getenv("AGENT_RATE_LIMIT_PER_MINUTE", 0))
+    
+    # MCP Client Configuration
+    MCP_CLIENT_TIMEOUT = float(os.getenv("MCP_CLIENT_TIMEOUT", 5))
+    MCP_CLIENT_MAX_CONNECTIONS = int(os.getenv("MCP_CLIENT_MAX_CONNECTIONS", 100))
+    MCP_CLIENT_MAX_KEEPALIVE = int(os.getenv("MCP_CLIENT_MAX_KEEPALIVE", 20))
+    MCP_CLIENT_KEEPALIVE_EXPIRY = float(os.getenv("MCP_CLIENT_KEEPALIVE_EXPIRY", 60))
+    MCP_CLIENT_HTTP2 = os.getenv("MCP_CLIENT_HTTP2", "false").lower() == "true"
+    
+    # Logging Configuration
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT = os.getenv("LOG_FORMAT")  # "cli" or "json"; unset lets each entry point choose
+    LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", 1.0))
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+    
+    # Agent Pool Configuration
+    AGENT_POOL_SIZE = int(os.getenv("AGENT_POOL_SIZE", 2))
+    
+    # Concurrency Configuration
+    AGENT_MAX_CONCURRENCY = int(os.getenv("AGENT_MAX_CONCURRENCY", 32))
+    AGENT_MAX_QUEUE_DEPTH = int(os.getenv("AGENT_MAX_QUEUE_DEPTH", 100))
+    AGENT_MAX_BATCH_SIZE = int(os.getenv("AGENT_MAX_BATCH_SIZE", 500))
+    
+    # LLM Response Cache (only used at temperature 0)
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".cache/llm_cache.sqlite")
+    LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", 86400))
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 5000))
+    
+    # Scenario Job Queue Configuration
+    JOB_STORE_PATH = os.getenv("JOB_STORE_PATH", ".cache/jobs.sqlite")
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", 4))
+    JOB_MAX_WAIT_SECONDS = float(os.getenv("JOB_MAX_WAIT_SECONDS", 30))
+    JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", 0.5))
+    JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", 86400))
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+    JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", 60))
+    
+    # Fast Path Configuration
+    FAST_PATH_ENABLED = os.getenv("FAST_PATH_ENABLED", "true").lower() == "true"
+    
+    # Bind only the tool groups a classified scenario category needs
+    TOOL_SUBSETS_ENABLED = os.getenv("TOOL_SUBSETS_ENABLED", "true").lower() == "true"
+    
+    # Tool Cache Configuration
+    TOOL_CACHE_ENABLED = os.getenv("TOOL_CACHE_ENABLED", "true").lower() == "true"
+    TOOL_CACHE_MAXSIZE = int(os.getenv("TOOL_CACHE_MAXSIZE", 256))
+    TOOL_MAX_BATCH_SIZE = int(os.getenv("TOOL_MAX_BATCH_SIZE", 50))
+    
+    # Tool Execution Configuration
+    PARALLEL_TOOL_CALLS = os.getenv("PARALLEL_TOOL_CALLS", "true").lower() == "true"
+    TOOL_EXECUTOR_WORKERS = int(os.getenv("TOOL_EXECUTOR_WORKERS", 16))
+    
+    # Tool Resilience Configuration
+    TOOL_TIMEOUT_SECONDS = float(os.getenv("TOOL_TIMEOUT_SECONDS", 10))
+    TOOL_TIMEOUTS = _parse_tool_settings(os.getenv("TOOL_TIMEOUTS", ""))
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", 5))
+    CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", 30))
+    TOOL_HEDGING_ENABLED = os.getenv("TOOL_HEDGING_ENABLED", "false").lower() == "true"
+    TOOL_HEDGE_DELAY_SECONDS = float(os.getenv("TOOL_HEDGE_DELAY_SECONDS", 0.5))
+    
+    # Tool Backend Configuration ("simulated" or a backend added with register_backend)
+    TOOL_BACKEND = os.getenv("TOOL_BACKEND", "simulated")
+    SIMULATION_SEED = int(os.environ["SIMULATION_SEED"]) if os.getenv("SIMULATION_SEED") else None
+    # Median latency per tool ("default" applies to the rest) and lognormal tail shape
+    SIMULATION_LATENCY_MS = _parse_tool_settings(os.getenv("SIMULATION_LATENCY_MS", ""))
+    SIMULATION_LATENCY_SIGMA = float(os.getenv("SIMULATION_LATENCY_SIGMA", 0.5))
+    SIMULATION_ERROR_RATES = _parse_tool_settings(os.getenv("SIMULATION_ERROR_RATES", ""))
+    
+    # Streaming Configuration
+    STREAM_KEEPALIVE_SECONDS = float(os.getenv("STREAM_KEEPALIVE_SECONDS", 15))
+    # Operator WebSocket sessions: scenarios running at once per connection and
+    # events buffered for a slow reader before the session's runs wait for it
+    WS_MAX_INFLIGHT_PER_SESSION = int(os.getenv("WS_MAX_INFLIGHT_PER_SESSION", 8))
+    WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", 256))
+    
+    # Prompt Configuration
+    PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", 2000))
+    
+    # Session Memory: scenarios whose context names the same session_id, order_id
+    # or customer_id see the earlier turns of that conversation (off by default: the
+    # memory is per worker process)
+    SESSION_MEMORY_ENABLED = os.getenv("SESSION_MEMORY_ENABLED", "false").lower() == "true"
+    SESSION_MEMORY_MAX_SESSIONS = int(os.getenv("SESSION_MEMORY_MAX_SESSIONS", 1000))
+    SESSION_MEMORY_MAX_TURNS = int(os.getenv("SESSION_MEMORY_MAX_TURNS", 6))
+    SESSION_MEMORY_TTL_SECONDS = float(os.getenv("SESSION_MEMORY_TTL_SECONDS", 3600))
+    # Scratchpad compaction: tool observations older than the most recent steps
+    # are cut to SCRATCHPAD_COMPACT_CHARS before every LLM step
+    SCRATCHPAD_COMPACTION_ENABLED = os.getenv("SCRATCHPAD_COMPACTION_ENABLED", "true").lower() == "true"
+    SCRATCHPAD_KEEP_RECENT_STEPS = int(os.getenv("SCRATCHPAD_KEEP_RECENT_STEPS", 2))
+    SCRATCHPAD_COMPACT_CHARS = int(os.getenv("SCRATCHPAD_COMPACT_CHARS", 160))
     
     @classmethod
     def validate(cls) -> bool:
         """Validate that all required configuration is present."""
-        if not cls.GOOGLE_API_KEY:
+        if cls.LLM_PROVIDER == "google" and not cls.GOOGLE_API_KEY:
             raise ValueError("GOOGLE_API_KEY not found in environment variables")
         return True
@@ -0,0 +1,479 @@
+"""
+Durable job queue for agent scenarios.
+
+/agent/execute holds the HTTP connection for the whole multi-step run, so
+proxy timeouts and client retries start the same expensive run again. Jobs
+separate the two. A submission is stored in a local SQLite database and
+answered with a job ID at once. A pool of workers runs queued jobs, and
+clients poll (or long-poll) for the result.
+
+A running job holds a lease that its worker renews while the run lasts.
+When a worker crashes, is killed or is restarted, the lease runs out and a
+periodic sweep in any worker requeues the job. A run that had already
+called a side-effecting tool (a refund, a customer notification, ...) is
+failed instead, since running it again would repeat those actions, and so
+is a job interrupted JOB_MAX_ATTEMPTS times. Submitting a scenario identical to
+one already queued or running returns the existing job instead of a new run.
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from langchain.callbacks.base import AsyncCallbackHandler
+from sqlalchemy import (
+    Column, Float, Index, Integer, MetaData, String, Table, Text, delete, func, or_, select, update
+)
+from sqlalchemy.exc import IntegrityError
+
+from .concurrency import QueueFullError
+from .config import Config
+from .shared_store import create_sqlite_engine
+from ..utils.logger import log_error, log_info
+from ..utils.metrics import (
+    JOB_QUEUE_WAIT, JOB_RUN_DURATION, JOBS_FINISHED, JOBS_QUEUED, JOBS_RUNNING, JOBS_SUBMITTED
+)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+ACTIVE = (QUEUED, RUNNING)
+FINISHED = (SUCCEEDED, FAILED)
+
+_metadata = MetaData()
+
+_jobs = Table(
+    "scenario_jobs",
+    _metadata,
+    Column("id", String(32), primary_key=True),
+    Column("dedup_key", String(64), nullable=False),
+    Column("status", String(16), nullable=False),
+    Column("scenario", Text, nullable=False),
+    Column("context", Text, nullable=False),
+    Column("result", Text),
+    Column("error", Text),
+    Column("attempts", Integer, nullable=False, default=0),
+    Column("created_at", Float, nullable=False),
+    Column("started_at", Float),
+    Column("finished_at", Float),
+    # Running jobs whose lease has passed belong to a worker that is gone
+    Column("lease_expires", Float),
+    Index("ix_scenario_jobs_status_created", "status", "created_at"),
+)
+
+# Side-effecting tool calls made by each job's current run
+_tool_calls = Table(
+    "scenario_job_tool_calls",
+    _metadata,
+    Column("job_id", String(32), nullable=False, index=True),
+    Column("tool", String(64), nullable=False),
+    Column("called_at", Float, nullable=False),
+)
+
+# At most one queued or running job per scenario, enforced across processes
+Index("ux_scenario_jobs_active_dedup", _jobs.c.dedup_key, unique=True,
+      sqlite_where=_jobs.c.status.in_(ACTIVE))
+
+
+def dedup_key(scenario: str, context: Dict[str, Any]) -> str:
+    """Return the key under which identical submissions are deduplicated."""
+    payload = json.dumps({"scenario": scenario.strip(), "context": context or {}}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _to_dict(row) -> Dict[str, Any]:
+    job = {
+        "job_id": row.id,
+        "status": row.status,
+        "scenario": row.scenario,
+        "context": json.loads(row.context),
+        "result": json.loads(row.result) if row.result else None,
+        "error": row.error,
+        "attempts": row.attempts,
+        "created_at": row.created_at,
+        "started_at": row.started_at,
+        "finished_at": row.finished_at,
+        "queue_seconds": None,
+        "run_seconds": None
+    }
+    if row.started_at:
+        job["queue_seconds"] = round(max(0.0, row.started_at - row.created_at), 3)
+    if row.finished_at and row.started_at:
+        job["run_seconds"] = round(row.finished_at - row.started_at, 3)
+    return job
+
+
+class JobStore:
+    """SQLite job table; safe to share between threads and worker processes."""
+
+    def __init__(self, path: str = None):
+        """
+        Open (or create) the job database.
+
+        Args:
+            path: SQLite file (defaults to Config.JOB_STORE_PATH)
+        """
+        self.path = path or Config.JOB_STORE_PATH
+        self.engine = create_sqlite_engine(self.path)
+        _metadata.create_all(self.engine)
+
+    def submit(self, scenario: str, context: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """
+        Queue a scenario, or return the identical job already queued or running.
+
+        Returns:
+            ``(job, deduplicated)``
+        """
+        key = dedup_key(scenario, context)
+        while True:
+            job_id = uuid.uuid4().hex
+            try:
+                with self.engine.begin() as conn:
+                    conn.execute(_jobs.insert().values(
+                        id=job_id, dedup_key=key, status=QUEUED, scenario=scenario,
+                        context=json.dumps(context or {}, default=str), attempts=0, created_at=time.time()
+                    ))
+                return self.get(job_id), False
+            except IntegrityError:
+                with self.engine.connect() as conn:
+                    row = conn.execute(
+                        select(_jobs).where(_jobs.c.dedup_key == key, _jobs.c.status.in_(ACTIVE))
+                    ).first()
+                # The active duplicate may have finished in between; queue a new job then
+                if row is not None:
+                    return _to_dict(row), True
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """Atomically mark the oldest queued job as running, leased for JOB_LEASE_SECONDS, and return it."""
+        oldest = (
+            select(_jobs.c.id).where(_jobs.c.status == QUEUED)
+            .order_by(_jobs.c.created_at).limit(1).scalar_subquery()
+        )
+        now = time.time()
+        with self.engine.begin() as conn:
+            row = conn.execute(
+                update(_jobs).where(_jobs.c.id == oldest, _jobs.c.status == QUEUED)
+                .values(status=RUNNING, started_at=now, attempts=_jobs.c.attempts + 1,
+                        lease_expires=now + Config.JOB_LEASE_SECONDS)
+                .returning(*_jobs.c)
+            ).first()
+        return _to_dict(row) if row else None
+
+    def renew(self, job_id: str) -> bool:
+        """Extend a running job's lease; False if the job is no longer running."""
+        with self.engine.begin() as conn:
+            return conn.execute(
+                update(_jobs).where(_jobs.c.id == job_id, _jobs.c.status == RUNNING)
+                .values(lease_expires=time.time() + Config.JOB_LEASE_SECONDS)
+            ).rowcount > 0
+
+    def finish(self, job_id: str, status: str, result: Dict[str, Any] = None, error: str = None):
+        """Record the outcome of a running job."""
+        with self.engine.begin() as conn:
+            conn.execute(
+                update(_jobs).where(_jobs.c.id == job_id).values(
+                    status=status, finished_at=time.time(), error=error, lease_expires=None,
+                    result=json.dumps(result, default=str) if result is not None else None
+                )
+            )
+
+    def record_tool_call(self, job_id: str, tool: str):
+        """Note that a job's run called a side-effecting tool."""
+        with self.engine.begin() as conn:
+            conn.execute(_tool_calls.insert().values(job_id=job_id, tool=tool, called_at=time.time()))
+
+    def release(self, job_id: str):
+        """Put a running job back in the queue without counting the attempt."""
+        with self.engine.begin() as conn:
+            conn.execute(
+                update(_jobs).where(_jobs.c.id == job_id, _jobs.c.status == RUNNING)
+                .values(status=QUEUED, started_at=None, lease_expires=None, attempts=_jobs.c.attempts - 1)
+            )
+
+    def recover(self, max_attempts: int = None) -> Tuple[int, int]:
+        """
+        Requeue running jobs whose lease has expired.
+
+        A job is failed instead if its run had already called a
+        side-effecting tool, or if it has been started ``max_attempts``
+        times (defaults to Config.JOB_MAX_ATTEMPTS). Jobs whose workers are
+        still renewing their lease are left alone, so any process sharing
+        the store may recover at any time.
+
+        Returns:
+            ``(requeued, failed)``
+        """
+        max_attempts = max_attempts or Config.JOB_MAX_ATTEMPTS
+        now = time.time()
+        requeued = failed = 0
+        with self.engine.begin() as conn:
+            interrupted = conn.execute(
+                select(_jobs.c.id, _jobs.c.attempts).where(
+                    _jobs.c.status == RUNNING,
+                    or_(_jobs.c.lease_expires.is_(None), _jobs.c.lease_expires < now)
+                )
+            ).all()
+            calls = {}
+            for job_id, tool in conn.execute(
+                select(_tool_calls.c.job_id, _tool_calls.c.tool)
+                .where(_tool_calls.c.job_id.in_([row.id for row in interrupted]))
+                .order_by(_tool_calls.c.called_at)
+            ):
+                calls.setdefault(job_id, []).append(tool)
+            for row in interrupted:
+                if row.id in calls:
+                    error = (f"Interrupted after calling {', '.join(calls[row.id])}; "
+                             f"not run again so these actions are not repeated")
+                elif row.attempts >= max_attempts:
+                    error = f"Interrupted {row.attempts} times; giving up"
+                else:
+                    conn.execute(update(_jobs).where(_jobs.c.id == row.id).values(
+                        status=QUEUED, started_at=None, lease_expires=None
+                    ))
+                    requeued += 1
+                    continue
+                conn.execute(update(_jobs).where(_jobs.c.id == row.id).values(
+                    status=FAILED, finished_at=now, error=error, lease_expires=None
+                ))
+                failed += 1
+        return requeued, failed
+
+    def purge(self, older_than: float) -> int:
+        """Delete finished jobs older than ``older_than`` seconds; return how many."""
+        cutoff = time.time() - older_than
+        with self.engine.begin() as conn:
+            expired = select(_jobs.c.id).where(_jobs.c.status.in_(FINISHED), _jobs.c.finished_at < cutoff)
+            conn.execute(delete(_tool_calls).where(_tool_calls.c.job_id.in_(expired)))
+            return conn.execute(
+                delete(_jobs).where(_jobs.c.status.in_(FINISHED), _jobs.c.finished_at < cutoff)
+            ).rowcount
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job, or None if it does not exist."""
+        with self.engine.connect() as conn:
+            row = conn.execute(select(_jobs).where(_jobs.c.id == job_id)).first()
+        return _to_dict(row) if row else None
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of jobs in each status."""
+        with self.engine.connect() as conn:
+            rows = conn.execute(select(_jobs.c.status, func.count()).group_by(_jobs.c.status)).all()
+        return {status: 0 for status in ACTIVE + FINISHED} | {status: count for status, count in rows}
+
+
+class _ToolCallRecorder(AsyncCallbackHandler):
+    """Record a job's side-effecting tool calls as they start."""
+
+    def __init__(self, store: JobStore, job_id: str):
+        self.store = store
+        self.job_id = job_id
+
+    async def on_tool_start(self, serialized, input_str, **kwargs):
+        from ..tools.registry import SIDE_EFFECTING_TOOLS
+
+        # Recorded before the call: once started it may take effect
+        name = (serialized or {}).get("name")
+        if name in SIDE_EFFECTING_TOOLS:
+            await asyncio.to_thread(self.store.record_tool_call, self.job_id, name)
+
+
+class JobQueue:
+    """Worker pool running jobs from a JobStore."""
+
+    def __init__(self, runner: Callable[[str, Dict[str, Any]], Awaitable[Dict[str, Any]]],
+                 store: JobStore = None, workers: int = None):
+        """
+        Initialize the queue; workers start with ``start()``.
+
+        Args:
+            runner: Coroutine function ``runner(scenario, context, callbacks=...)``
+                running one scenario and returning its result
+            store: Job store (defaults to one at Config.JOB_STORE_PATH)
+            workers: Concurrent jobs (defaults to Config.JOB_WORKERS)
+        """
+        self.runner = runner
+        self.store = store or JobStore()
+        self.workers = max(1, workers or Config.JOB_WORKERS)
+        self._tasks = []
+        self._sweeper = None
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        # Events of the long-polls waiting in this process, by job ID
+        self._finished: Dict[str, Set[asyncio.Event]] = {}
+
+    async def start(self):
+        """Recover jobs with expired leases, purge old ones and start the workers and the sweep."""
+        requeued, failed = await asyncio.to_thread(self.store.recover)
+        purged = await asyncio.to_thread(self.store.purge, Config.JOB_RETENTION_SECONDS)
+        await asyncio.to_thread(self._refresh_gauges)
+        self._stopping = False
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._sweeper = asyncio.create_task(self._sweep())
+        log_info(
+            f"Job queue started with {self.workers} worker(s), {requeued} interrupted job(s) requeued, "
+            f"{failed} failed, {purged} expired job(s) purged"
+        )
+
+    async def stop(self, timeout: float = 0):
+        """
+        Stop claiming jobs and let running ones finish for up to ``timeout`` seconds.
+
+        Jobs still running after that are cancelled. They stay running in the
+        store until their lease expires; a later sweep then requeues or
+        fails them.
+        """
+        self._stopping = True
+        self._wakeup.set()
+        if self._sweeper:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+        if self._tasks and timeout > 0:
+            await asyncio.wait(self._tasks, timeout=timeout)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, scenario: str, context: Dict[str, Any] = None) -> Tuple[Dict[str, Any], bool]:
+        """Queue a scenario; returns ``(job, deduplicated)``."""
+        job, deduplicated = await asyncio.to_thread(self.store.submit, scenario, context or {})
+        JOBS_SUBMITTED.inc(result="deduplicated" if deduplicated else "queued")
+        if not deduplicated:
+            self._wakeup.set()
+            await asyncio.to_thread(self._refresh_gauges)
+        return job, deduplicated
+
+    async def get(self, job_id: str, wait: float = 0) -> Optional[Dict[str, Any]]:
+        """
+        Return a job, waiting up to ``wait`` seconds for it to finish.
+
+        Completion in this process wakes the waiter at once; jobs run by
+        other processes are noticed on the next poll of the store.
+        """
+        deadline = time.monotonic() + min(max(wait, 0), Config.JOB_MAX_WAIT_SECONDS)
+        finished = asyncio.Event()
+        try:
+            while True:
+                job = await asyncio.to_thread(self.store.get, job_id)
+                remaining = deadline - time.monotonic()
+                if job is None or job["status"] in FINISHED or remaining <= 0:
+                    return job
+                self._finished.setdefault(job_id, set()).add(finished)
+                try:
+                    await asyncio.wait_for(finished.wait(), timeout=min(remaining, Config.JOB_POLL_INTERVAL_SECONDS))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            # Unregister however the wait ends, so unknown jobs and jobs
+            # finished by other processes leave nothing behind
+            waiters = self._finished.get(job_id)
+            if waiters is not None:
+                waiters.discard(finished)
+                if not waiters:
+                    del self._finished[job_id]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return job counts by status and the worker count."""
+        counts = self._refresh_gauges()
+        return {"workers": self.workers, "store": self.store.path, "jobs": counts}
+
+    def _refresh_gauges(self) -> Dict[str, int]:
+        counts = self.store.counts()
+        JOBS_QUEUED.set(counts[QUEUED])
+        JOBS_RUNNING.set(counts[RUNNING])
+        return counts
+
+    async def _work(self):
+        while not self._stopping:
+            # Clear before claiming so a submission made meanwhile is not missed
+            self._wakeup.clear()
+            job = await asyncio.to_thread(self.store.claim)
+            if job is None:
+                if self._stopping:
+                    break
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=Config.JOB_POLL_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await asyncio.to_thread(self._refresh_gauges)
+            await self._run(job)
+
+    async def _sweep(self):
+        """Requeue or fail jobs whose worker stopped renewing their lease."""
+        while True:
+            await asyncio.sleep(Config.JOB_LEASE_SECONDS / 2)
+            try:
+                requeued, failed = await asyncio.to_thread(self.store.recover)
+            except Exception as e:
+                log_error(f"Job lease sweep failed: {str(e)}")
+                continue
+            if requeued or failed:
+                log_info(f"Job lease sweep: {requeued} interrupted job(s) requeued, {failed} failed")
+                self._wakeup.set()
+                await asyncio.to_thread(self._refresh_gauges)
+
+    async def _heartbeat(self, job_id: str):
+        """Renew a job's lease while its run lasts."""
+        while True:
+            await asyncio.sleep(Config.JOB_LEASE_SECONDS / 3)
+            try:
+                await asyncio.to_thread(self.store.renew, job_id)
+            except Exception as e:
+                log_error(f"Job {job_id} lease renewal failed: {str(e)}")
+
+    async def _run(self, job: Dict[str, Any]):
+        job_id = job["job_id"]
+        JOB_QUEUE_WAIT.observe(job["queue_seconds"])
+        start = time.perf_counter()
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            result = await self.runner(
+                job["scenario"], job["context"], callbacks=[_ToolCallRecorder(self.store, job_id)]
+            )
+        except QueueFullError:
+            # The agent is saturated by direct requests; retry the job later
+            await asyncio.to_thread(self.store.release, job_id)
+            await asyncio.sleep(Config.JOB_POLL_INTERVAL_SECONDS)
+            return
+        except Exception as e:
+            log_error(f"Job {job_id} failed: {str(e)}")
+            result, status, error = None, FAILED, str(e)
+        else:
+            status = SUCCEEDED if result.get("success") else FAILED
+            error = None if status == SUCCEEDED else result.get("agent_reasoning") or "Scenario failed"
+        finally:
+            heartbeat.cancel()
+
+        JOB_RUN_DURATION.observe(time.perf_counter() - start)
+        JOBS_FINISHED.inc(status=status)
+        await asyncio.to_thread(self.store.finish, job_id, status, result, error)
+        await asyncio.to_thread(self._refresh_gauges)
+        for finished in self._finished.pop(job_id, ()):
+            finished.set()
+
+
+_queue: Optional[JobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def init_job_queue(runner: Callable[[str, Dict[str, Any]], Awaitable[Dict[str, Any]]],
+                   store: JobStore = None, workers: int = None) -> JobQueue:
+    """Create the process-wide job queue if it does not exist yet."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue(runner, store=store, workers=workers)
+        return _queue
+
+
+def get_job_queue() -> Optional[JobQueue]:
+    """Return the process-wide job queue, or None before the server has started it."""
+    return _queue
@@ -0,0 +1,248 @@
+"""
+Persistent LLM response cache for deterministic (temperature 0) runs.
+
+Entries live in a local SQLite database via SQLAlchemy and are keyed on:
+- the model configuration, which includes the bound tool schemas;
+- the normalised message list;
+- a fingerprint of the system prompt and tool set.
+
+Opening the store with a different fingerprint drops every entry, so
+changing a directive or a tool never serves a stale plan.
+"""
+
+import hashlib
+import json
+import threading
+import time
+import warnings
+from typing import Any, Dict, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+from sqlalchemy import (
+    Column, Float, Integer, MetaData, String, Table, Text, delete, func, select, update
+)
+
+from .config import Config
+from .prompts import prompt_fingerprint
+from .shared_store import create_sqlite_engine
+from ..utils.metrics import LLM_CACHE_REQUESTS
+
+_metadata = MetaData()
+
+_entries = Table(
+    "llm_cache",
+    _metadata,
+    Column("key", String(64), primary_key=True),
+    Column("preview", String(200)),
+    Column("return_val", Text, nullable=False),
+    Column("created_at", Float, nullable=False),
+    Column("last_used_at", Float, nullable=False, index=True),
+    Column("hits", Integer, nullable=False, default=0),
+)
+
+_meta = Table(
+    "llm_cache_meta",
+    _metadata,
+    Column("name", String(64), primary_key=True),
+    Column("value", Text, nullable=False),
+)
+
+# Per-call fields that differ between otherwise identical messages
+_VOLATILE_FIELDS = ("id", "response_metadata", "usage_metadata")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Canonicalise a serialised message list for use as a cache key.
+
+    Message ids, response/usage metadata and tool call ids are generated per
+    call, so two runs of the same scenario would never share a scratchpad
+    key. Ids are dropped and tool call ids are renumbered in order of
+    appearance.
+    """
+    try:
+        messages = json.loads(prompt)
+    except ValueError:
+        return prompt
+    if not isinstance(messages, list):
+        return prompt
+
+    call_ids = {}
+
+    def renumber(call_id):
+        return call_ids.setdefault(call_id, f"call_{len(call_ids)}")
+
+    for message in messages:
+        kwargs = message.get("kwargs") if isinstance(message, dict) else None
+        if not isinstance(kwargs, dict):
+            continue
+        for field in _VOLATILE_FIELDS:
+            kwargs.pop(field, None)
+        for call in kwargs.get("tool_calls", []) + kwargs.get("invalid_tool_calls", []):
+            if call.get("id"):
+                call["id"] = renumber(call["id"])
+        if kwargs.get("tool_call_id"):
+            kwargs["tool_call_id"] = renumber(kwargs["tool_call_id"])
+    return json.dumps(messages, sort_keys=True)
+
+
+def _preview(prompt: str) -> str:
+    """Return the first human message of a prompt, for stats output."""
+    try:
+        for message in json.loads(prompt):
+            if message.get("id", [])[-1] == "HumanMessage":
+                return str(message["kwargs"].get("content", ""))[:200]
+    except (ValueError, AttributeError, IndexError, KeyError, TypeError):
+        pass
+    return ""
+
+
+class SQLiteLLMCache(BaseCache):
+    """SQLite-backed LangChain cache with TTL, LRU eviction and per-entry hits."""
+
+    def __init__(self, path: str = None, ttl: float = None, max_entries: int = None,
+                 fingerprint: str = None):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: SQLite file (defaults to Config.LLM_CACHE_PATH)
+            ttl: Seconds an entry stays valid; 0 keeps entries until evicted
+            max_entries: Entries kept before least recently used ones are evicted
+            fingerprint: Prompt/tool-set fingerprint; a change clears the store
+        """
+        self.path = path or Config.LLM_CACHE_PATH
+        self.ttl = Config.LLM_CACHE_TTL if ttl is None else ttl
+        self.max_entries = max_entries or Config.LLM_CACHE_MAX_ENTRIES
+        self.fingerprint = fingerprint or ""
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        # Every server worker process opens the same file
+        self.engine = create_sqlite_engine(self.path)
+        _metadata.create_all(self.engine)
+        self._check_fingerprint()
+
+    def _check_fingerprint(self):
+        with self.engine.begin() as conn:
+            stored = conn.execute(select(_meta.c.value).where(_meta.c.name == "fingerprint")).scalar()
+            if stored == self.fingerprint:
+                return
+            conn.execute(delete(_entries))
+            conn.execute(delete(_meta).where(_meta.c.name == "fingerprint"))
+            conn.execute(_meta.insert().values(name="fingerprint", value=self.fingerprint))
+
+    def _key(self, prompt: str, llm_string: str) -> str:
+        payload = "\x1f".join((self.fingerprint, llm_string, normalize_prompt(prompt)))
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Return cached generations for a prompt, or None."""
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self._lock, self.engine.begin() as conn:
+            row = conn.execute(
+                select(_entries.c.return_val, _entries.c.created_at).where(_entries.c.key == key)
+            ).first()
+            if row and self.ttl and now - row.created_at > self.ttl:
+                conn.execute(delete(_entries).where(_entries.c.key == key))
+                row = None
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                conn.execute(
+                    update(_entries).where(_entries.c.key == key)
+                    .values(hits=_entries.c.hits + 1, last_used_at=now)
+                )
+        LLM_CACHE_REQUESTS.inc(result="hit" if row else "miss")
+        if row is None:
+            return None
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return loads(row.return_val)
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store generations and evict least recently used entries over the limit."""
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        values = {
+            "preview": _preview(prompt),
+            "return_val": dumps(list(return_val)),
+            "created_at": now,
+            "last_used_at": now,
+            "hits": 0
+        }
+        with self._lock, self.engine.begin() as conn:
+            if conn.execute(update(_entries).where(_entries.c.key == key).values(**values)).rowcount == 0:
+                conn.execute(_entries.insert().values(key=key, **values))
+            excess = conn.execute(select(func.count()).select_from(_entries)).scalar() - self.max_entries
+            if excess > 0:
+                oldest = select(_entries.c.key).order_by(_entries.c.last_used_at).limit(excess)
+                conn.execute(delete(_entries).where(_entries.c.key.in_(oldest.scalar_subquery())))
+
+    def clear(self, **kwargs: Any) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock, self.engine.begin() as conn:
+            conn.execute(delete(_entries))
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self, top: int = 10) -> Dict[str, Any]:
+        """Return cache-wide counters and the most frequently hit entries."""
+        now = time.time()
+        with self._lock, self.engine.connect() as conn:
+            size, stored_hits = conn.execute(
+                select(func.count(), func.coalesce(func.sum(_entries.c.hits), 0)).select_from(_entries)
+            ).one()
+            rows = conn.execute(
+                select(_entries.c.key, _entries.c.preview, _entries.c.hits,
+                       _entries.c.created_at, _entries.c.last_used_at)
+                .order_by(_entries.c.hits.desc(), _entries.c.last_used_at.desc())
+                .limit(top)
+            ).all()
+            lookups = self.hits + self.misses
+            return {
+                "path": self.path,
+                "fingerprint": self.fingerprint[:12],
+                "size": size,
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "stored_hits": stored_hits,
+                "top_entries": [
+                    {
+                        "key": row.key[:12],
+                        "scenario": row.preview,
+                        "hits": row.hits,
+                        "age_seconds": round(now - row.created_at, 1),
+                        "idle_seconds": round(now - row.last_used_at, 1)
+                    }
+                    for row in rows
+                ]
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[SQLiteLLMCache]:
+    """
+    Return the process-wide LLM cache, or None if caching does not apply.
+
+    The cache is only used when LLM_CACHE_ENABLED is set and the model runs
+    at temperature 0; sampled outputs must not be replayed.
+    """
+    global _cache
+    if not Config.LLM_CACHE_ENABLED or Config.MODEL_TEMPERATURE != 0:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SQLiteLLMCache(fingerprint=prompt_fingerprint())
+    return _cache
@@ -0,0 +1,157 @@
+"""
+Session memory and scratchpad compaction for multi-turn scenarios.
+
+Disputes run over several turns (mediation, evidence, analysis, then a
+refund or exoneration, with customer follow-ups in between). SessionMemory
+keeps the recent turns of each conversation, keyed by the session, order
+or customer in the request context. They are replayed to the agent as
+``chat_history``. The store is an in-process LRU with a TTL, and each
+session keeps only its last few turns.
+
+Within a turn, every agent step re-sends the whole ``agent_scratchpad``.
+compact_scratchpad is used as the agent's message formatter: it keeps the
+most recent tool observations verbatim and cuts older ones to a short head.
+Per-step input tokens then stay roughly flat as a turn grows.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from cachetools import TTLCache
+from langchain.agents.format_scratchpad.tools import format_to_tool_messages
+from langchain_core.agents import AgentAction
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+
+from .config import Config
+
+# Context keys that identify a conversation, most specific first
+SESSION_KEYS = ("session_id", "order_id", "customer_id")
+
+COMPACTED_MARKER = " [...]"
+
+
+def compact_text(text: Any, limit: int = None) -> str:
+    """Return ``text`` cut to ``limit`` characters, marking the cut."""
+    text = str(text)
+    limit = Config.SCRATCHPAD_COMPACT_CHARS if limit is None else limit
+    if len(text) <= limit:
+        return text
+    return text[:limit].rstrip() + COMPACTED_MARKER
+
+
+def compact_scratchpad(intermediate_steps: Sequence[Tuple[AgentAction, str]]) -> List[BaseMessage]:
+    """
+    Format the agent's intermediate steps, compacting all but the latest.
+
+    Observations from the last SCRATCHPAD_KEEP_RECENT_STEPS tool calls are
+    sent in full, since the next decision usually depends on them. Older
+    ones are cut to SCRATCHPAD_COMPACT_CHARS. Every tool call keeps its
+    paired tool message, as the chat APIs require.
+    """
+    keep = Config.SCRATCHPAD_KEEP_RECENT_STEPS
+    if len(intermediate_steps) <= keep:
+        return format_to_tool_messages(intermediate_steps)
+    cutoff = len(intermediate_steps) - keep
+    return format_to_tool_messages([
+        (action, compact_text(observation) if index < cutoff else observation)
+        for index, (action, observation) in enumerate(intermediate_steps)
+    ])
+
+
+def session_key(context: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Return the memory key for a request context, or None for a one-off scenario."""
+    for name in SESSION_KEYS:
+        if (context or {}).get(name):
+            return f"{name.removesuffix('_id')}:{context[name]}"
+    return None
+
+
+def summarize_turn(reasoning: str, executions: List[Dict[str, Any]]) -> str:
+    """Describe a finished turn compactly: the tools run, their outcomes and the answer."""
+    lines = [
+        f"- {execution['tool']} ({execution.get('status')}): {compact_text(execution.get('result'))}"
+        for execution in executions
+    ]
+    summary = compact_text(reasoning, Config.SCRATCHPAD_COMPACT_CHARS * 2)
+    if lines:
+        return "Actions taken:\n" + "\n".join(lines) + f"\nOutcome: {summary}"
+    return summary
+
+
+class SessionMemory:
+    """LRU- and TTL-bounded conversation turns per session."""
+
+    def __init__(self, max_sessions: int = None, max_turns: int = None, ttl: float = None):
+        """
+        Initialize the store.
+
+        Args:
+            max_sessions: Sessions kept before the least recently used is
+                evicted (defaults to Config.SESSION_MEMORY_MAX_SESSIONS)
+            max_turns: Turns kept per session, oldest dropped first
+                (defaults to Config.SESSION_MEMORY_MAX_TURNS)
+            ttl: Seconds a session lives after its last turn
+                (defaults to Config.SESSION_MEMORY_TTL_SECONDS)
+        """
+        self.max_sessions = max_sessions or Config.SESSION_MEMORY_MAX_SESSIONS
+        self.max_turns = max_turns or Config.SESSION_MEMORY_MAX_TURNS
+        self.ttl = ttl or Config.SESSION_MEMORY_TTL_SECONDS
+        self._sessions = TTLCache(maxsize=self.max_sessions, ttl=self.ttl)
+        self._lock = threading.Lock()
+
+    def history(self, key: Optional[str]) -> List[BaseMessage]:
+        """Return the session's earlier turns as chat messages (empty if unknown)."""
+        if key is None:
+            return []
+        with self._lock:
+            turns = list(self._sessions.get(key, ()))
+        messages = []
+        for scenario, summary in turns:
+            messages.extend([HumanMessage(content=scenario), AIMessage(content=summary)])
+        return messages
+
+    def record(self, key: Optional[str], scenario: str, reasoning: str,
+               executions: List[Dict[str, Any]]):
+        """Append a finished turn to the session, dropping its oldest turns past max_turns."""
+        if key is None:
+            return
+        turn = (compact_text(scenario, Config.SCRATCHPAD_COMPACT_CHARS * 2), summarize_turn(reasoning, executions))
+        with self._lock:
+            turns = self._sessions.get(key, ())
+            # Re-setting refreshes both the LRU position and the TTL
+            self._sessions[key] = (*turns, turn)[-self.max_turns:]
+
+    def forget(self, key: str) -> bool:
+        """Drop a session; return True if it existed."""
+        with self._lock:
+            return self._sessions.pop(key, None) is not None
+
+    def turns(self, key: str) -> int:
+        """Return the number of turns kept for a session."""
+        with self._lock:
+            return len(self._sessions.get(key, ()))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return current occupancy and limits."""
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "turns": sum(len(turns) for turns in self._sessions.values()),
+                "max_sessions": self.max_sessions,
+                "max_turns": self.max_turns,
+                "ttl": self.ttl
+            }
+
+
+_memory: Optional[SessionMemory] = None
+_memory_lock = threading.Lock()
+
+
+def get_session_memory() -> SessionMemory:
+    """Return the process-wide session memory, creating it on first use."""
+    global _memory
+    if _memory is None:
+        with _memory_lock:
+            if _memory is None:
+                _memory = SessionMemory()
+    return _memory
@@ -0,0 +1,65 @@
+"""
+Warm agent pool shared across server requests.
+"""
+
+import itertools
+import threading
+from typing import Callable, List, Optional
+
+from .agent import SynapseAgent
+from .config import Config
+from ..utils.logger import log_info
+
+
+class AgentPool:
+    """A fixed set of pre-built agents handed out round-robin."""
+
+    def __init__(self, size: int = None, factory: Callable[[], SynapseAgent] = None):
+        """
+        Build every agent in the pool up front.
+
+        Args:
+            size: Number of agents to build (defaults to Config.AGENT_POOL_SIZE)
+            factory: Callable returning a new agent (defaults to SynapseAgent)
+        """
+        self.size = max(1, size or Config.AGENT_POOL_SIZE)
+        self.factory = factory or SynapseAgent
+        self.agents: List[SynapseAgent] = [self.factory() for _ in range(self.size)]
+        self._cycle = itertools.cycle(self.agents)
+        self._lock = threading.Lock()
+
+    def acquire(self) -> SynapseAgent:
+        """
+        Return the next warm agent.
+
+        Agents keep no per-run state (callbacks are injected per request),
+        so the same instance can safely serve overlapping requests.
+        """
+        with self._lock:
+            return next(self._cycle)
+
+
+_pool: Optional[AgentPool] = None
+_pool_lock = threading.Lock()
+
+
+def init_agent_pool(size: int = None, factory: Callable[[], SynapseAgent] = None) -> AgentPool:
+    """Create the process-wide agent pool if it does not exist yet."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = AgentPool(size=size, factory=factory)
+            log_info(f"Agent pool ready with {_pool.size} warm agent(s)")
+        return _pool
+
+
+def get_agent_pool() -> AgentPool:
+    """Return the process-wide agent pool, building it on first use."""
+    return _pool or init_agent_pool()
+
+
+def reset_agent_pool():
+    """Drop the process-wide agent pool so the next call rebuilds it."""
+    global _pool
+    with _pool_lock:
+        _pool = None
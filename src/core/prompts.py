@@ -1,52 +1,211 @@
 """
 Agent prompts and persona definitions.
-"""
 
-from langchain.prompts import ChatPromptTemplate
-
-SYSTEM_PROMPT = """
-You are Synapse, an expert AI agent acting as an intelligent last-mile coordinator.
-
-Your primary directive is to autonomously resolve complex, real-time delivery disruptions. Your goal is to create a clear, actionable plan and execute it one step at a time based on the information you have.
-
-**Your Available Tools Are:**
-- `get_merchant_status(merchant_name: str)`: Checks a restaurant's or store's current status and prep time.
-- `check_traffic(route: str)`: Checks the traffic conditions for a specified route.
-- `notify_customer(customer_id: str, message: str)`: Sends a direct notification to a customer.
-- `contact_recipient_via_chat(customer_id: str, message: str)`: Contacts a package recipient to get instructions.
-- `reroute_driver(driver_id: str, new_task_description: str)`: Assigns a new task to a driver to prevent them from being idle.
-- `get_nearby_merchants(cuisine_type: str)`: Finds alternative merchants with a similar cuisine.
-- `suggest_safe_drop_off(address: str)`: Suggests a safe drop-off location like a concierge.
-- `find_nearby_locker(address: str)`: Finds a secure parcel locker as an alternative delivery point.
-- `initiate_mediation_flow(customer_id: str, driver_id: str)`: Starts a dispute resolution session.
-- `collect_evidence(customer_id: str, driver_id: str)`: Gathers evidence from both parties in a dispute.
-- `analyze_evidence(evidence_string: str)`: Determines the cause of a dispute based on evidence.
-- `issue_instant_refund(customer_id: str, reason: str)`: Issues a refund to a customer.
-- `exonerate_driver(driver_id: str, reason: str)`: Clears a driver of fault.
-- `log_merchant_packaging_feedback(merchant_name: str, feedback: str)`: Logs packaging feedback for a merchant.
-- `request_address_clarification(customer_id: str, vague_address: str)`: Asks the customer for landmarks to clarify a vague address.
-- `verify_delivery_attempt(driver_id: str, customer_address: str)`: Checks a driver's GPS data to confirm if a delivery attempt was legitimate.
-- `initiate_qr_code_verification(customer_id: str, driver_id: str)`: Provides a secure QR code for the customer to scan when an OTP fails.
- 
-**Key Directives:**
-- **Dispute Types:** You must first determine the type of dispute.
-    - If the dispute involves **damaged, spilled, or broken items**, you MUST use the mediation workflow starting with `initiate_mediation_flow` or `collect_evidence`.
-    - If the dispute is a **"failed delivery"** where the customer claims the driver never arrived, you MUST use the verification workflow starting with `verify_delivery_attempt`.
-- **Verification Workflow:**
-    - If `verify_delivery_attempt` is **successful** (the driver was there), your next step is to `notify_customer` that the attempt was valid and ask if they would like to reschedule.
-    - If `verify_delivery_attempt` **fails** (the driver was not there), your next step is to `notify_customer`, apologize for the error, and immediately reschedule the delivery.
-- **Address Resolution:** If a driver reports being unable to find an address, your only action should be to use `request_address_clarification`.
-- **Customer-First:** If an order is delayed or cancelled, try to suggest alternatives using `get_nearby_merchants`.
-- **Assume Information:** If you need a `cuisine_type`, make a reasonable assumption based on the merchant's name.
-- **OTP Failures:** If a customer or driver reports that the delivery confirmation OTP has not been received, your first and only action should be to use `initiate_qr_code_verification`.
-
-You must always think step-by-step and show your work.
+The system prompt is compiled from the tools bound to the agent. Tool
+signatures and descriptions already reach the model as function
+declarations, so the prompt only carries the persona and the directives
+whose tools are actually available.
 """
 
-def create_agent_prompt() -> ChatPromptTemplate:
-    """Create the main agent prompt template."""
+import hashlib
+import json
+from typing import Dict, List, Sequence
+
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from .config import Config
+from ..tools.registry import ALL_TOOLS
+from ..utils.tokens import count_tokens, token_counting_method
+
+PERSONA = """You are Synapse, an expert AI agent acting as an intelligent last-mile coordinator.
+
+Your primary directive is to autonomously resolve complex, real-time delivery disruptions. Your goal is to create a clear, actionable plan and execute it one step at a time based on the information you have. Use the tools provided to you."""
+
+CLOSING = "You must always think step-by-step and show your work."
+
+
+class Directive:
+    """A policy rule that is only relevant when its tools are bound."""
+
+    def __init__(self, name: str, text: str, tools: Sequence[str] = ()):
+        """
+        Initialize the directive.
+
+        Args:
+            name: Short identifier used in reports
+            text: Markdown bullet (without the leading dash) sent to the model
+            tools: Tool names the directive refers to; all must be bound
+        """
+        self.name = name
+        self.text = text
+        self.tools = tuple(tools)
+
+    def applies_to(self, tool_names: set) -> bool:
+        """Return True if every tool the directive refers to is available."""
+        return all(tool in tool_names for tool in self.tools)
+
+
+DIRECTIVES = [
+    # Only needed while the agent must choose between the two dispute
+    # workflows below; a category's tool subset has already settled that
+    Directive(
+        "dispute_types",
+        "**Dispute Types:** You must first determine the type of dispute.",
+        ["initiate_mediation_flow", "collect_evidence", "verify_delivery_attempt"]
+    ),
+    Directive(
+        "damaged_items",
+        "**Damaged Items:** If the dispute involves **damaged, spilled, or broken items**, you MUST use "
+        "the mediation workflow starting with `initiate_mediation_flow` or `collect_evidence`.",
+        ["initiate_mediation_flow", "collect_evidence"]
+    ),
+    Directive(
+        "failed_delivery",
+        "**Failed Delivery:** If the customer claims the driver never arrived, you MUST use the "
+        "verification workflow starting with `verify_delivery_attempt`.",
+        ["verify_delivery_attempt"]
+    ),
+    Directive(
+        "verification_workflow",
+        "**Verification Workflow:** If `verify_delivery_attempt` is **successful**, `notify_customer` "
+        "that the attempt was valid and ask if they would like to reschedule. If it **fails**, "
+        "`notify_customer`, apologize for the error, and immediately reschedule the delivery.",
+        ["verify_delivery_attempt", "notify_customer"]
+    ),
+    Directive(
+        "address_resolution",
+        "**Address Resolution:** If a driver cannot find an address, your only action should be "
+        "`request_address_clarification`.",
+        ["request_address_clarification"]
+    ),
+    Directive(
+        "customer_first",
+        "**Customer-First:** If an order is delayed or cancelled, suggest alternatives using "
+        "`get_nearby_merchants`. If you need a `cuisine_type`, assume one from the merchant's name.",
+        ["get_nearby_merchants"]
+    ),
+    Directive(
+        "otp_failure",
+        "**OTP Failures:** If the delivery confirmation OTP was not received, your first and only "
+        "action should be `initiate_qr_code_verification`.",
+        ["initiate_qr_code_verification"]
+    ),
+]
+
+
+# Directives of the original hand-written prompt and the directives that carry each one now
+BASELINE_DIRECTIVES = {
+    "Dispute Types": ["dispute_types", "damaged_items", "failed_delivery"],
+    "Verification Workflow": ["verification_workflow"],
+    "Address Resolution": ["address_resolution"],
+    "Customer-First": ["customer_first"],
+    "Assume Information": ["customer_first"],
+    "OTP Failures": ["otp_failure"],
+}
+
+
+def _tool_names(tools: list) -> set:
+    return {tool.name for tool in (ALL_TOOLS if tools is None else tools)}
+
+
+def compile_system_prompt(tools: list = None) -> str:
+    """
+    Build the system prompt for a set of bound tools.
+
+    Args:
+        tools: Tools the agent is bound to (defaults to ALL_TOOLS)
+
+    Returns:
+        The persona followed by the directives that apply to the tools
+    """
+    tool_names = _tool_names(tools)
+    directives = [f"- {directive.text}" for directive in DIRECTIVES if directive.applies_to(tool_names)]
+    sections = [PERSONA]
+    if directives:
+        sections.append("**Key Directives:**\n" + "\n".join(directives))
+    sections.append(CLOSING)
+    return "\n\n".join(sections)
+
+
+SYSTEM_PROMPT = compile_system_prompt()
+
+
+def prompt_fingerprint(tools: list = None) -> str:
+    """
+    Hash everything that shapes the agent's requests besides the scenario.
+
+    Covers the persona, every directive and the schemas of the tools, so it
+    changes whenever the system prompt or the tool set does. Persistent
+    caches use it to drop entries built from an older prompt.
+    """
+    tools = ALL_TOOLS if tools is None else tools
+    payload = {
+        "persona": PERSONA,
+        "closing": CLOSING,
+        "directives": [[directive.text, list(directive.tools)] for directive in DIRECTIVES],
+        "tools": sorted(
+            (convert_to_openai_tool(tool) for tool in tools), key=lambda schema: schema["function"]["name"]
+        )
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def prompt_token_report(tools: list = None, budget: int = None) -> Dict:
+    """
+    Count the fixed input tokens every LLM step pays for.
+
+    Args:
+        tools: Tools the agent is bound to (defaults to ALL_TOOLS)
+        budget: Token budget for prompt plus tool schemas (defaults to Config.PROMPT_TOKEN_BUDGET)
+
+    Returns:
+        Dictionary with per-part token counts and whether the budget holds
+    """
+    tools = ALL_TOOLS if tools is None else tools
+    budget = Config.PROMPT_TOKEN_BUDGET if budget is None else budget
+    tool_names = _tool_names(tools)
+    system_tokens = count_tokens(compile_system_prompt(tools))
+    schema_tokens = count_tokens(json.dumps([convert_to_openai_tool(tool) for tool in tools]))
+    total = system_tokens + schema_tokens
+    return {
+        "method": token_counting_method(),
+        "tools": len(tools),
+        "directives": [directive.name for directive in DIRECTIVES if directive.applies_to(tool_names)],
+        "system_prompt_tokens": system_tokens,
+        "tool_schema_tokens": schema_tokens,
+        "total_tokens": total,
+        "budget": budget,
+        "within_budget": total <= budget
+    }
+
+
+def create_agent_prompt(tools: list = None) -> ChatPromptTemplate:
+    """Create the main agent prompt template for a set of bound tools."""
+    system_prompt = SYSTEM_PROMPT if tools is None else compile_system_prompt(tools)
     return ChatPromptTemplate.from_messages([
-        ("system", SYSTEM_PROMPT),
+        ("system", system_prompt),
+        # Earlier turns of the same session, if any (see memory.SessionMemory)
+        ("placeholder", "{chat_history}"),
         ("human", "{input}"),
         ("placeholder", "{agent_scratchpad}"),
     ])
+
+
+def check_baseline_directives() -> List[str]:
+    """Return original prompt directives missing from the full-tool system prompt."""
+    tool_names = _tool_names(None)
+    included = {directive.name for directive in DIRECTIVES if directive.applies_to(tool_names)}
+    return [
+        heading for heading, names in BASELINE_DIRECTIVES.items()
+        if not all(name in included for name in names)
+    ]
+
+
+def check_directive_tools() -> List[str]:
+    """Return directive tool references that do not exist in the registry."""
+    known = _tool_names(None)
+    return [
+        f"{directive.name}: {tool}"
+        for directive in DIRECTIVES for tool in directive.tools if tool not in known
+    ]
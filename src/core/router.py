@@ -0,0 +1,229 @@
+"""
+Deterministic fast path for scenarios fully covered by the prompt directives.
+
+Some directives in SYSTEM_PROMPT leave the agent no choice (an OTP failure
+always means QR verification, an unfindable address always means asking the
+customer for landmarks, ...). Scenarios that clearly match one of these
+rules are resolved here by running the prescribed tool chain directly,
+skipping the LLM round trips entirely.
+
+A scenario only takes the fast path when the identifiers its actions need
+are known and nothing in it points at another dispute category; anything
+else goes to the agent.
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .classifier import CATEGORY_PATTERNS
+from ..tools.base import is_degraded
+from ..tools.registry import TOOLS_BY_NAME
+
+
+def _id_pattern(keyword: str) -> "re.Pattern":
+    # Either labelled ("customer id 1042", "customer #1042") or an
+    # uppercase-prefixed ID right after the keyword ("customer C-1042"), so
+    # "customer 30 minutes waiting" yields no ID
+    return re.compile(
+        rf"\b(?i:{keyword})(?:\s+(?i:id)\s*[:#]?\s*|\s*#\s*)([\w-]*\d[\w-]*)"
+        rf"|\b(?i:{keyword})\s*:?\s*([A-Z]+-?\d[\w-]*)"
+    )
+
+
+_ID_PATTERNS = {
+    "customer_id": _id_pattern("customer"),
+    "driver_id": _id_pattern("driver"),
+}
+_ADDRESS_PATTERN = re.compile(r"\baddress\s*:\s*(.+)$", re.IGNORECASE)
+
+
+def _extract(scenario: str, context: Dict[str, Any], key: str) -> Optional[str]:
+    """Look up an identifier in the request context, then in the scenario text."""
+    if context.get(key):
+        return str(context[key])
+    match = _ID_PATTERNS[key].search(scenario)
+    return (match.group(1) or match.group(2)) if match else None
+
+
+def _extract_address(scenario: str, context: Dict[str, Any], default: str) -> str:
+    """Look up the delivery address in the request context, then in the scenario text."""
+    for key in ("customer_address", "address"):
+        if context.get(key):
+            return str(context[key])
+    match = _ADDRESS_PATTERN.search(scenario)
+    return match.group(1).strip(" '\".") if match else default
+
+
+class FastPathRoute:
+    """A scenario class with a fixed resolution."""
+
+    def __init__(self, name: str, patterns: List[str], plan: Callable, reasoning: str,
+                 category: str, required: Sequence[str] = ()):
+        """
+        Initialize the route.
+
+        Args:
+            name: Route name reported back to callers
+            patterns: Regexes that must all match the scenario
+            plan: Async callable ``(call, scenario, context)`` running the tool chain
+            reasoning: Explanation returned as the agent reasoning
+            category: Classifier category the route belongs to
+            required: Identifiers (``customer_id``, ``driver_id``) the tool
+                chain needs; without all of them the agent handles the scenario
+        """
+        self.name = name
+        self.patterns = [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+        self.plan = plan
+        self.reasoning = reasoning
+        self.category = category
+        self.required = tuple(required)
+
+    def matches(self, scenario: str) -> bool:
+        """Return True if every pattern matches the scenario."""
+        return all(pattern.search(scenario) for pattern in self.patterns)
+
+
+class FastPathRouter:
+    """Classify scenarios and resolve rule-bound ones without the LLM."""
+
+    def __init__(self, tools: list = None):
+        """Initialize the router with the tools it may call."""
+        self.tools = {tool.name: tool for tool in tools} if tools else TOOLS_BY_NAME
+        self.routes = [
+            FastPathRoute(
+                "otp_failure",
+                [r"\b(otp|one[- ]time (password|code|pin))\b",
+                 r"\b(not|never|didn'?t|hasn'?t|haven'?t|no|fail(ed|ing)?)\b"],
+                self._plan_otp_failure,
+                "The delivery confirmation OTP was not received. Per policy the only "
+                "action is to start in-app QR code verification.",
+                "failed_delivery", ["customer_id", "driver_id"]
+            ),
+            FastPathRoute(
+                "address_not_found",
+                [r"\b(can'?t|cannot|can not|unable to|could ?n[o']t)\s+(find|locate)\s+(the\s+)?"
+                 r"(customer'?s?\s+)?(address|house|building|location)\b"],
+                self._plan_address_not_found,
+                "The driver cannot find the address. Per policy the only action is to "
+                "ask the customer for clarifying landmarks.",
+                "recipient_access", ["customer_id"]
+            ),
+            FastPathRoute(
+                "driver_never_arrived",
+                [r"\b(driver|courier|rider)\b.*\b(never|didn'?t|did not)\s+(arrive|show|come|turn up)"],
+                self._plan_driver_never_arrived,
+                "The customer disputes a failed delivery. Per policy the driver's GPS "
+                "data is verified first and the customer is notified of the outcome.",
+                "failed_delivery", ["customer_id", "driver_id"]
+            ),
+        ]
+        self.categories = {
+            category: [re.compile(pattern, re.IGNORECASE) for pattern in rules]
+            for category, rules in CATEGORY_PATTERNS.items()
+        }
+
+    def _other_categories(self, route: FastPathRoute, scenario: str) -> List[str]:
+        """Return the dispute categories besides the route's own that the scenario mentions."""
+        # The address value is data for the plan, not a category signal
+        text = _ADDRESS_PATTERN.sub("", scenario)
+        return [
+            category for category, rules in self.categories.items()
+            if category != route.category and any(rule.search(text) for rule in rules)
+        ]
+
+    def classify(self, scenario: str, context: Dict[str, Any] = None) -> Optional[FastPathRoute]:
+        """
+        Return the route for a scenario, or None if it needs the full agent.
+
+        A scenario is only routed when exactly one rule matches, it mentions
+        no other dispute category (a damaged item or a delay needs handling
+        the fixed chain would skip), and every identifier the route's actions
+        need is in the context or stated explicitly in the scenario.
+        """
+        context = context or {}
+        matched = [route for route in self.routes if route.matches(scenario)]
+        if len(matched) != 1:
+            return None
+        route = matched[0]
+        if self._other_categories(route, scenario):
+            return None
+        if any(_extract(scenario, context, key) is None for key in route.required):
+            return None
+        return route
+
+    async def resolve(self, route: FastPathRoute, scenario: str, context: Dict[str, Any] = None,
+                      callbacks: list = None) -> Dict[str, Any]:
+        """Run a route's tool chain and return a process_scenario-shaped result."""
+        context = context or {}
+        executions = []
+        config = {"callbacks": callbacks} if callbacks else None
+
+        async def call(tool_name: str, params: Dict[str, Any]) -> str:
+            execution = {
+                "tool": tool_name,
+                "params": params,
+                "reasoning": f"Fast path '{route.name}' requires {tool_name}",
+                "result": None,
+                "status": "pending"
+            }
+            executions.append(execution)
+            try:
+                execution["result"] = await self.tools[tool_name].ainvoke(params, config=config)
+                execution["status"] = "degraded" if is_degraded(execution["result"]) else "success"
+            except Exception as e:
+                execution["result"] = f"Error: {str(e)}"
+                execution["status"] = "error"
+                execution["error"] = str(e)
+                raise
+            return execution["result"]
+
+        try:
+            summary = await route.plan(call, scenario, context)
+            success = True
+        except Exception as e:
+            summary = f"Fast path failed: {str(e)}"
+            success = False
+
+        return {
+            "reasoning": f"{route.reasoning}\n\n{summary}",
+            "actions": executions,
+            "execution_results": executions,
+            "success": success,
+            "path": "fast_path",
+            "route": route.name
+        }
+
+    @staticmethod
+    async def _plan_otp_failure(call, scenario: str, context: Dict[str, Any]) -> str:
+        return await call("initiate_qr_code_verification", {
+            "customer_id": _extract(scenario, context, "customer_id"),
+            "driver_id": _extract(scenario, context, "driver_id")
+        })
+
+    @staticmethod
+    async def _plan_address_not_found(call, scenario: str, context: Dict[str, Any]) -> str:
+        return await call("request_address_clarification", {
+            "customer_id": _extract(scenario, context, "customer_id"),
+            "vague_address": _extract_address(scenario, context, scenario)
+        })
+
+    @staticmethod
+    async def _plan_driver_never_arrived(call, scenario: str, context: Dict[str, Any]) -> str:
+        customer_id = _extract(scenario, context, "customer_id")
+        verification = await call("verify_delivery_attempt", {
+            "driver_id": _extract(scenario, context, "driver_id"),
+            "customer_address": _extract_address(scenario, context, "customer address on file")
+        })
+
+        if is_degraded(verification):
+            # Without GPS data neither outcome can be asserted to the customer
+            message = ("We're looking into your delivery and verifying the driver's records. "
+                       "We'll update you shortly.")
+        elif verification.startswith("Verification successful"):
+            message = ("Our driver's GPS data confirms a delivery attempt was made at your address. "
+                       "Would you like to reschedule the delivery?")
+        else:
+            message = ("We apologize: our records show the delivery attempt was not valid. "
+                       "Your delivery has been rescheduled at no extra cost.")
+        notification = await call("notify_customer", {"customer_id": customer_id, "message": message})
+        return f"{verification}\n{notification}"
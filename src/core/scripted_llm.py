@@ -0,0 +1,127 @@
+"""
+Deterministic, offline stand-in for the Gemini chat model.
+
+The scripted model replays canned tool calls for the example scenarios so
+the agent, callbacks, tools and server can be exercised and benchmarked
+without network access. Select it with ``LLM_PROVIDER=scripted``.
+"""
+
+import asyncio
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+# (scenario pattern, steps); each step is the list of tool calls emitted in
+# one LLM turn. "{observation}" in an argument is replaced by the previous
+# tool result.
+DEFAULT_SCRIPTS: List[Tuple[str, List[List[Tuple[str, Dict[str, Any]]]]]] = [
+    (r"overloaded|prep time|kitchen", [
+        [("get_merchant_status", {"merchant_name": "Pizza Palace"})],
+        [("notify_customer", {"customer_id": "CUST-001",
+                              "message": "Your order is delayed because the restaurant is busy."}),
+         ("reroute_driver", {"driver_id": "DRV-001",
+                             "new_task_description": "Pick up a nearby order while the food is prepared."})],
+        [("get_nearby_merchants", {"cuisine_type": "Italian"})],
+    ]),
+    (r"spill|damage|broken", [
+        [("initiate_mediation_flow", {"customer_id": "CUST-001", "driver_id": "DRV-001"})],
+        [("collect_evidence", {"customer_id": "CUST-001", "driver_id": "DRV-001"})],
+        [("analyze_evidence", {"evidence_string": "{observation}"})],
+        [("issue_instant_refund", {"customer_id": "CUST-001", "reason": "Items damaged in transit."}),
+         ("exonerate_driver", {"driver_id": "DRV-001", "reason": "Evidence points to packaging."}),
+         ("log_merchant_packaging_feedback", {"merchant_name": "Merchant",
+                                              "feedback": "Seal drinks before dispatch."})],
+    ]),
+    (r"find the address|cannot find|can't find", [
+        [("request_address_clarification", {"customer_id": "CUST-001",
+                                            "vague_address": "Room 301, Near big temple"})],
+    ]),
+    (r"never arrived|failed delivery", [
+        [("verify_delivery_attempt", {"driver_id": "DRV-001", "customer_address": "221B Baker Street"})],
+        [("notify_customer", {"customer_id": "CUST-001",
+                              "message": "We checked the delivery attempt and will reschedule."})],
+    ]),
+    (r"traffic|route|obstruction", [
+        [("check_traffic", {"route": "Downtown to Airport"})],
+        [("notify_customer", {"customer_id": "CUST-001", "message": "Traffic is delaying your delivery."})],
+    ]),
+]
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token estimate (about four characters per token)."""
+    return max(1, len(text) // 4)
+
+
+class ScriptedChatModel(BaseChatModel):
+    """A chat model that plays back scripted tool calls instead of calling an API."""
+
+    scripts: List[Tuple[str, List[List[Tuple[str, Dict[str, Any]]]]]] = DEFAULT_SCRIPTS
+    latency: float = 0.0
+    """Simulated seconds of model latency per call."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, **kwargs):
+        """Tool schemas are irrelevant to a scripted model; keep the same instance."""
+        return self
+
+    def _script_for(self, scenario: str) -> List[List[Tuple[str, Dict[str, Any]]]]:
+        for pattern, steps in self.scripts:
+            if re.search(pattern, scenario, re.IGNORECASE):
+                return steps
+        return []
+
+    def _respond(self, messages: List[BaseMessage]) -> ChatResult:
+        """Build the next scripted turn from the conversation so far."""
+        # The current scenario is the last human turn; earlier ones are session history
+        scenario = next((m.content for m in reversed(messages) if isinstance(m, HumanMessage)), "")
+        step = sum(1 for m in messages if isinstance(m, AIMessage) and m.tool_calls)
+        observations = [m.content for m in messages if isinstance(m, ToolMessage)]
+        steps = self._script_for(str(scenario))
+
+        if step < len(steps):
+            last = observations[-1] if observations else ""
+            tool_calls = [
+                {
+                    "name": name,
+                    "args": {key: value.replace("{observation}", str(last)) if isinstance(value, str) else value
+                             for key, value in args.items()},
+                    "id": f"call_{step}_{index}",
+                    "type": "tool_call"
+                }
+                for index, (name, args) in enumerate(steps[step])
+            ]
+            message = AIMessage(content="", tool_calls=tool_calls)
+            output_text = str(tool_calls)
+        else:
+            summary = "; ".join(str(o) for o in observations) or "No tools were needed."
+            message = AIMessage(content=f"Scenario resolved. {summary}")
+            output_text = message.content
+
+        input_tokens = sum(_estimate_tokens(str(m.content)) for m in messages)
+        output_tokens = _estimate_tokens(output_text)
+        message.usage_metadata = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens
+        }
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._respond(messages)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager=None, **kwargs) -> ChatResult:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._respond(messages)
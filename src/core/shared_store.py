@@ -0,0 +1,224 @@
+"""
+State shared between server worker processes.
+
+In production mode the server runs several worker processes. Tool result
+caches and rate-limit counters kept in process memory would then be split
+per worker: each worker warms its own cache and enforces its own limit.
+SharedStore keeps them in a local SQLite file that every worker on the
+host opens. LocalStore has the same interface for single-process runs.
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import (
+    Column, Float, Integer, MetaData, String, Table, Text, case, create_engine, delete, event, func, select
+)
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Engine
+
+from .config import Config
+
+_metadata = MetaData()
+
+_entries = Table(
+    "shared_state",
+    _metadata,
+    Column("namespace", String(64), primary_key=True),
+    Column("key", String(512), primary_key=True),
+    Column("value", Text),
+    Column("counter", Integer, nullable=False, default=0),
+    Column("expires_at", Float, nullable=False, index=True),
+)
+
+
+def _configure_connection(dbapi_connection, connection_record):
+    """Let concurrent readers and writers (threads and worker processes) coexist."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+
+def create_sqlite_engine(path: str) -> Engine:
+    """
+    Create an engine for a local SQLite file shared by threads and processes.
+
+    The file uses WAL journaling and a busy timeout. Readers then never block
+    the single writer, and writers from other worker processes wait for the
+    lock instead of failing with "database is locked".
+    """
+    if path != ":memory:":
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    event.listen(engine, "connect", _configure_connection)
+    return engine
+
+
+class SharedStore:
+    """SQLite key/value entries and counters with expiry, shared across processes."""
+
+    def __init__(self, path: str = None):
+        """
+        Open (or create) the shared state database.
+
+        Args:
+            path: SQLite file (defaults to Config.SHARED_STATE_PATH)
+        """
+        self.path = path or Config.SHARED_STATE_PATH
+        self.engine = create_sqlite_engine(self.path)
+        _metadata.create_all(self.engine)
+
+    def get(self, namespace: str, key: str) -> Tuple[bool, Optional[str]]:
+        """Return ``(found, value)`` for an unexpired entry."""
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(_entries.c.value).where(
+                    _entries.c.namespace == namespace, _entries.c.key == key,
+                    _entries.c.expires_at > time.time()
+                )
+            ).first()
+        return (True, row.value) if row else (False, None)
+
+    def items(self, namespace: str) -> Dict[str, str]:
+        """Return every unexpired entry of a namespace by key."""
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(_entries.c.key, _entries.c.value).where(
+                    _entries.c.namespace == namespace, _entries.c.expires_at > time.time()
+                )
+            ).all()
+        return {row.key: row.value for row in rows}
+
+    def set(self, namespace: str, key: str, value: str, ttl: float, max_entries: int = None):
+        """
+        Store a value for ``ttl`` seconds.
+
+        With ``max_entries``, the namespace's entries closest to expiry (the
+        oldest, for a fixed ttl) are evicted beyond that many.
+        """
+        statement = insert(_entries).values(
+            namespace=namespace, key=key, value=value, counter=0, expires_at=time.time() + ttl
+        )
+        in_namespace = _entries.c.namespace == namespace
+        with self.engine.begin() as conn:
+            conn.execute(statement.on_conflict_do_update(
+                index_elements=[_entries.c.namespace, _entries.c.key],
+                set_={"value": statement.excluded.value, "expires_at": statement.excluded.expires_at}
+            ))
+            if max_entries is None:
+                return
+            excess = conn.execute(select(func.count()).select_from(_entries).where(in_namespace)).scalar() - max_entries
+            if excess > 0:
+                oldest = select(_entries.c.key).where(in_namespace).order_by(_entries.c.expires_at).limit(excess)
+                conn.execute(delete(_entries).where(in_namespace, _entries.c.key.in_(oldest.scalar_subquery())))
+
+    def incr(self, namespace: str, key: str, amount: int = 1, ttl: float = 60) -> int:
+        """
+        Add to a counter and return its new value.
+
+        A counter that has expired starts again from zero with a fresh
+        ``ttl``, which makes fixed-window rate limits a single statement.
+        """
+        now = time.time()
+        statement = insert(_entries).values(
+            namespace=namespace, key=key, counter=amount, expires_at=now + ttl
+        )
+        expired = _entries.c.expires_at <= now
+        statement = statement.on_conflict_do_update(
+            index_elements=[_entries.c.namespace, _entries.c.key],
+            set_={
+                "counter": case((expired, amount), else_=_entries.c.counter + amount),
+                "expires_at": case((expired, now + ttl), else_=_entries.c.expires_at)
+            }
+        ).returning(_entries.c.counter)
+        with self.engine.begin() as conn:
+            return conn.execute(statement).scalar()
+
+    def clear(self, namespace: str):
+        """Drop every entry of a namespace."""
+        with self.engine.begin() as conn:
+            conn.execute(delete(_entries).where(_entries.c.namespace == namespace))
+
+    def purge_expired(self) -> int:
+        """Delete expired entries; return how many."""
+        with self.engine.begin() as conn:
+            return conn.execute(delete(_entries).where(_entries.c.expires_at <= time.time())).rowcount
+
+
+class LocalStore:
+    """In-process stand-in for SharedStore when the server runs a single worker."""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: str) -> Tuple[bool, Optional[Any]]:
+        """Return ``(found, value)`` for an unexpired entry."""
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+        if entry is None or entry[2] <= time.time():
+            return False, None
+        return True, entry[0]
+
+    def items(self, namespace: str) -> Dict[str, Any]:
+        """Return every unexpired entry of a namespace by key."""
+        now = time.time()
+        with self._lock:
+            return {
+                key: entry[0] for (entry_namespace, key), entry in self._entries.items()
+                if entry_namespace == namespace and entry[2] > now
+            }
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float, max_entries: int = None):
+        """Store a value for ``ttl`` seconds, evicting the namespace's oldest beyond ``max_entries``."""
+        with self._lock:
+            self._entries[(namespace, key)] = (value, 0, time.time() + ttl)
+            if max_entries is None:
+                return
+            keys = sorted((entry[2], k) for k, entry in self._entries.items() if k[0] == namespace)
+            for _, entry_key in keys[:max(0, len(keys) - max_entries)]:
+                del self._entries[entry_key]
+
+    def incr(self, namespace: str, key: str, amount: int = 1, ttl: float = 60) -> int:
+        """Add to a counter and return its new value; expired counters restart."""
+        now = time.time()
+        with self._lock:
+            _, counter, expires_at = self._entries.get((namespace, key), (None, 0, 0))
+            if expires_at <= now:
+                counter, expires_at = 0, now + ttl
+            counter += amount
+            self._entries[(namespace, key)] = (None, counter, expires_at)
+        return counter
+
+    def clear(self, namespace: str):
+        """Drop every entry of a namespace."""
+        with self._lock:
+            for entry_key in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[entry_key]
+
+    def purge_expired(self) -> int:
+        """Delete expired entries; return how many."""
+        now = time.time()
+        with self._lock:
+            expired = [k for k, entry in self._entries.items() if entry[2] <= now]
+            for entry_key in expired:
+                del self._entries[entry_key]
+        return len(expired)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_shared_store():
+    """Return the SharedStore when SHARED_STATE_ENABLED, else a process-local store."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SharedStore() if Config.SHARED_STATE_ENABLED else LocalStore()
+    return _store
@@ -2,6 +2,7 @@
 CLI interface for the refactored Project Synapse agent.
 """
 
+import asyncio
 import sys
 import os
 from pathlib import Path
@@ -13,12 +14,20 @@ sys.path.insert(0, str(project_root))
 import colorama
 from src.core.agent import SynapseAgent
 from src.utils.logger import (
-    bcolors, log_coordinator, log_final_answer, log_error, log_info
+    bcolors, configure_logging, flush_logs, log_coordinator, log_final_answer, log_error, log_info
 )
 
 # Initialize colorama for cross-platform colored output
 colorama.init(autoreset=True)
 
+# Example scenarios shown by the help command
+EXAMPLE_SCENARIOS = [
+    "Driver reports Pizza Palace is overloaded with 45-minute wait",
+    "Customer complains their food arrived spilled and damaged",
+    "Driver cannot find the address: Room 301, Near big temple",
+    "Customer says driver never arrived but marked as failed delivery",
+]
+
 
 class SynapseCLI:
     """Command-line interface for the Synapse agent."""
@@ -35,6 +44,13 @@ class SynapseCLI:
     
     def run(self):
         """Run the main interactive loop."""
+        # One event loop for the whole session: the LLM client and the async
+        # tool pools bind to the loop they were first used on
+        with asyncio.Runner() as runner:
+            self._loop(runner)
+    
+    def _loop(self, runner: asyncio.Runner):
+        flush_logs()
         print(f"{bcolors.HEADER}{bcolors.BOLD}Welcome to Project Synapse Interactive CLI (Refactored)")
         print(f"{bcolors.HEADER}You can describe a delivery disruption, and the agent will try to resolve it.")
         print(f"{bcolors.HEADER}Type 'exit' or 'quit' to end the session.")
@@ -42,6 +58,9 @@ class SynapseCLI:
 
         while True:
             try:
+                # Make sure queued log output is on screen before prompting
+                flush_logs()
+                
                 # Get user input
                 user_input = input(f"{bcolors.BOLD}Enter a disruption scenario: {bcolors.ENDC}")
 
@@ -61,8 +80,8 @@ class SynapseCLI:
                 # Process the scenario
                 log_coordinator("Received new disruption. Handing over to the agent...")
                 
-                result = self.agent.process_scenario(user_input)
-                log_final_answer(result)
+                result = runner.run(self.agent.process_scenario(user_input))
+                log_final_answer(result["reasoning"])
                 
                 log_coordinator("Agent has completed its task and is ready for the next scenario.\n")
 
@@ -79,20 +98,20 @@ class SynapseCLI:
         print(f"{bcolors.OKCYAN}  exit  - Exit the application")
         print(f"{bcolors.OKCYAN}  quit  - Exit the application")
         print(f"\n{bcolors.OKCYAN}Example Scenarios:")
-        print(f"{bcolors.OKCYAN}  'Driver reports Pizza Palace is overloaded with 45-minute wait'")
-        print(f"{bcolors.OKCYAN}  'Customer complains their food arrived spilled and damaged'")
-        print(f"{bcolors.OKCYAN}  'Driver cannot find the address: Room 301, Near big temple'")
-        print(f"{bcolors.OKCYAN}  'Customer says driver never arrived but marked as failed delivery'")
+        for scenario in EXAMPLE_SCENARIOS:
+            print(f"{bcolors.OKCYAN}  '{scenario}'")
         print()
 
 
 def main():
     """Main entry point for the CLI application."""
+    configure_logging(mode="cli")
     try:
         cli = SynapseCLI()
         cli.run()
     except Exception as e:
         log_error(f"Failed to start application: {e}")
+        flush_logs()
         return 1
     
     return 0
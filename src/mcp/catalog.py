@@ -0,0 +1,81 @@
+"""
+Precomputed tool catalog served by the MCP server.
+
+The tool set is fixed once the registry is built, so the catalog is computed
+and serialised once. The result is reused for every request, with a content
+hash ETag: clients polling /tools revalidate with If-None-Match and get an
+empty 304 response while nothing has changed.
+"""
+
+import hashlib
+import threading
+from typing import Any, Dict, Optional
+
+import orjson
+from fastapi import Request, Response
+
+from ..core.config import Config
+from ..tools.registry import ALL_TOOLS
+
+
+class CatalogDocument:
+    """A JSON document serialised once, with its ETag."""
+
+    def __init__(self, content: Any):
+        self.body = orjson.dumps(content)
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Return True if an If-None-Match header names this document's ETag."""
+        if not if_none_match:
+            return False
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        # Weak comparison, as RFC 9110 requires for If-None-Match
+        return "*" in tags or any(tag.removeprefix("W/") == self.etag for tag in tags)
+
+    def response(self, request: Request) -> Response:
+        """Return the document, or 304 Not Modified if the client already has it."""
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache"}
+        if self.matches(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, media_type="application/json", headers=headers)
+
+
+def describe_tool(tool) -> Dict[str, Any]:
+    """Return the catalog entry for a tool, including its full argument JSON schema."""
+    metadata = tool.metadata or {}
+    return {
+        "description": tool.description,
+        "args": tool.args,
+        "schema": tool.get_input_schema().model_json_schema(),
+        "cacheable": metadata.get("cacheable", False),
+        "side_effecting": metadata.get("side_effecting", False)
+    }
+
+
+class ToolCatalog:
+    """Serialised /tools listing and server information documents."""
+
+    def __init__(self, tools=None):
+        tools = ALL_TOOLS if tools is None else tools
+        self.tools = CatalogDocument({tool.name: describe_tool(tool) for tool in tools})
+        self.server_info = CatalogDocument({
+            "name": Config.MCP_SERVER_NAME,
+            "version": Config.MCP_SERVER_VERSION,
+            "status": "active",
+            "tools": len(tools)
+        })
+
+
+_catalog: Optional[ToolCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_tool_catalog() -> ToolCatalog:
+    """Return the process-wide catalog, building it on first use (normally the warm-up)."""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = ToolCatalog()
+    return _catalog
@@ -3,19 +3,56 @@ MCP client implementation for consuming Synapse tools via FastAPI.
 """
 
 import asyncio
-from typing import Any, Dict, List
+import importlib.util
+import threading
+import weakref
+from typing import Any, Coroutine, Dict, List, Optional, Tuple
 import httpx
 from ..core.config import Config
+from ..tools.base import degraded_reason, is_degraded
 from ..utils.logger import log_info, log_error
 
 
+def _build_http_client() -> httpx.AsyncClient:
+    """Create an AsyncClient with pooled, keep-alive connections from Config."""
+    http2 = Config.MCP_CLIENT_HTTP2
+    if http2 and importlib.util.find_spec("h2") is None:
+        log_info("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+        http2 = False
+    
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=Config.MCP_CLIENT_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=Config.MCP_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=Config.MCP_CLIENT_MAX_KEEPALIVE,
+            keepalive_expiry=Config.MCP_CLIENT_KEEPALIVE_EXPIRY
+        )
+    )
+
+
 class SynapseMCPClient:
     """Client for interacting with the Synapse MCP server."""
     
     def __init__(self, server_url: str = None):
         """Initialize the MCP client."""
         self.server_url = server_url or f"http://localhost:{Config.MCP_SERVER_PORT}"
-        self.client = httpx.AsyncClient()
+        self.client = _build_http_client()
+        # path -> (ETag, parsed body) for documents the server revalidates
+        self._revalidated: Dict[str, Tuple[str, Any]] = {}
+    
+    async def _get_revalidated(self, path: str) -> Any:
+        """GET a document, reusing the cached copy when the server answers 304."""
+        cached = self._revalidated.get(path)
+        headers = {"If-None-Match": cached[0]} if cached else {}
+        response = await self.client.get(f"{self.server_url}{path}", headers=headers)
+        if cached and response.status_code == 304:
+            return cached[1]
+        response.raise_for_status()
+        data = response.json()
+        if "etag" in response.headers:
+            self._revalidated[path] = (response.headers["etag"], data)
+        return data
     
     async def call_tool(self, tool_name: str, **kwargs) -> Any:
         """
@@ -36,8 +73,11 @@ class SynapseMCPClient:
             response.raise_for_status()
             result = response.json()
             
-            if result.get("success", True):
+            # Older servers report degraded answers as successes
+            if result.get("success", True) and not is_degraded(result.get("result")):
                 return result.get("result")
+            elif result.get("success", True):
+                raise Exception(degraded_reason(result["result"]))
             else:
                 raise Exception(result.get("error", "Unknown error"))
                 
@@ -45,12 +85,47 @@ class SynapseMCPClient:
             log_error(f"Error calling tool {tool_name}: {e}")
             raise
     
+    async def call_many(self, calls: List[Tuple[str, Dict[str, Any]]],
+                        return_exceptions: bool = False) -> List[Any]:
+        """
+        Call several tools concurrently in a single round trip.
+        
+        Args:
+            calls: ``(tool_name, kwargs)`` pairs
+            return_exceptions: Return failed calls as exception objects in
+                place instead of raising the first failure
+            
+        Returns:
+            Tool responses in the same order as ``calls``
+        """
+        try:
+            response = await self.client.post(
+                f"{self.server_url}/tools/batch",
+                json={"calls": [{"tool": name, "args": args} for name, args in calls]}
+            )
+            response.raise_for_status()
+            results = response.json()["results"]
+        except Exception as e:
+            log_error(f"Error calling tool batch: {e}")
+            raise
+        
+        outputs = []
+        for (tool_name, _), result in zip(calls, results):
+            if result.get("success", True) and not is_degraded(result.get("result")):
+                outputs.append(result.get("result"))
+                continue
+            reason = degraded_reason(result["result"]) if result.get("success", True) else result.get("error")
+            error = Exception(f"{tool_name}: {reason or 'Unknown error'}")
+            if not return_exceptions:
+                log_error(f"Error calling tool {tool_name}: {error}")
+                raise error
+            outputs.append(error)
+        return outputs
+    
     async def get_available_tools(self) -> Dict[str, Any]:
         """Get list of available tools from the server."""
         try:
-            response = await self.client.get(f"{self.server_url}/tools")
-            response.raise_for_status()
-            return response.json()
+            return await self._get_revalidated("/tools")
         except Exception as e:
             log_error(f"Error getting available tools: {e}")
             raise
@@ -68,9 +143,7 @@ class SynapseMCPClient:
     async def get_server_info(self) -> Dict[str, Any]:
         """Get server information."""
         try:
-            response = await self.client.get(f"{self.server_url}/")
-            response.raise_for_status()
-            return response.json()
+            return await self._get_revalidated("/")
         except Exception as e:
             log_error(f"Error getting server info: {e}")
             raise
@@ -88,36 +161,97 @@ class SynapseMCPClient:
         await self.close()
 
 
+# One long-lived client per event loop; connections cannot be shared across loops
+_shared_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, SynapseMCPClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_shared_client() -> SynapseMCPClient:
+    """
+    Return the long-lived client for the running event loop.
+    
+    The client keeps its connection pool open between calls, so repeated
+    tool calls reuse warm TCP connections instead of opening new ones.
+    """
+    loop = asyncio.get_running_loop()
+    client = _shared_clients.get(loop)
+    if client is None:
+        client = SynapseMCPClient()
+        _shared_clients[loop] = client
+    return client
+
+
+async def close_shared_client():
+    """Close the shared client of the running event loop, if any."""
+    client = _shared_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
+
+class _BackgroundLoop:
+    """An event loop running forever on a daemon thread for synchronous callers."""
+    
+    def __init__(self):
+        """Start the loop thread."""
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name="synapse-mcp-client", daemon=True
+        )
+        self._thread.start()
+    
+    def run(self, coro: Coroutine, timeout: float = None) -> Any:
+        """Run a coroutine on the background loop and wait for its result."""
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        return future.result(timeout)
+
+
+_background_loop: Optional[_BackgroundLoop] = None
+_background_lock = threading.Lock()
+
+
+def run_sync(coro: Coroutine, timeout: float = None) -> Any:
+    """
+    Run a client coroutine from synchronous code.
+    
+    All synchronous calls share one background event loop (and therefore one
+    pooled client), instead of paying for a new loop and connection per call.
+    """
+    global _background_loop
+    if _background_loop is None:
+        with _background_lock:
+            if _background_loop is None:
+                _background_loop = _BackgroundLoop()
+    return _background_loop.run(coro, timeout)
+
+
 # Convenience functions for common tool calls
 async def quick_merchant_status(merchant_name: str) -> str:
     """Quick function to check merchant status."""
-    async with SynapseMCPClient() as client:
-        return await client.call_tool("get_merchant_status", merchant_name=merchant_name)
+    return await get_shared_client().call_tool("get_merchant_status", merchant_name=merchant_name)
 
 
 async def quick_traffic_check(route: str) -> str:
     """Quick function to check traffic."""
-    async with SynapseMCPClient() as client:
-        return await client.call_tool("check_traffic", route=route)
+    return await get_shared_client().call_tool("check_traffic", route=route)
 
 
 async def quick_customer_notify(customer_id: str, message: str) -> str:
     """Quick function to notify customer."""
-    async with SynapseMCPClient() as client:
-        return await client.call_tool("notify_customer", customer_id=customer_id, message=message)
+    return await get_shared_client().call_tool("notify_customer", customer_id=customer_id, message=message)
 
 
 # Synchronous wrapper functions
 def sync_merchant_status(merchant_name: str) -> str:
     """Synchronous wrapper for merchant status check."""
-    return asyncio.run(quick_merchant_status(merchant_name))
+    return run_sync(quick_merchant_status(merchant_name))
 
 
 def sync_traffic_check(route: str) -> str:
     """Synchronous wrapper for traffic check."""
-    return asyncio.run(quick_traffic_check(route))
+    return run_sync(quick_traffic_check(route))
 
 
 def sync_customer_notify(customer_id: str, message: str) -> str:
     """Synchronous wrapper for customer notification."""
-    return asyncio.run(quick_customer_notify(customer_id, message))
+    return run_sync(quick_customer_notify(customer_id, message))
@@ -2,26 +2,107 @@
 FastAPI-based MCP server implementation for Project Synapse tools.
 """
 
-from typing import Any, Dict
-import uvicorn
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+import asyncio
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+from fastapi import FastAPI, HTTPException, Request, WebSocket
+from fastapi.responses import ORJSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, field_validator
 
-from ..tools.registry import ALL_TOOLS
+from .catalog import get_tool_catalog
+from ..tools.backends import simulation_seed
+from ..tools.base import degraded_reason, is_degraded
+from ..tools.registry import (
+    ALL_TOOLS, TOOLS_BY_NAME, get_circuit_breaker_states, get_tool_cache_stats, reset_circuit_breakers
+)
 from ..core.config import Config
-from ..utils.logger import log_info, log_error
+from ..core.concurrency import QueueFullError, get_scenario_limiter
+from ..utils.logger import configure_logging, log_info, log_error
+from ..utils.metrics import SCENARIOS_QUEUED, TOOL_HTTP_REQUESTS, export_metrics, render_metrics
+
+
+# Warm-up state reported by /ready
+_readiness: Dict[str, Any] = {"ready": False, "draining": False, "warmup_ms": {}, "error": None}
+
+
+async def _warm_up():
+    """
+    Build everything the first scenario request would otherwise pay for.
+
+    Heavy modules (LangChain agents, the Gemini client, SQLAlchemy for the
+    LLM cache) are imported here rather than when the server module loads.
+    """
+    timings = _readiness["warmup_ms"]
+    
+    start = time.perf_counter()
+    from ..core.llm_cache import get_llm_cache
+    from ..core.pool import init_agent_pool
+    from ..tools.base import get_tool_executor
+    timings["imports"] = round((time.perf_counter() - start) * 1000, 1)
+    
+    start = time.perf_counter()
+    get_tool_executor()
+    get_tool_catalog()
+    get_llm_cache()
+    timings["tools_and_cache"] = round((time.perf_counter() - start) * 1000, 1)
+    
+    start = time.perf_counter()
+    pool = await asyncio.to_thread(init_agent_pool)
+    timings["agent_pool"] = round((time.perf_counter() - start) * 1000, 1)
+    
+    start = time.perf_counter()
+    for agent in pool.agents:
+        await agent.warm_up()
+    timings["agents"] = round((time.perf_counter() - start) * 1000, 1)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up the agent pool and clients before the server starts taking requests."""
+    configure_logging(mode="json")
+    start = time.perf_counter()
+    try:
+        await _warm_up()
+        _readiness["ready"] = True
+    except Exception as e:
+        # Tool endpoints still work without an agent; /agent/execute retries lazily
+        _readiness["error"] = str(e)
+        log_error(f"Agent pool warm-up failed: {e}")
+    _readiness["warmup_ms"]["total"] = round((time.perf_counter() - start) * 1000, 1)
+    log_info(f"Warm-up finished in {_readiness['warmup_ms']['total']} ms")
+    
+    from ..core.jobs import init_job_queue
+    
+    jobs = init_job_queue(runner=_run_scenario)
+    await jobs.start()
+    publisher = asyncio.create_task(_publish_metrics_loop()) if Config.SHARED_STATE_ENABLED else None
+    try:
+        yield
+    finally:
+        # Uvicorn has stopped accepting requests and drained open ones by now
+        _readiness["ready"] = False
+        _readiness["draining"] = True
+        if publisher:
+            publisher.cancel()
+        await jobs.stop(timeout=Config.SERVER_DRAIN_SECONDS)
 
 # Create FastAPI app
 app = FastAPI(
     title="Project Synapse MCP Server",
     description="Model Context Protocol server for delivery coordination tools",
-    version=Config.MCP_SERVER_VERSION
+    version=Config.MCP_SERVER_VERSION,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Request models
 class ToolRequest(BaseModel):
     """Request model for tool execution."""
     args: Dict[str, Any] = {}
+    seed: Optional[int] = None
 
 class ToolResponse(BaseModel):
     """Response model for tool execution."""
@@ -29,18 +110,38 @@ class ToolResponse(BaseModel):
     success: bool
     error: str = None
 
+class ToolCall(BaseModel):
+    """A single call inside a tool batch request."""
+    tool: str
+    args: Dict[str, Any] = {}
+
+class ToolBatchRequest(BaseModel):
+    """Request model for batched tool execution."""
+    calls: List[ToolCall]
+    seed: Optional[int] = None
+
+class ScenarioRequest(BaseModel):
+    """A single scenario inside a batch request."""
+    scenario: str
+    context: Dict[str, Any] = {}
+
+    @field_validator("context", mode="before")
+    @classmethod
+    def _null_context(cls, value):
+        # ``"context": null`` means no context, as when it is left out
+        return {} if value is None else value
+
+class BatchScenarioRequest(BaseModel):
+    """Request model for batch scenario execution."""
+    scenarios: List[ScenarioRequest]
+
 # Tool registry for quick lookup
-TOOL_REGISTRY = {tool.name: tool for tool in ALL_TOOLS}
+TOOL_REGISTRY = TOOLS_BY_NAME
 
 @app.get("/")
-async def root():
-    """Root endpoint with server information."""
-    return {
-        "name": Config.MCP_SERVER_NAME,
-        "version": Config.MCP_SERVER_VERSION,
-        "status": "active",
-        "tools": len(ALL_TOOLS)
-    }
+async def root(request: Request):
+    """Root endpoint with server information (ETag-revalidated)."""
+    return get_tool_catalog().server_info.response(request)
 
 @app.get("/health")
 async def health_check():
@@ -52,16 +153,80 @@ async def health_check():
         "tools_available": len(ALL_TOOLS)
     }
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: 200 once the lifespan warm-up has built the agent pool."""
+    if not _readiness["ready"]:
+        status = "draining" if _readiness["draining"] else "failed" if _readiness["error"] else "starting"
+        return ORJSONResponse(status_code=503, content={"status": status, **_readiness})
+    return {"status": "ready", **_readiness}
+
 @app.get("/tools")
-async def list_tools():
-    """List all available tools."""
-    tools_info = {}
-    for tool in ALL_TOOLS:
-        tools_info[tool.name] = {
-            "description": tool.description,
-            "args": getattr(tool, 'args', {})
-        }
-    return tools_info
+async def list_tools(request: Request):
+    """
+    List all available tools with their argument JSON schemas.
+    
+    The catalog is serialised once; send the returned ETag back in
+    If-None-Match to get a 304 while it is unchanged.
+    """
+    return get_tool_catalog().tools.response(request)
+
+def _count_tool_request(tool_name: str, status: str):
+    """Count a /tools call; unknown names share one label to bound cardinality."""
+    TOOL_HTTP_REQUESTS.inc(tool=tool_name if tool_name in TOOL_REGISTRY else "unknown", status=status)
+
+def _tool_response(tool_name: str, result: Any) -> ToolResponse:
+    """
+    Shape a tool result for HTTP callers.
+    
+    A degraded answer (timeout, backend error, open circuit) is a failure
+    here; only the agent gets it as a tool message to reason about.
+    """
+    if is_degraded(result):
+        _count_tool_request(tool_name, "error")
+        return ToolResponse(result=None, success=False, error=degraded_reason(result))
+    _count_tool_request(tool_name, "success")
+    return ToolResponse(result=result, success=True)
+
+async def _invoke_tool(tool_name: str, args: Dict[str, Any]) -> Any:
+    """Run a tool for a legacy per-tool endpoint; a degraded answer becomes a 503."""
+    result = await TOOL_REGISTRY[tool_name].ainvoke(args)
+    if is_degraded(result):
+        raise HTTPException(status_code=503, detail=degraded_reason(result))
+    return result
+
+async def _execute_tool_call(call: ToolCall) -> ToolResponse:
+    """Run one call of a tool batch without blocking the event loop."""
+    try:
+        if call.tool not in TOOL_REGISTRY:
+            raise ValueError(f"Tool '{call.tool}' not found")
+        
+        result = await TOOL_REGISTRY[call.tool].ainvoke(call.args)
+        return _tool_response(call.tool, result)
+    
+    except Exception as e:
+        log_error(f"Error executing tool {call.tool}: {e}")
+        _count_tool_request(call.tool, "error")
+        return ToolResponse(result=None, success=False, error=str(e))
+
+# Registered before /tools/{tool_name} so "batch" is not taken as a tool name
+@app.post("/tools/batch")
+async def call_tools_batch(request: ToolBatchRequest):
+    """
+    Execute several independent tool calls concurrently.
+    
+    Results are returned in request order; a failing call reports its error
+    in place without affecting the others.
+    """
+    if len(request.calls) > Config.TOOL_MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds the limit of {Config.TOOL_MAX_BATCH_SIZE} tool calls"
+        )
+    
+    with simulation_seed(request.seed) as seed:
+        results = await asyncio.gather(*[_execute_tool_call(call) for call in request.calls])
+    return {"results": results, "seed": seed}
 
 @app.post("/tools/{tool_name}")
 async def call_tool(tool_name: str, request: ToolRequest) -> ToolResponse:
@@ -70,13 +235,15 @@ async def call_tool(tool_name: str, request: ToolRequest) -> ToolResponse:
         if tool_name not in TOOL_REGISTRY:
             raise HTTPException(status_code=404, detail=f"Tool '{tool_name}' not found")
         
+        # Async path: native coroutines run on the loop, sync tools on the tool pool
         tool = TOOL_REGISTRY[tool_name]
-        result = tool.invoke(request.args)
-        
-        return ToolResponse(result=result, success=True)
+        with simulation_seed(request.seed):
+            result = await tool.ainvoke(request.args)
+        return _tool_response(tool_name, result)
     
     except Exception as e:
         log_error(f"Error executing tool {tool_name}: {e}")
+        _count_tool_request(tool_name, "error")
         return ToolResponse(result=None, success=False, error=str(e))
 
 @app.get("/resources/agent-status")
@@ -86,80 +253,419 @@ async def get_agent_status():
         "status": "active",
         "version": Config.MCP_SERVER_VERSION,
         "name": "Synapse Agent",
-        "tools_loaded": len(ALL_TOOLS)
+        "tools_loaded": len(ALL_TOOLS),
+        "load": get_scenario_limiter().snapshot()
     }
 
+def _publish_metrics():
+    """Store this worker's metric values in the shared store for the other workers' /metrics."""
+    from ..core.shared_store import get_shared_store
+    
+    SCENARIOS_QUEUED.set(get_scenario_limiter().snapshot()["queued"])
+    get_shared_store().set(
+        "metrics", str(os.getpid()), json.dumps(export_metrics()), Config.METRICS_PUBLISH_SECONDS * 3
+    )
+
+async def _publish_metrics_loop():
+    while True:
+        try:
+            await asyncio.to_thread(_publish_metrics)
+        except Exception as e:
+            log_error(f"Publishing metrics failed: {str(e)}")
+        await asyncio.sleep(Config.METRICS_PUBLISH_SECONDS)
+
+def _collect_worker_metrics() -> Dict[str, Dict[str, list]]:
+    from ..core.shared_store import get_shared_store
+    
+    _publish_metrics()
+    return {worker: json.loads(raw) for worker, raw in get_shared_store().items("metrics").items()}
+
+@app.get("/metrics")
+async def metrics():
+    """
+    Expose tool, LLM and scenario metrics in the Prometheus text format.
+    
+    With shared state (several workers), every live worker's metrics are
+    rendered, each sample labelled with its ``worker``; the other workers'
+    values are up to METRICS_PUBLISH_SECONDS old.
+    """
+    if Config.SHARED_STATE_ENABLED:
+        body = render_metrics(await asyncio.to_thread(_collect_worker_metrics))
+    else:
+        SCENARIOS_QUEUED.set(get_scenario_limiter().snapshot()["queued"])
+        body = render_metrics()
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/resources/tool-cache")
+async def get_tool_cache():
+    """Get hit/miss statistics for the read-only tool result cache."""
+    return get_tool_cache_stats()
+
+@app.get("/resources/circuit-breakers")
+async def get_circuit_breakers():
+    """Get the circuit breaker state (closed/open/half_open) of every tool backend."""
+    return get_circuit_breaker_states()
+
+@app.post("/resources/circuit-breakers/reset")
+async def reset_circuit_breaker_states():
+    """Close every tool circuit, e.g. once a backend incident is resolved."""
+    reset_circuit_breakers()
+    return get_circuit_breaker_states()
+
+@app.get("/resources/llm-cache")
+async def get_llm_cache_stats():
+    """Get size, hit rate and the most reused entries of the LLM response cache."""
+    from ..core.llm_cache import get_llm_cache
+    
+    cache = get_llm_cache()
+    return cache.stats() if cache else {"enabled": False}
+
+@app.get("/resources/session-memory")
+async def get_session_memory_stats():
+    """Get the number of remembered sessions and turns, and the memory limits."""
+    from ..core.memory import get_session_memory
+    
+    return get_session_memory().stats()
+
+@app.delete("/resources/session-memory/{session_key}")
+async def forget_session(session_key: str):
+    """Forget a session's earlier turns (key as returned in ``session``, e.g. ``order:ORD-1``)."""
+    from ..core.memory import get_session_memory
+    
+    if not get_session_memory().forget(session_key):
+        raise HTTPException(status_code=404, detail=f"Session '{session_key}' not found")
+    return {"forgotten": session_key}
+
 @app.get("/resources/available-tools")
-async def get_available_tools():
-    """Get a list of all available tools."""
-    tools_info = {}
-    for tool in ALL_TOOLS:
-        tools_info[tool.name] = {
-            "description": tool.description,
-            "args": getattr(tool, 'args', {})
-        }
-    return tools_info
+async def get_available_tools(request: Request):
+    """Get a list of all available tools (same document and ETag as /tools)."""
+    return get_tool_catalog().tools.response(request)
 
 # Individual tool endpoints
 @app.post("/tools/get_merchant_status")
 async def get_merchant_status(merchant_name: str):
     """Check merchant status."""
-    from ..tools.logistics import get_merchant_status as gms
-    return gms.invoke({"merchant_name": merchant_name})
+    return await _invoke_tool("get_merchant_status", {"merchant_name": merchant_name})
 
 @app.post("/tools/check_traffic")
 async def check_traffic(route: str):
     """Check traffic conditions."""
-    from ..tools.logistics import check_traffic as ct
-    return ct.invoke({"route": route})
+    return await _invoke_tool("check_traffic", {"route": route})
 
 @app.post("/tools/notify_customer")
 async def notify_customer(customer_id: str, message: str):
     """Send customer notification."""
-    from ..tools.customer import notify_customer as nc
-    return nc.invoke({"customer_id": customer_id, "message": message})
+    return await _invoke_tool("notify_customer", {"customer_id": customer_id, "message": message})
+
+async def _rate_limit_retry_after(client: str, cost: int = 1) -> Optional[int]:
+    """
+    Count ``cost`` scenarios for a client; return seconds to wait if over the limit.
+    
+    Counters live in the shared store, so the limit holds across all
+    server worker processes rather than per worker.
+    """
+    limit = Config.AGENT_RATE_LIMIT_PER_MINUTE
+    if not limit:
+        return None
+    from ..core.shared_store import get_shared_store
+    
+    now = time.time()
+    window = int(now // 60)
+    used = await asyncio.to_thread(get_shared_store().incr, "rate:agent", f"{client}:{window}", cost, 60)
+    if used > limit:
+        return max(1, int((window + 1) * 60 - now))
+    return None
+
+async def _check_rate_limit(request: Request, cost: int = 1):
+    """Reject with 429 once a client has started AGENT_RATE_LIMIT_PER_MINUTE scenarios this minute."""
+    client = request.client.host if request.client else "unknown"
+    retry_after = await _rate_limit_retry_after(client, cost)
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Rate limit of {Config.AGENT_RATE_LIMIT_PER_MINUTE} scenarios per minute exceeded",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+async def _run_scenario(scenario: str, context: Dict[str, Any],
+                        callbacks: list = None, agent=None) -> Dict[str, Any]:
+    """Run one scenario on a pooled (or the given) agent and shape the API response."""
+    from ..core.pool import get_agent_pool
+    
+    # Reuse a warm agent from the shared pool
+    agent = agent or get_agent_pool().acquire()
+    
+    # Execute the scenario once a concurrency slot is free
+    async with get_scenario_limiter().slot():
+        result = await agent.process_scenario(scenario, context, callbacks=callbacks)
+    
+    return {
+        "scenario": scenario,
+        "agent_reasoning": result.get("reasoning", ""),
+        "planned_actions": result.get("actions", []),
+        "execution_results": result.get("execution_results", []),
+        "timestamp": context.get("timestamp"),
+        "success": result.get("success", False),
+        "path": result.get("path", "agent"),
+        "route": result.get("route"),
+        "category": result.get("category"),
+        "seed": result.get("seed"),
+        "session": result.get("session")
+    }
+
+def _scenario_context(body: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a request body's scenario context; missing or null means none."""
+    context = body.get("context") or {}
+    if not isinstance(context, dict):
+        raise HTTPException(status_code=422, detail="context must be a JSON object")
+    return context
 
 @app.post("/agent/execute")
-async def execute_agent_scenario(request: dict):
+async def execute_agent_scenario(request: dict, http_request: Request):
     """Execute an agent scenario and return the reasoning and tool executions."""
     try:
         scenario = request.get("scenario")
-        context = request.get("context", {})
+        context = _scenario_context(request)
         
         if not scenario:
             raise HTTPException(status_code=400, detail="Scenario is required")
+        await _check_rate_limit(http_request)
         
-        # Import the agent
-        from ..core.agent import SynapseAgent
-        
-        # Create agent instance
-        agent = SynapseAgent()
-        
-        # Execute the scenario
-        result = await agent.process_scenario(scenario, context)
-        
-        return {
-            "scenario": scenario,
-            "agent_reasoning": result.get("reasoning", ""),
-            "planned_actions": result.get("actions", []),
-            "execution_results": result.get("execution_results", []),
-            "timestamp": context.get("timestamp"),
-            "success": result.get("success", False)
-        }
+        return await _run_scenario(scenario, context)
         
+    except HTTPException:
+        raise
+    except QueueFullError as e:
+        log_error(f"Agent execution rejected: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         log_error(f"Agent execution error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Agent execution failed: {str(e)}")
 
+def _job_queue():
+    """Return the running job queue or fail with 503 before startup."""
+    from ..core.jobs import get_job_queue
+    
+    queue = get_job_queue()
+    if queue is None:
+        raise HTTPException(status_code=503, detail="Job queue is not running")
+    return queue
+
+@app.post("/jobs", status_code=202)
+async def submit_job(request: ScenarioRequest, http_request: Request):
+    """
+    Queue a scenario and return its job ID without waiting for the run.
+    
+    An identical scenario (same text and context) that is already queued or
+    running is not run twice: its existing job is returned with
+    ``deduplicated: true``.
+    """
+    if not request.scenario:
+        raise HTTPException(status_code=400, detail="Scenario is required")
+    await _check_rate_limit(http_request)
+    
+    job, deduplicated = await _job_queue().submit(request.scenario, request.context)
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "deduplicated": deduplicated,
+        "status_url": f"/jobs/{job['job_id']}"
+    }
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str, wait: float = 0):
+    """
+    Get a job's status, and its result once finished.
+    
+    With ``wait`` the request long-polls: it returns as soon as the job
+    finishes or after ``wait`` seconds (capped at JOB_MAX_WAIT_SECONDS).
+    """
+    job = await _job_queue().get(job_id, wait=wait)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return job
+
+@app.get("/resources/jobs")
+async def get_job_stats():
+    """Get job counts by status and the number of queue workers."""
+    queue = _job_queue()
+    return await asyncio.to_thread(queue.stats)
+
+@app.post("/agent/execute/batch")
+async def execute_agent_batch(request: BatchScenarioRequest, http_request: Request):
+    """
+    Execute many scenarios concurrently and stream each result as NDJSON.
+    
+    Lines are written in completion order and carry the ``index`` of the
+    scenario in the request. A failing scenario produces an error line
+    without affecting the rest of the batch.
+    """
+    if len(request.scenarios) > Config.AGENT_MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds the limit of {Config.AGENT_MAX_BATCH_SIZE} scenarios"
+        )
+    await _check_rate_limit(http_request, cost=len(request.scenarios))
+    
+    # Feed the shared limiter gradually so one large batch cannot fill its queue
+    fan_out = asyncio.Semaphore(Config.AGENT_MAX_CONCURRENCY)
+    
+    async def run_item(index: int, item: ScenarioRequest) -> Dict[str, Any]:
+        async with fan_out:
+            try:
+                if not item.scenario:
+                    raise ValueError("Scenario is required")
+                return {"index": index, **await _run_scenario(item.scenario, item.context)}
+            except Exception as e:
+                log_error(f"Batch scenario {index} failed: {str(e)}")
+                return {
+                    "index": index,
+                    "scenario": item.scenario,
+                    "timestamp": item.context.get("timestamp"),
+                    "success": False,
+                    "error": str(e)
+                }
+    
+    async def stream_results():
+        tasks = [
+            asyncio.create_task(run_item(index, item))
+            for index, item in enumerate(request.scenarios)
+        ]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield json.dumps(await next_result, default=str) + "\n"
+        finally:
+            # Stop outstanding scenarios if the client goes away mid-stream
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+def _sse_event(event: str, data: Any) -> str:
+    """Format one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+@app.post("/agent/execute/stream")
+async def stream_agent_scenario(request: Request):
+    """
+    Execute an agent scenario and stream its progress as Server-Sent Events.
+    
+    Emits ``start`` immediately, then ``token``, ``agent_action``,
+    ``tool_end`` and ``tool_error`` events while the agent works, and finally
+    a ``result`` event with the same payload as /agent/execute (or ``error``).
+    The run is cancelled if the client disconnects.
+    """
+    from ..core.agent import StreamingCallbackHandler
+    
+    body = await request.json()
+    scenario = body.get("scenario")
+    context = _scenario_context(body)
+    
+    if not scenario:
+        raise HTTPException(status_code=400, detail="Scenario is required")
+    await _check_rate_limit(request)
+    
+    handler = StreamingCallbackHandler()
+    events = handler.queue
+    
+    async def run():
+        try:
+            result = await _run_scenario(scenario, context, callbacks=[handler])
+            await events.put(("result", result))
+        except Exception as e:
+            log_error(f"Agent execution error: {str(e)}")
+            await events.put(("error", {"detail": str(e)}))
+        finally:
+            await events.put(None)
+    
+    async def event_stream():
+        task = asyncio.create_task(run())
+        try:
+            yield _sse_event("start", {"scenario": scenario, "timestamp": context.get("timestamp")})
+            while True:
+                try:
+                    item = await asyncio.wait_for(events.get(), timeout=Config.STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                if item is None:
+                    break
+                yield _sse_event(*item)
+        finally:
+            # Client went away or the run finished; never leave the agent running
+            task.cancel()
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.websocket("/ws/session")
+async def operator_session(websocket: WebSocket):
+    """
+    Persistent operator session multiplexing scenarios over one WebSocket.
+    
+    Send ``{"type": "scenario", "request_id": "r1", "scenario": "...",
+    "context": {...}}`` (optionally ``"stream_tokens": false``), ``{"type":
+    "cancel", "request_id": "r1"}`` or ``{"type": "ping"}``. Every reply is
+    ``{"request_id", "event", "data"}`` with the same events as
+    /agent/execute/stream, plus ``cancelled`` and ``pong``.
+    """
+    from .ws_session import OperatorSession
+    from ..core.pool import get_agent_pool
+    
+    session = OperatorSession(
+        websocket, _run_scenario, agent=get_agent_pool().acquire(), admit=_rate_limit_retry_after
+    )
+    await session.serve()
+
+@app.get("/resources/sessions")
+async def get_sessions():
+    """Get open operator sessions, their running scenarios and queued events."""
+    from .ws_session import get_session_stats
+    
+    return get_session_stats()
+
 def run_mcp_server():
-    """Run the MCP server."""
+    """
+    Run the MCP server.
+    
+    SERVER_MODE=development runs one auto-reloading process. In production
+    mode, SERVER_WORKERS processes share the port, plus the job store and
+    the shared state store; any of them recovers jobs whose lease has
+    expired. On SIGTERM each worker stops accepting connections. It then waits
+    up to SERVER_DRAIN_SECONDS for in-flight requests and running jobs
+    before cancelling them.
+    """
+    import uvicorn
+    
+    configure_logging(mode="json")
     log_info(f"Starting MCP server: {Config.MCP_SERVER_NAME}")
     log_info(f"Server will be available at: http://localhost:{Config.MCP_SERVER_PORT}")
+    
+    if Config.SERVER_MODE != "production":
+        uvicorn.run(
+            "src.mcp.server:app", 
+            host="0.0.0.0", 
+            port=Config.MCP_SERVER_PORT,
+            reload=True
+        )
+        return
+    
+    from ..core.shared_store import SharedStore
+    
+    if Config.SHARED_STATE_ENABLED:
+        SharedStore().purge_expired()
+    log_info(f"Production mode: {Config.SERVER_WORKERS} worker(s)")
     uvicorn.run(
-        "src.mcp.server:app", 
-        host="0.0.0.0", 
+        "src.mcp.server:app",
+        host="0.0.0.0",
         port=Config.MCP_SERVER_PORT,
-        reload=True
+        workers=Config.SERVER_WORKERS,
+        timeout_graceful_shutdown=Config.SERVER_DRAIN_SECONDS
     )
 
 
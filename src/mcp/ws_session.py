@@ -0,0 +1,199 @@
+"""
+Persistent operator sessions over a WebSocket (/ws/session).
+
+An operator console sends scenario after scenario. Over HTTP each one is a
+new request and connection, and nothing can be pushed back to the console
+between them. A session keeps one connection open and multiplexes
+scenarios on it, each tagged with a client-chosen ``request_id``. Tool
+events and final results stream back as they happen. One warm agent from
+the pool serves every scenario of the session.
+
+All outbound events go through a bounded queue drained by a single sender.
+When the client reads slowly, the queue fills and the session's runs wait
+on it instead of buffering without limit in server memory.
+"""
+
+import asyncio
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import orjson
+from fastapi import WebSocket, WebSocketDisconnect
+
+from ..core.agent import StreamingCallbackHandler
+from ..core.concurrency import QueueFullError
+from ..core.config import Config
+from ..utils.logger import log_error, log_info
+from ..utils.metrics import WS_BACKPRESSURE, WS_SCENARIOS, WS_SESSIONS_ACTIVE
+
+_sessions = set()
+
+
+class _TaggedEvents:
+    """Queue-like adapter that tags a run's agent events with its request ID."""
+
+    def __init__(self, session: "OperatorSession", request_id: str):
+        self.session = session
+        self.request_id = request_id
+
+    async def put(self, item):
+        event, data = item
+        await self.session.emit(event, data, request_id=self.request_id)
+
+
+class OperatorSession:
+    """One /ws/session connection: its agent, running scenarios and outbound queue."""
+
+    def __init__(self, websocket: WebSocket, runner: Callable[..., Awaitable[Dict[str, Any]]],
+                 agent=None, admit: Callable[[str], Awaitable[Optional[int]]] = None):
+        """
+        Args:
+            websocket: The connection, accepted by serve()
+            runner: ``runner(scenario, context, callbacks=..., agent=...)``
+                returning the /agent/execute response payload
+            agent: Warm agent reused for every scenario in the session
+            admit: Optional rate-limit check; returns seconds to wait when
+                the client is over its limit, else None
+        """
+        self.websocket = websocket
+        self.runner = runner
+        self.agent = agent
+        self.admit = admit
+        self.session_id = uuid.uuid4().hex[:12]
+        self.client = websocket.client.host if websocket.client else "unknown"
+        self.runs: Dict[str, asyncio.Task] = {}
+        self.outbound: asyncio.Queue = asyncio.Queue(maxsize=Config.WS_SEND_QUEUE_SIZE)
+        self.started = 0
+
+    async def emit(self, event: str, data: Any = None, request_id: str = None):
+        """Queue an event for the client, waiting while the outbound queue is full."""
+        if self.outbound.full():
+            WS_BACKPRESSURE.inc()
+        await self.outbound.put({"request_id": request_id, "event": event, "data": data})
+
+    async def _send_loop(self):
+        while True:
+            message = await self.outbound.get()
+            await self.websocket.send_text(orjson.dumps(message, default=str).decode())
+
+    async def serve(self):
+        """Accept the connection and handle client messages until it closes."""
+        await self.websocket.accept()
+        sender = asyncio.create_task(self._send_loop())
+        _sessions.add(self)
+        WS_SESSIONS_ACTIVE.inc()
+        log_info(f"Operator session {self.session_id} opened by {self.client}")
+        try:
+            await self.emit("session", {
+                "session_id": self.session_id,
+                "max_inflight": Config.WS_MAX_INFLIGHT_PER_SESSION
+            })
+            while True:
+                message = await self.websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                try:
+                    await self._handle(message.get("text") or message.get("bytes") or b"")
+                except Exception as e:
+                    # One bad message must not close the session and cancel its other runs
+                    log_error(f"Session {self.session_id} could not handle a message: {str(e)}")
+                    await self.emit("error", {"detail": f"Invalid message: {e}"})
+        except WebSocketDisconnect:
+            pass
+        finally:
+            # The client is gone; never leave its scenarios running
+            for task in self.runs.values():
+                task.cancel()
+            await asyncio.gather(*self.runs.values(), return_exceptions=True)
+            sender.cancel()
+            _sessions.discard(self)
+            WS_SESSIONS_ACTIVE.dec()
+            log_info(f"Operator session {self.session_id} closed after {self.started} scenario(s)")
+
+    async def _handle(self, frame):
+        """Dispatch one client message (a JSON text or binary frame)."""
+        try:
+            message = orjson.loads(frame)
+            if not isinstance(message, dict):
+                raise ValueError("message must be a JSON object")
+        except (orjson.JSONDecodeError, ValueError) as e:
+            await self.emit("error", {"detail": f"Invalid message: {e}"})
+            return
+
+        kind = message.get("type", "scenario")
+        request_id = message.get("request_id")
+        if request_id is not None and (isinstance(request_id, bool) or not isinstance(request_id, (str, int))):
+            await self.emit("error", {"detail": "request_id must be a string or an integer"}, request_id=request_id)
+            return
+        if kind == "ping":
+            await self.emit("pong", request_id=request_id)
+        elif kind == "cancel":
+            task = self.runs.get(request_id)
+            if task is None:
+                await self.emit("error", {"detail": "No such scenario running"}, request_id=request_id)
+            else:
+                task.cancel()
+                WS_SCENARIOS.inc(status="cancelled")
+                await self.emit("cancelled", request_id=request_id)
+        elif kind == "scenario":
+            await self._start(message, request_id or uuid.uuid4().hex[:12])
+        else:
+            await self.emit("error", {"detail": f"Unknown message type '{kind}'"}, request_id=request_id)
+
+    async def _start(self, message: Dict[str, Any], request_id: str):
+        """Validate a scenario message and start running it."""
+        scenario = message.get("scenario")
+        context = message.get("context") or {}
+        detail, retry_after = None, None
+        if not scenario or not isinstance(scenario, str):
+            detail = "Scenario is required"
+        elif not isinstance(context, dict):
+            detail = "context must be a JSON object"
+        elif request_id in self.runs:
+            detail = "A scenario with this request_id is already running"
+        elif len(self.runs) >= Config.WS_MAX_INFLIGHT_PER_SESSION:
+            detail = f"Session already runs {len(self.runs)} scenarios"
+        elif self.admit is not None:
+            retry_after = await self.admit(self.client)
+            if retry_after is not None:
+                detail = f"Rate limit of {Config.AGENT_RATE_LIMIT_PER_MINUTE} scenarios per minute exceeded"
+        if detail:
+            WS_SCENARIOS.inc(status="rejected")
+            await self.emit("error", {"detail": detail, "retry_after": retry_after}, request_id=request_id)
+            return
+
+        await self.emit("start", {"scenario": scenario, "timestamp": context.get("timestamp")},
+                        request_id=request_id)
+        handler = StreamingCallbackHandler(_TaggedEvents(self, request_id),
+                                           tokens=bool(message.get("stream_tokens", True)))
+        task = asyncio.create_task(self._run(request_id, scenario, context, handler))
+        # A done callback also covers runs cancelled before they started
+        task.add_done_callback(lambda _: self.runs.pop(request_id, None))
+        self.runs[request_id] = task
+        self.started += 1
+
+    async def _run(self, request_id: str, scenario: str, context: Dict[str, Any],
+                   handler: StreamingCallbackHandler):
+        """Run one scenario on the session's agent and stream its outcome."""
+        try:
+            result = await self.runner(scenario, context, callbacks=[handler], agent=self.agent)
+            WS_SCENARIOS.inc(status="success" if result.get("success") else "failed")
+            await self.emit("result", result, request_id=request_id)
+        except Exception as e:
+            WS_SCENARIOS.inc(status="error")
+            log_error(f"Session {self.session_id} scenario {request_id} failed: {str(e)}")
+            detail = {"detail": str(e)}
+            if isinstance(e, QueueFullError):
+                detail["retry_after"] = 1
+            await self.emit("error", detail, request_id=request_id)
+
+
+def get_session_stats() -> Dict[str, Any]:
+    """Open sessions, their running scenarios and queued outbound events."""
+    return {
+        "sessions": len(_sessions),
+        "scenarios_running": sum(len(session.runs) for session in _sessions),
+        "events_queued": sum(session.outbound.qsize() for session in _sessions),
+        "max_inflight_per_session": Config.WS_MAX_INFLIGHT_PER_SESSION,
+        "send_queue_size": Config.WS_SEND_QUEUE_SIZE
+    }
@@ -0,0 +1,220 @@
+"""
+Backends behind the tools: the systems they query for merchant status,
+traffic, recipient replies, dispute evidence and driver GPS data.
+
+Tools format answers; a backend decides the outcomes. The simulated backend
+draws outcomes from an RNG derived from the request seed, the call and its
+arguments, so a run can be replayed exactly by reusing its seed. It also
+injects per-tool latency and errors from config, so load tests behave like
+a real deployment without any network access. Real integrations subclass
+ToolBackend and are selected with register_backend and TOOL_BACKEND.
+"""
+
+import asyncio
+import hashlib
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from langchain_core.tools import StructuredTool
+
+from .base import offload, rewrap_tool
+from ..core.config import Config
+
+
+class BackendError(Exception):
+    """Raised when a backend call fails."""
+
+
+class ToolBackend(ABC):
+    """Interface between the tools and the delivery platform's systems."""
+
+    name = "base"
+
+    @abstractmethod
+    def merchant_status(self, merchant_name: str) -> str:
+        """Return "overloaded", "normal" or "closed"."""
+
+    @abstractmethod
+    def traffic_condition(self, route: str) -> str:
+        """Return "clear", "accident" or "congestion"."""
+
+    @abstractmethod
+    def recipient_reply(self, customer_id: str, message: str) -> str:
+        """Return "concierge", "running_late", "not_ordered" or "leave_safe"."""
+
+    @abstractmethod
+    def delivery_evidence(self, customer_id: str, driver_id: str) -> str:
+        """Return "seal_intact" or "bag_torn"."""
+
+    @abstractmethod
+    def driver_was_at_address(self, driver_id: str, customer_address: str) -> bool:
+        """Return whether the driver's GPS trace reached the address."""
+
+
+class _SimulationRun:
+    """Seed and per-call counters of one request."""
+
+    def __init__(self, seed: int):
+        self.seed = seed
+        self.calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def next_index(self, key: str) -> int:
+        with self._lock:
+            index = self.calls[key] = self.calls.get(key, -1) + 1
+        return index
+
+
+_current_run: ContextVar[Optional[_SimulationRun]] = ContextVar("simulation_run", default=None)
+
+
+@contextmanager
+def simulation_seed(seed: int = None):
+    """
+    Seed every simulated backend call made inside the block; yields the seed.
+
+    Without an explicit seed, SIMULATION_SEED is used, or a fresh random one
+    that callers should report so the run can be replayed. The seed follows
+    the request into tool threads and tasks through the context.
+    """
+    if seed is None:
+        seed = Config.SIMULATION_SEED if Config.SIMULATION_SEED is not None else random.randrange(2 ** 32)
+    token = _current_run.set(_SimulationRun(int(seed)))
+    try:
+        yield int(seed)
+    finally:
+        _current_run.reset(token)
+
+
+def current_seed() -> Optional[int]:
+    """Return the seed of the current request (else SIMULATION_SEED), or None when unseeded."""
+    run = _current_run.get()
+    return run.seed if run is not None else Config.SIMULATION_SEED
+
+
+def call_rng(purpose: str, args: Dict[str, Any]) -> random.Random:
+    """
+    Return the RNG for one simulated call.
+
+    It is derived from the request seed, the purpose (backend method or
+    injected fault), the arguments and how often that exact call has been
+    made in this request. Concurrent calls therefore stay reproducible,
+    whatever order they finish in. Outside a seeded request the RNG is
+    unseeded, unless SIMULATION_SEED is set.
+    """
+    run = _current_run.get()
+    if run is None:
+        if Config.SIMULATION_SEED is None:
+            return random.Random()
+        run = _SimulationRun(Config.SIMULATION_SEED)
+    key = f"{purpose}\x1f{sorted(args.items())!r}"
+    digest = hashlib.sha256(f"{run.seed}\x1f{key}\x1f{run.next_index(key)}".encode()).digest()
+    return random.Random(int.from_bytes(digest[:8], "big"))
+
+
+class SimulatedBackend(ToolBackend):
+    """Seeded random outcomes with the demo's original odds."""
+
+    name = "simulated"
+
+    def merchant_status(self, merchant_name: str) -> str:
+        rng = call_rng("merchant_status", {"merchant_name": merchant_name})
+        return rng.choice(["overloaded", "normal", "closed"])
+
+    def traffic_condition(self, route: str) -> str:
+        return call_rng("traffic_condition", {"route": route}).choice(["clear", "accident", "congestion"])
+
+    def recipient_reply(self, customer_id: str, message: str) -> str:
+        rng = call_rng("recipient_reply", {"customer_id": customer_id, "message": message})
+        return rng.choice(["concierge", "running_late", "not_ordered", "leave_safe"])
+
+    def delivery_evidence(self, customer_id: str, driver_id: str) -> str:
+        rng = call_rng("delivery_evidence", {"customer_id": customer_id, "driver_id": driver_id})
+        return rng.choice(["seal_intact", "bag_torn"])
+
+    def driver_was_at_address(self, driver_id: str, customer_address: str) -> bool:
+        rng = call_rng("driver_was_at_address", {"driver_id": driver_id, "customer_address": customer_address})
+        # 2 in 3 chance of being a real attempt
+        return rng.choice([True, True, False])
+
+
+# Backend implementations selectable with TOOL_BACKEND
+BACKENDS = {SimulatedBackend.name: SimulatedBackend}
+
+_backend: Optional[ToolBackend] = None
+
+
+def register_backend(name: str, backend_class: type):
+    """Make a ToolBackend subclass selectable as TOOL_BACKEND=<name>."""
+    BACKENDS[name] = backend_class
+
+
+def get_backend() -> ToolBackend:
+    """Return the process-wide backend selected by TOOL_BACKEND."""
+    global _backend
+    if _backend is None:
+        if Config.TOOL_BACKEND not in BACKENDS:
+            raise ValueError(
+                f"Unknown TOOL_BACKEND '{Config.TOOL_BACKEND}'. Available: {', '.join(sorted(BACKENDS))}"
+            )
+        _backend = BACKENDS[Config.TOOL_BACKEND]()
+    return _backend
+
+
+def set_backend(backend: ToolBackend):
+    """Replace the process-wide backend (e.g. with a fake in a load test)."""
+    global _backend
+    _backend = backend
+
+
+def simulated_fault(name: str, args: Dict[str, Any]):
+    """
+    Draw the latency and failure of one simulated tool call.
+
+    Latency is lognormal around the median from SIMULATION_LATENCY_MS (the
+    tool's entry, else "default"), with SIMULATION_LATENCY_SIGMA setting how
+    heavy the tail is. Errors occur at the SIMULATION_ERROR_RATES rate.
+
+    Returns:
+        ``(seconds, error)``; error is a BackendError to raise, or None
+    """
+    median_ms = Config.SIMULATION_LATENCY_MS.get(name, Config.SIMULATION_LATENCY_MS.get("default", 0))
+    error_rate = Config.SIMULATION_ERROR_RATES.get(name, Config.SIMULATION_ERROR_RATES.get("default", 0))
+    if not median_ms and not error_rate:
+        return 0.0, None
+    rng = call_rng(f"{name}:fault", args)
+    seconds = median_ms / 1000 * rng.lognormvariate(0, Config.SIMULATION_LATENCY_SIGMA) if median_ms else 0.0
+    error = BackendError(f"simulated {name} backend failure") if rng.random() < error_rate else None
+    return seconds, error
+
+
+def simulated_tool(tool: StructuredTool) -> StructuredTool:
+    """
+    Wrap a tool so each call pays the simulated backend latency and may fail.
+
+    The async path waits with asyncio.sleep, so slow simulated calls neither
+    block the event loop nor occupy a tool thread.
+    """
+    name = tool.name
+    call_backend = tool.coroutine or offload(tool.func)
+
+    def run(**kwargs):
+        seconds, error = simulated_fault(name, kwargs)
+        time.sleep(seconds)
+        if error:
+            raise error
+        return tool.func(**kwargs)
+
+    async def arun(**kwargs):
+        seconds, error = simulated_fault(name, kwargs)
+        await asyncio.sleep(seconds)
+        if error:
+            raise error
+        return await call_backend(**kwargs)
+
+    return rewrap_tool(tool, func=run if tool.func else None, coroutine=arun)
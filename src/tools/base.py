@@ -0,0 +1,102 @@
+"""
+Helpers for building tool wrappers.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from functools import partial
+from typing import Callable
+
+from langchain_core.tools import StructuredTool
+
+from ..core.config import Config
+
+# Prefix of the answer a tool returns instead of a result when its backend is unhealthy
+DEGRADED_PREFIX = "[degraded]"
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def is_degraded(result) -> bool:
+    """Return True if a tool result is a degraded stand-in answer."""
+    return isinstance(result, str) and result.startswith(DEGRADED_PREFIX)
+
+
+def degraded_reason(result: str) -> str:
+    """Return a degraded answer without its prefix, for reporting it as an error."""
+    return result[len(DEGRADED_PREFIX):].strip()
+
+
+def get_tool_executor() -> ThreadPoolExecutor:
+    """
+    Return the thread pool that async tool calls run their functions on.
+
+    With PARALLEL_TOOL_CALLS the pool has TOOL_EXECUTOR_WORKERS threads, so
+    independent tool calls of one agent step (which AgentExecutor gathers)
+    overlap. Otherwise it has a single thread and tool calls run one at a time.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = Config.TOOL_EXECUTOR_WORKERS if Config.PARALLEL_TOOL_CALLS else 1
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="synapse-tool")
+    return _executor
+
+
+def configure_tool_executor(parallel: bool = None, max_workers: int = None):
+    """
+    Replace the tool thread pool.
+
+    Args:
+        parallel: Run same-step tool calls concurrently (defaults to PARALLEL_TOOL_CALLS)
+        max_workers: Pool size in parallel mode (defaults to TOOL_EXECUTOR_WORKERS)
+    """
+    global _executor
+    parallel = Config.PARALLEL_TOOL_CALLS if parallel is None else parallel
+    workers = (max_workers or Config.TOOL_EXECUTOR_WORKERS) if parallel else 1
+    with _executor_lock:
+        previous, _executor = _executor, ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="synapse-tool"
+        )
+    if previous is not None:
+        previous.shutdown(wait=False)
+
+
+def offload(func: Callable) -> Callable:
+    """Return a coroutine function running sync ``func`` on the tool thread pool."""
+    async def arun(**kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_tool_executor(), partial(copy_context().run, func, **kwargs))
+    
+    return arun
+
+
+def rewrap_tool(tool: StructuredTool, func: Callable = None, coroutine: Callable = None,
+                **metadata) -> StructuredTool:
+    """
+    Return a copy of ``tool`` that runs ``func`` / ``coroutine`` instead of the originals.
+
+    Name, description and argument schema are kept, so the wrapper is a
+    drop-in replacement for both the agent and the server. Extra keyword
+    arguments are merged into the tool metadata.
+
+    Tools may be sync, async-native or both. A tool with only a sync
+    implementation gets a coroutine that offloads it to the tool thread
+    pool, so async callers never run blocking tool code on the event loop.
+    An async-only tool has no sync entry point.
+    """
+    if coroutine is None and func is not None:
+        coroutine = offload(func)
+    
+    return StructuredTool.from_function(
+        func=func,
+        coroutine=coroutine,
+        name=tool.name,
+        description=tool.description,
+        args_schema=tool.args_schema,
+        metadata={**(tool.metadata or {}), **metadata}
+    )
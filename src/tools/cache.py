@@ -0,0 +1,167 @@
+"""
+Result caching for read-only tools.
+"""
+
+import asyncio
+import json
+import threading
+from typing import Any, Dict, Tuple
+
+from cachetools import TTLCache
+from langchain_core.tools import StructuredTool
+
+from .backends import current_seed
+from .base import is_degraded, rewrap_tool
+from ..core.config import Config
+from ..utils.metrics import TOOL_CACHE_REQUESTS
+
+
+class ToolResultCache:
+    """
+    A bounded TTL/LRU cache for the results of a single tool.
+
+    With SHARED_STATE_ENABLED, entries live in the shared store instead, so
+    every server worker process reuses the same results (hit/miss counters
+    stay per process). There too at most ``maxsize`` are kept, oldest first out.
+
+    In front of the simulated backend, whose outcomes depend on the request
+    seed, the cache is ``seeded``: keys include the seed, so a result is only
+    reused by runs with the same seed and seeded replays stay exact.
+    """
+
+    def __init__(self, ttl: float, maxsize: int, name: str = "", shared: bool = None,
+                 seeded: bool = False):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds a cached result stays fresh
+            maxsize: Maximum number of distinct argument sets kept (LRU evicted)
+            name: Tool name used to label cache metrics
+            shared: Keep entries in the shared store (defaults to SHARED_STATE_ENABLED)
+            seeded: Key entries on the simulation seed as well
+        """
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.shared = Config.SHARED_STATE_ENABLED if shared is None else shared
+        self.seeded = seeded
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self._namespace = f"tool:{name}"
+
+    def make_key(self, args: Dict[str, Any]) -> Tuple:
+        """Build a hashable, order-independent key from tool arguments (and the seed if seeded)."""
+        key = tuple(sorted((name, repr(value)) for name, value in args.items()))
+        if self.seeded:
+            key += (("\x1fseed", current_seed()),)
+        return key
+
+    def get(self, key: Tuple) -> Tuple[bool, Any]:
+        """Return ``(found, value)`` for a key and update hit/miss counters."""
+        if self.shared:
+            from ..core.shared_store import get_shared_store
+
+            found, raw = get_shared_store().get(self._namespace, repr(key))
+            value = json.loads(raw) if found else None
+            with self._lock:
+                if found:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+        else:
+            with self._lock:
+                try:
+                    value = self._entries[key]
+                except KeyError:
+                    self.misses += 1
+                    found = False
+                else:
+                    self.hits += 1
+                    found = True
+        TOOL_CACHE_REQUESTS.inc(tool=self.name, result="hit" if found else "miss")
+        return (True, value) if found else (False, None)
+
+    def set(self, key: Tuple, value: Any):
+        """Store a result."""
+        if self.shared:
+            from ..core.shared_store import get_shared_store
+
+            get_shared_store().set(
+                self._namespace, repr(key), json.dumps(value, default=str), self.ttl, max_entries=self.maxsize
+            )
+            return
+        with self._lock:
+            self._entries[key] = value
+
+    async def aget(self, key: Tuple) -> Tuple[bool, Any]:
+        """Async ``get``; shared-store lookups run off the event loop."""
+        return await asyncio.to_thread(self.get, key) if self.shared else self.get(key)
+
+    async def aset(self, key: Tuple, value: Any):
+        """Async ``set``; shared-store writes run off the event loop."""
+        if self.shared:
+            await asyncio.to_thread(self.set, key, value)
+        else:
+            self.set(key, value)
+
+    def clear(self):
+        """Drop all cached results and reset the counters."""
+        if self.shared:
+            from ..core.shared_store import get_shared_store
+
+            get_shared_store().clear(self._namespace)
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current occupancy."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": None if self.shared else len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "shared": self.shared,
+                "seeded": self.seeded
+            }
+
+
+def cached_tool(tool: StructuredTool, cache: ToolResultCache) -> StructuredTool:
+    """
+    Wrap a tool so repeated calls with the same arguments are served from cache.
+    """
+    def run(**kwargs):
+        key = cache.make_key(kwargs)
+        found, value = cache.get(key)
+        if found:
+            return value
+        value = tool.func(**kwargs)
+        if not is_degraded(value):
+            cache.set(key, value)
+        return value
+
+    async def arun(**kwargs):
+        key = cache.make_key(kwargs)
+        found, value = await cache.aget(key)
+        if found:
+            return value
+        value = await tool.coroutine(**kwargs)
+        if not is_degraded(value):
+            await cache.aset(key, value)
+        return value
+
+    return rewrap_tool(
+        tool,
+        func=run if tool.func else None,
+        coroutine=arun if tool.coroutine else None,
+        cacheable=True,
+        side_effecting=False
+    )
@@ -2,8 +2,9 @@
 Customer and recipient interaction tools.
 """
 
-import random
-from langchain.tools import tool
+from langchain_core.tools import tool
+
+from .backends import get_backend
 
 
 @tool
@@ -22,13 +23,13 @@ def contact_recipient_via_chat(customer_id: str, message: str) -> str:
     Simulates the recipient's response.
     """
     # Simulate different recipient responses
-    responses = [
-        "Response from recipient: 'I'm not home, please leave it with the concierge at the front desk.'",
-        "Response from recipient: 'Oh no, I'm running 10 minutes late! Can the driver wait?'",
-        "Response from recipient: 'I did not order anything. Please cancel this delivery.'",
-        "Response from recipient: 'I'm not home right now. Can you just leave it somewhere safe?'"
-    ]
-    return random.choice(responses)
+    responses = {
+        "concierge": "Response from recipient: 'I'm not home, please leave it with the concierge at the front desk.'",
+        "running_late": "Response from recipient: 'Oh no, I'm running 10 minutes late! Can the driver wait?'",
+        "not_ordered": "Response from recipient: 'I did not order anything. Please cancel this delivery.'",
+        "leave_safe": "Response from recipient: 'I'm not home right now. Can you just leave it somewhere safe?'"
+    }
+    return responses[get_backend().recipient_reply(customer_id, message)]
 
 
 @tool
@@ -2,8 +2,9 @@
 Dispute resolution and mediation tools.
 """
 
-import random
-from langchain.tools import tool
+from langchain_core.tools import tool
+
+from .backends import get_backend
 
 
 @tool
@@ -21,11 +22,11 @@ def collect_evidence(customer_id: str, driver_id: str) -> str:
     Simulates the collected evidence as a structured string.
     """
     # Simulate different evidence outcomes
-    evidence_scenarios = [
-        "{'customer_photo': 'spilled_drink.jpg', 'driver_photo': 'intact_bag_seal.jpg', 'customer_statement': 'The seal was intact when I received it.', 'driver_statement': 'The bag was sealed by the merchant.'}",
-        "{'customer_photo': 'crushed_box.jpg', 'driver_photo': 'torn_bag.jpg', 'customer_statement': 'The bag was already torn.', 'driver_statement': 'The bag was flimsy and tore when I picked it up.'}"
-    ]
-    return f"Evidence collected: {random.choice(evidence_scenarios)}"
+    evidence_scenarios = {
+        "seal_intact": "{'customer_photo': 'spilled_drink.jpg', 'driver_photo': 'intact_bag_seal.jpg', 'customer_statement': 'The seal was intact when I received it.', 'driver_statement': 'The bag was sealed by the merchant.'}",
+        "bag_torn": "{'customer_photo': 'crushed_box.jpg', 'driver_photo': 'torn_bag.jpg', 'customer_statement': 'The bag was already torn.', 'driver_statement': 'The bag was flimsy and tore when I picked it up.'}"
+    }
+    return f"Evidence collected: {evidence_scenarios[get_backend().delivery_evidence(customer_id, driver_id)]}"
 
 
 @tool
@@ -0,0 +1,51 @@
+"""
+Latency and outcome metrics for tool executions.
+"""
+
+import time
+
+from langchain_core.tools import StructuredTool
+
+from .base import is_degraded, rewrap_tool
+from ..utils.metrics import TOOL_CALLS, TOOL_LATENCY
+
+
+def instrumented_tool(tool: StructuredTool) -> StructuredTool:
+    """
+    Wrap a tool so every execution records its latency and success/error outcome.
+
+    Applied last, so for cached tools the recorded latency is what callers see,
+    including cache hits. Degraded answers from the resilience wrapper count
+    as errors.
+    """
+    name = tool.name
+
+    def record(start: float, status: str):
+        TOOL_LATENCY.observe(time.perf_counter() - start, tool=name)
+        TOOL_CALLS.inc(tool=name, status=status)
+
+    def run(**kwargs):
+        start = time.perf_counter()
+        try:
+            result = tool.func(**kwargs)
+        except Exception:
+            record(start, "error")
+            raise
+        record(start, "error" if is_degraded(result) else "success")
+        return result
+
+    async def arun(**kwargs):
+        start = time.perf_counter()
+        try:
+            result = await tool.coroutine(**kwargs)
+        except Exception:
+            record(start, "error")
+            raise
+        record(start, "error" if is_degraded(result) else "success")
+        return result
+
+    return rewrap_tool(
+        tool,
+        func=run if tool.func else None,
+        coroutine=arun if tool.coroutine else None
+    )
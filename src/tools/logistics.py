@@ -2,8 +2,9 @@
 Logistics and monitoring tools for delivery coordination.
 """
 
-import random
-from langchain.tools import tool
+from langchain_core.tools import tool
+
+from .backends import get_backend
 
 
 @tool
@@ -17,8 +18,7 @@ def get_merchant_status(merchant_name: str) -> str:
         "normal": "The merchant is operating normally. Estimated prep time is 15 minutes.",
         "closed": "The merchant is currently closed."
     }
-    chosen_status = random.choice(list(statuses.keys()))
-    return statuses[chosen_status]
+    return statuses[get_backend().merchant_status(merchant_name)]
 
 
 @tool
@@ -27,12 +27,12 @@ def check_traffic(route: str) -> str:
     Checks the traffic conditions for a given route.
     Returns a string describing the traffic situation.
     """
-    traffic_conditions = [
-        "Traffic is clear. No delays expected.",
-        "A major accident has been reported along the route. Expect a 30-minute delay.",
-        "Heavy congestion due to rush hour. Expect a 15-minute delay."
-    ]
-    return random.choice(traffic_conditions)
+    traffic_conditions = {
+        "clear": "Traffic is clear. No delays expected.",
+        "accident": "A major accident has been reported along the route. Expect a 30-minute delay.",
+        "congestion": "Heavy congestion due to rush hour. Expect a 15-minute delay."
+    }
+    return traffic_conditions[get_backend().traffic_condition(route)]
 
 
 @tool
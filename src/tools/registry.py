@@ -12,6 +12,92 @@ from .dispute import (
     issue_instant_refund, exonerate_driver, log_merchant_packaging_feedback
 )
 from .verification import verify_delivery_attempt, initiate_qr_code_verification
+from .cache import ToolResultCache, cached_tool
+from .instrumentation import instrumented_tool
+from .backends import simulated_tool
+from .resilience import get_circuit_breaker_states, reset_circuit_breakers, resilient_tool
+from ..core.config import Config
+
+# Read-only tools whose results may be reused, with their TTL in seconds
+CACHEABLE_TOOLS = {
+    "get_merchant_status": 30,
+    "check_traffic": 60,
+    "get_nearby_merchants": 300,
+    "suggest_safe_drop_off": 3600,
+    "find_nearby_locker": 3600,
+}
+
+# Tools with side effects (or interactive outcomes) that must run every time
+SIDE_EFFECTING_TOOLS = {
+    "reroute_driver",
+    "notify_customer",
+    "contact_recipient_via_chat",
+    "request_address_clarification",
+    "initiate_mediation_flow",
+    "collect_evidence",
+    "analyze_evidence",
+    "issue_instant_refund",
+    "exonerate_driver",
+    "log_merchant_packaging_feedback",
+    "verify_delivery_attempt",
+    "initiate_qr_code_verification",
+}
+
+# Result caches keyed by tool name
+TOOL_CACHES = {}
+
+
+def _apply_cache_policy(tool):
+    """Return the cached wrapper for a cacheable tool, or the tool itself."""
+    if tool.name in CACHEABLE_TOOLS and Config.TOOL_CACHE_ENABLED:
+        # Simulated outcomes depend on the request seed, so entries are keyed on it
+        cache = ToolResultCache(
+            ttl=CACHEABLE_TOOLS[tool.name], maxsize=Config.TOOL_CACHE_MAXSIZE, name=tool.name,
+            seeded=Config.TOOL_BACKEND == "simulated"
+        )
+        TOOL_CACHES[tool.name] = cache
+        return cached_tool(tool, cache)
+    
+    tool.metadata = {
+        **(tool.metadata or {}),
+        "cacheable": False,
+        "side_effecting": tool.name in SIDE_EFFECTING_TOOLS
+    }
+    return tool
+
+
+def prepare_tool(tool):
+    """
+    Apply the registry's wrappers to a tool: simulated backend latency and
+    errors (with the simulated backend), deadline and circuit breaker,
+    result cache policy, then metrics.
+
+    The cache sits outside the breaker, so cache hits are served even while
+    a backend's circuit is open. Only read-only (cacheable) tools are hedged.
+
+    Works for sync and async-native (``async def``) tools alike; sync tools
+    are offloaded to the tool thread pool when called asynchronously.
+    """
+    if Config.TOOL_BACKEND == "simulated":
+        tool = simulated_tool(tool)
+    resilient = resilient_tool(
+        tool,
+        idempotent=tool.name in CACHEABLE_TOOLS,
+        side_effecting=tool.name in SIDE_EFFECTING_TOOLS
+    )
+    return instrumented_tool(_apply_cache_policy(resilient))
+
+
+def get_tool_cache_stats() -> dict:
+    """Return hit/miss statistics for every cached tool."""
+    return {name: cache.stats() for name, cache in TOOL_CACHES.items()}
+
+
+def clear_tool_caches():
+    """Drop all cached tool results."""
+    for cache in TOOL_CACHES.values():
+        cache.clear()
+
 
 # All available tools
 ALL_TOOLS = [
@@ -41,8 +127,61 @@ ALL_TOOLS = [
     initiate_qr_code_verification,
 ]
 
+# Wrap read-only tools with their result cache, then record latency/outcome metrics
+ALL_TOOLS = [prepare_tool(tool) for tool in ALL_TOOLS]
+
+# Name -> tool index shared by the agent, the fast path and the server
+TOOLS_BY_NAME = {tool.name: tool for tool in ALL_TOOLS}
+
+# Named tool groups, mirroring the sections above
+TOOL_GROUPS = {
+    "logistics": ["get_merchant_status", "check_traffic", "reroute_driver", "get_nearby_merchants"],
+    "customer": [
+        "notify_customer", "contact_recipient_via_chat", "suggest_safe_drop_off",
+        "find_nearby_locker", "request_address_clarification"
+    ],
+    "dispute": [
+        "initiate_mediation_flow", "collect_evidence", "analyze_evidence",
+        "issue_instant_refund", "exonerate_driver", "log_merchant_packaging_feedback"
+    ],
+    "verification": ["verify_delivery_attempt", "initiate_qr_code_verification"],
+}
+
+# Scenario categories and the tool groups an agent needs to resolve them
+CATEGORY_TOOL_GROUPS = {
+    "delay": ["logistics", "customer"],
+    "damage_dispute": ["dispute", "customer"],
+    "failed_delivery": ["verification", "customer"],
+    "recipient_access": ["customer"],
+}
+
+
+def get_tools_for_groups(groups: list) -> list:
+    """Return the tools of the given groups in ALL_TOOLS order."""
+    names = {name for group in groups for name in TOOL_GROUPS[group]}
+    return [tool for tool in ALL_TOOLS if tool.name in names]
+
+
+def get_tools_for_category(category: str = None) -> list:
+    """Return the tool subset for a scenario category, or ALL_TOOLS if unknown."""
+    if category not in CATEGORY_TOOL_GROUPS:
+        return ALL_TOOLS
+    return get_tools_for_groups(CATEGORY_TOOL_GROUPS[category])
+
 __all__ = [
     'ALL_TOOLS',
+    'TOOLS_BY_NAME',
+    'TOOL_GROUPS',
+    'CATEGORY_TOOL_GROUPS',
+    'get_tools_for_groups',
+    'get_tools_for_category',
+    'CACHEABLE_TOOLS',
+    'SIDE_EFFECTING_TOOLS',
+    'prepare_tool',
+    'get_tool_cache_stats',
+    'clear_tool_caches',
+    'get_circuit_breaker_states',
+    'reset_circuit_breakers',
     'get_merchant_status',
     'check_traffic',
     'reroute_driver',
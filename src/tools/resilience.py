@@ -0,0 +1,240 @@
+"""
+Timeouts, circuit breakers and hedged calls for tools.
+
+A failing or slow backend must not hold a whole agent run hostage. Each
+tool call gets a deadline. Repeated failures open the tool's circuit, and
+while it is open calls return a degraded answer immediately instead of
+waiting on the backend. Read-only tools can also be hedged: if the first
+attempt is slow, a second one starts and the first to finish wins.
+
+A side-effecting call that misses its deadline may still take effect, so
+its answer tells the agent the outcome is unknown and not to call it again.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from langchain_core.tools import StructuredTool
+
+from .base import DEGRADED_PREFIX, offload, rewrap_tool
+from ..core.config import Config
+from ..utils.metrics import TOOL_CIRCUIT_STATE, TOOL_DEGRADED, TOOL_HEDGES
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_STATE_VALUES = {CLOSED: 0, OPEN: 1, HALF_OPEN: 2}
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one tool backend."""
+
+    def __init__(self, name: str, failure_threshold: int = None, reset_timeout: float = None):
+        """
+        Initialize the breaker in the closed state.
+
+        Args:
+            name: Tool name, used for metrics and status output
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a trial call
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold or Config.CIRCUIT_FAILURE_THRESHOLD
+        self.reset_timeout = Config.CIRCUIT_RESET_SECONDS if reset_timeout is None else reset_timeout
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.total_failures = 0
+        self.rejected = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        TOOL_CIRCUIT_STATE.set(_STATE_VALUES[CLOSED], tool=name)
+
+    def _set_state(self, state: str):
+        self.state = state
+        TOOL_CIRCUIT_STATE.set(_STATE_VALUES[state], tool=self.name)
+
+    def allow(self) -> bool:
+        """Return True if a call may go to the backend now."""
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self._set_state(HALF_OPEN)
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._trial_in_flight:
+                # Let exactly one trial call through to probe the backend
+                self._trial_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+            if self.state != CLOSED:
+                self._set_state(CLOSED)
+
+    def release(self):
+        """Free the trial slot after a call that ended without an outcome (e.g. cancelled)."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """Count a failure and open the circuit at the threshold or on a failed trial."""
+        with self._lock:
+            self.consecutive_failures += 1
+            self.total_failures += 1
+            self._trial_in_flight = False
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self._set_state(OPEN)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the breaker state for status endpoints."""
+        with self._lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = max(0.0, round(self.reset_timeout - (time.monotonic() - self.opened_at), 1))
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "failure_threshold": self.failure_threshold,
+                "total_failures": self.total_failures,
+                "rejected": self.rejected,
+                "retry_in_seconds": retry_in
+            }
+
+
+# Circuit breakers keyed by tool name
+CIRCUIT_BREAKERS: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker_states() -> Dict[str, Dict[str, Any]]:
+    """Return the state of every tool's circuit breaker."""
+    return {name: breaker.snapshot() for name, breaker in CIRCUIT_BREAKERS.items()}
+
+
+def reset_circuit_breakers():
+    """Close every circuit (e.g. after a backend incident has been resolved)."""
+    for breaker in CIRCUIT_BREAKERS.values():
+        breaker.record_success()
+
+
+def tool_timeout(name: str) -> float:
+    """Return the deadline in seconds for a tool (TOOL_TIMEOUTS overrides the default)."""
+    return Config.TOOL_TIMEOUTS.get(name, Config.TOOL_TIMEOUT_SECONDS)
+
+
+def degraded_answer(name: str, reason: str) -> str:
+    """Build the answer returned instead of a tool result when its backend is unhealthy."""
+    return (f"{DEGRADED_PREFIX} {name} is temporarily unavailable ({reason}). "
+            f"Continue without this information or use an alternative.")
+
+
+def unknown_outcome_answer(name: str, reason: str) -> str:
+    """Build the answer for a side-effecting call whose outcome is unknown (it may still apply)."""
+    return (f"{DEGRADED_PREFIX} {name} did not confirm ({reason}); its outcome is unknown and "
+            f"it may still take effect. Do not call {name} again for this request; tell the "
+            f"customer the action is being confirmed.")
+
+
+async def _hedged(coroutine: Callable, kwargs: Dict[str, Any], delay: float, name: str):
+    """Run a call, starting a second identical attempt if the first is slower than ``delay``."""
+    pending = {asyncio.ensure_future(coroutine(**kwargs))}
+    error = None
+    # A deadline or cancellation in either phase must not orphan an attempt
+    try:
+        done, pending = await asyncio.wait(pending, timeout=delay)
+        if done:
+            return done.pop().result()
+
+        TOOL_HEDGES.inc(tool=name)
+        pending.add(asyncio.ensure_future(coroutine(**kwargs)))
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for attempt in done:
+                if attempt.exception() is None:
+                    return attempt.result()
+                error = attempt.exception()
+        raise error
+    finally:
+        for attempt in pending:
+            attempt.cancel()
+
+
+def resilient_tool(tool: StructuredTool, idempotent: bool = False,
+                   side_effecting: bool = False) -> StructuredTool:
+    """
+    Wrap a tool with a deadline, a circuit breaker and (if idempotent) hedging.
+
+    Timeouts, errors and open circuits all produce a degraded answer string
+    starting with DEGRADED_PREFIX instead of raising, so the agent run
+    continues. Deadlines and hedging apply to the async path, which is the
+    one the agent and server use; direct sync calls only go through the
+    breaker.
+
+    Args:
+        tool: Tool to wrap
+        idempotent: Whether duplicate calls are harmless, allowing hedging
+        side_effecting: Whether the call acts on the world; a timed-out call
+            then answers with an unknown outcome instead of inviting a retry
+    """
+    name = tool.name
+    breaker = CIRCUIT_BREAKERS[name] = CircuitBreaker(name)
+    hedge = idempotent and Config.TOOL_HEDGING_ENABLED
+    # Sync tools are offloaded here so the deadline covers them too; a
+    # timed-out thread finishes in the background, its result discarded
+    call_backend = tool.coroutine or offload(tool.func)
+
+    def run(**kwargs):
+        if not breaker.allow():
+            TOOL_DEGRADED.inc(tool=name, reason="circuit_open")
+            return degraded_answer(name, "circuit open")
+        try:
+            result = tool.func(**kwargs)
+        except Exception as e:
+            breaker.record_failure()
+            TOOL_DEGRADED.inc(tool=name, reason="error")
+            return degraded_answer(name, f"error: {e}")
+        breaker.record_success()
+        return result
+
+    async def arun(**kwargs):
+        if not breaker.allow():
+            TOOL_DEGRADED.inc(tool=name, reason="circuit_open")
+            return degraded_answer(name, "circuit open")
+        timeout = tool_timeout(name)
+        try:
+            if hedge:
+                call = _hedged(call_backend, kwargs, Config.TOOL_HEDGE_DELAY_SECONDS, name)
+            else:
+                call = call_backend(**kwargs)
+            result = await asyncio.wait_for(call, timeout=timeout)
+        except asyncio.CancelledError:
+            # The caller gave up; that says nothing about the backend
+            breaker.release()
+            raise
+        except asyncio.TimeoutError:
+            breaker.record_failure()
+            TOOL_DEGRADED.inc(tool=name, reason="timeout")
+            if side_effecting:
+                return unknown_outcome_answer(name, f"no response within {timeout:g}s")
+            return degraded_answer(name, f"no response within {timeout:g}s")
+        except Exception as e:
+            breaker.record_failure()
+            TOOL_DEGRADED.inc(tool=name, reason="error")
+            return degraded_answer(name, f"error: {e}")
+        breaker.record_success()
+        return result
+
+    return rewrap_tool(
+        tool,
+        func=run if tool.func else None,
+        coroutine=arun,
+        idempotent=idempotent
+    )
@@ -2,8 +2,9 @@
 Verification and security tools.
 """
 
-import random
-from langchain.tools import tool
+from langchain_core.tools import tool
+
+from .backends import get_backend
 
 
 @tool
@@ -12,8 +13,7 @@ def verify_delivery_attempt(driver_id: str, customer_address: str) -> str:
     Verifies if a driver was physically at a customer's address by checking GPS data.
     Use this when a customer disputes a 'failed delivery' notification.
     """
-    # Simulate that the driver sometimes fakes the attempt
-    if random.choice([True, True, False]):  # 2 in 3 chance of being a real attempt
+    if get_backend().driver_was_at_address(driver_id, customer_address):
         return f"Verification successful: Driver {driver_id}'s GPS data confirms they were at or near '{customer_address}'."
     else:
         return f"Verification FAILED: Driver {driver_id}'s GPS data does NOT show them near '{customer_address}' at the time of the marked attempt."
@@ -1,7 +1,22 @@
 """
-A simple utility for printing colored and formatted text to the console.
+Non-blocking logging for the agent, CLI and server.
+
+Log calls only put a small record on a bounded queue; a background writer
+thread formats and writes them. Output is the coloured console format for
+the CLI or one JSON object per line for the server (see configure_logging).
 """
 
+import atexit
+import json
+import queue
+import random
+import sys
+import threading
+import time
+
+from ..core.config import Config
+
+
 class bcolors:
     HEADER = '\033[95m'
     OKBLUE = '\033[94m'
@@ -13,32 +28,147 @@ class bcolors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
 
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+
+# High-volume events that LOG_SAMPLE_RATE applies to; everything else is always kept
+SAMPLED_EVENTS = {"agent_thought", "tool_call", "tool_output"}
+
+
+def _format_cli(record: tuple) -> str:
+    """Render a record in the coloured console format."""
+    _, _, event, message, fields = record
+    if event == "coordinator":
+        return f"{bcolors.OKBLUE}[Coordinator] {message}"
+    if event == "agent_thought":
+        return f"\n{bcolors.OKCYAN}{bcolors.BOLD}🤔 Agent Thought:{bcolors.OKCYAN}\n{message}"
+    if event == "tool_call":
+        line = f"\n{bcolors.WARNING}{bcolors.BOLD}🛠️ Calling Tool: {message}"
+        if fields.get("input"):
+            line += f"\n{bcolors.WARNING}   Input: {fields['input']}"
+        return line
+    if event == "tool_output":
+        return f"{bcolors.WARNING}   Output: {message}"
+    if event == "final_answer":
+        return f"\n{bcolors.OKGREEN}{bcolors.BOLD}✅ Final Answer:{bcolors.OKGREEN}\n{message}\n"
+    if event == "error":
+        return f"\n{bcolors.FAIL}{bcolors.BOLD}❌ Error:{bcolors.FAIL}\n{message}\n"
+    return f"{bcolors.OKCYAN}ℹ️ {message}"
+
+
+def _format_json(record: tuple) -> str:
+    """Render a record as a single JSON line."""
+    timestamp, level, event, message, fields = record
+    payload = {
+        "ts": round(timestamp, 6),
+        "level": level,
+        "event": event,
+        "message": message,
+    }
+    payload.update(fields)
+    return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class _LogWriter:
+    """Background thread draining the log queue to stdout."""
+
+    def __init__(self, max_queue: int):
+        """Start the writer thread."""
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.formatter = _format_cli
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="synapse-log-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, record: tuple):
+        """Enqueue a record without ever blocking the caller."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self):
+        """Block until every queued record has been written."""
+        self.queue.join()
+
+    def _run(self):
+        stream_queue = self.queue
+        while True:
+            record = stream_queue.get()
+            try:
+                sys.stdout.write(self.formatter(record) + "\n")
+                if stream_queue.empty():
+                    sys.stdout.flush()
+            except Exception:
+                pass
+            finally:
+                stream_queue.task_done()
+
+
+_writer = _LogWriter(Config.LOG_QUEUE_SIZE)
+_min_level = LEVELS.get(Config.LOG_LEVEL.upper(), LEVELS["INFO"])
+_sample_rate = Config.LOG_SAMPLE_RATE
+atexit.register(_writer.flush)
+
+
+def configure_logging(mode: str = None, level: str = None, sample_rate: float = None):
+    """
+    Configure the log backend.
+
+    Args:
+        mode: "cli" for coloured console output or "json" for one JSON
+            object per line (server mode). LOG_FORMAT takes precedence.
+        level: Minimum level name (DEBUG, INFO, WARNING, ERROR)
+        sample_rate: Fraction (0-1) of high-volume events to keep
+    """
+    global _min_level, _sample_rate
+    mode = Config.LOG_FORMAT or mode
+    if mode:
+        _writer.formatter = _format_json if mode == "json" else _format_cli
+    if level:
+        _min_level = LEVELS.get(level.upper(), _min_level)
+    if sample_rate is not None:
+        _sample_rate = sample_rate
+
+
+def flush_logs():
+    """Wait until all pending log records are written."""
+    _writer.flush()
+
+
+def _log(level: str, event: str, message, **fields):
+    """Enqueue a log record if it passes the level and sampling filters."""
+    if LEVELS[level] < _min_level:
+        return
+    if event in SAMPLED_EVENTS and _sample_rate < 1.0 and random.random() >= _sample_rate:
+        return
+    _writer.submit((time.time(), level, event, message, fields))
+
+
 def log_coordinator(message: str):
     """Log coordinator messages in blue."""
-    print(f"{bcolors.OKBLUE}[Coordinator] {message}")
+    _log("INFO", "coordinator", message)
 
 def log_agent_thought(thought: str):
     """Log agent thoughts in cyan with thinking emoji."""
-    print(f"\n{bcolors.OKCYAN}{bcolors.BOLD}🤔 Agent Thought:{bcolors.OKCYAN}\n{thought}")
+    _log("INFO", "agent_thought", thought)
 
 def log_tool_call(tool_name: str, tool_input: str):
     """Log tool calls in yellow with tool emoji."""
-    print(f"\n{bcolors.WARNING}{bcolors.BOLD}🛠️ Calling Tool: {tool_name}")
-    if tool_input:
-        print(f"{bcolors.WARNING}   Input: {tool_input}")
+    _log("INFO", "tool_call", tool_name, input=tool_input)
 
 def log_tool_output(output: str):
     """Log tool output in yellow."""
-    print(f"{bcolors.WARNING}   Output: {output}")
+    _log("INFO", "tool_output", output)
 
 def log_final_answer(answer: str):
     """Log final answers in green with checkmark."""
-    print(f"\n{bcolors.OKGREEN}{bcolors.BOLD}✅ Final Answer:{bcolors.OKGREEN}\n{answer}\n")
+    _log("INFO", "final_answer", answer)
 
 def log_error(error: str):
     """Log errors in red with error emoji."""
-    print(f"\n{bcolors.FAIL}{bcolors.BOLD}❌ Error:{bcolors.FAIL}\n{error}\n")
+    _log("ERROR", "error", error)
 
 def log_info(info: str):
     """Log general information in cyan."""
-    print(f"{bcolors.OKCYAN}ℹ️ {info}")
+    _log("INFO", "info", info)
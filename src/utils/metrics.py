@@ -0,0 +1,276 @@
+"""
+Minimal in-process metrics with Prometheus text exposition.
+
+Counters, gauges and histograms are keyed by label values and rendered by
+``render_metrics()`` for the server's /metrics endpoint. With several
+server workers, each worker's ``export_metrics()`` can be rendered together,
+the samples of each labelled with its worker.
+"""
+
+import bisect
+import threading
+from typing import Dict, List, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+STEP_BUCKETS = (0, 1, 2, 3, 4, 5, 6, 8, 10, 15, 20)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+
+_REGISTRY: List["_Metric"] = []
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    """Base class holding one value per label combination."""
+
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """Create and register the metric."""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, object] = {}
+        self._lock = threading.Lock()
+        _REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def clear(self):
+        """Reset all recorded values."""
+        with self._lock:
+            self._values.clear()
+
+    def export(self) -> List:
+        """Return the recorded values as JSON-serialisable ``[label values, value]`` pairs."""
+        with self._lock:
+            return [[list(key), self._copy(value)] for key, value in self._values.items()]
+
+    @staticmethod
+    def _copy(value):
+        return value
+
+    def render(self, workers: Dict[str, List] = None) -> List[str]:
+        """Render this metric's samples, or those of every worker's export() with a worker label."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        if workers is None:
+            with self._lock:
+                items = sorted(self._values.items())
+            for key, value in items:
+                lines.extend(self._render_sample(key, value))
+            return lines
+        for worker, items in sorted(workers.items()):
+            for key, value in sorted((tuple(key), value) for key, value in items):
+                lines.extend(self._render_sample(key, value, f'worker="{_escape(worker)}"'))
+        return lines
+
+    def _render_sample(self, key: Tuple, value, extra: str = "") -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key, extra)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    """A monotonically increasing count."""
+
+    metric_type = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    """A value that can go up and down."""
+
+    metric_type = "gauge"
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets."""
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # per-bucket counts (last slot is +Inf), sum, count
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def snapshot(self, **labels) -> Dict[str, float]:
+        """Return the count and sum observed for one label combination."""
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return {"count": state[2], "sum": state[1]} if state else {"count": 0, "sum": 0.0}
+
+    @staticmethod
+    def _copy(state):
+        return [list(state[0]), state[1], state[2]]
+
+    def _render_sample(self, key: Tuple, state, extra: str = "") -> List[str]:
+        counts, total, count = state
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += bucket_count
+            le = "+Inf" if bound == float("inf") else _format_value(bound)
+            bucket_labels = _format_labels(self.labelnames, key, ",".join(filter(None, (extra, f'le="{le}"'))))
+            lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key, extra)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+def export_metrics() -> Dict[str, List]:
+    """Return every metric's values by name, for rendering in another worker process."""
+    return {metric.name: metric.export() for metric in _REGISTRY}
+
+
+def render_metrics(workers: Dict[str, Dict[str, List]] = None) -> str:
+    """
+    Render every registered metric in the Prometheus text format.
+
+    Args:
+        workers: ``export_metrics()`` of each worker by worker ID; their
+            samples are rendered with a ``worker`` label instead of this
+            process's own values
+    """
+    lines = []
+    for metric in _REGISTRY:
+        if workers is None:
+            lines.extend(metric.render())
+        else:
+            lines.extend(metric.render({worker: values.get(metric.name, []) for worker, values in workers.items()}))
+    return "\n".join(lines) + "\n"
+
+
+# Tools
+TOOL_LATENCY = Histogram(
+    "synapse_tool_duration_seconds", "Tool execution latency in seconds.", ["tool"]
+)
+TOOL_CALLS = Counter(
+    "synapse_tool_calls_total", "Tool executions by outcome.", ["tool", "status"]
+)
+TOOL_CACHE_REQUESTS = Counter(
+    "synapse_tool_cache_requests_total", "Tool result cache lookups by result (hit/miss).", ["tool", "result"]
+)
+TOOL_DEGRADED = Counter(
+    "synapse_tool_degraded_total", "Degraded tool answers by reason (timeout/error/circuit_open).",
+    ["tool", "reason"]
+)
+TOOL_HEDGES = Counter(
+    "synapse_tool_hedged_requests_total", "Hedged second attempts started for slow idempotent tools.", ["tool"]
+)
+TOOL_CIRCUIT_STATE = Gauge(
+    "synapse_tool_circuit_state", "Circuit breaker state per tool (0 closed, 1 open, 2 half-open).", ["tool"]
+)
+TOOL_HTTP_REQUESTS = Counter(
+    "synapse_tool_http_requests_total", "Calls to the /tools endpoints by outcome.", ["tool", "status"]
+)
+
+# LLM
+LLM_LATENCY = Histogram(
+    "synapse_llm_call_duration_seconds", "Latency of a single LLM call in seconds.", ["model"]
+)
+LLM_CALLS = Counter(
+    "synapse_llm_calls_total", "LLM calls by outcome.", ["model", "status"]
+)
+LLM_TOKENS = Histogram(
+    "synapse_llm_tokens", "Tokens per LLM call.", ["model", "direction"], buckets=TOKEN_BUCKETS
+)
+LLM_CACHE_REQUESTS = Counter(
+    "synapse_llm_cache_requests_total", "LLM response cache lookups by result (hit/miss).", ["result"]
+)
+
+# Scenarios
+SCENARIOS_IN_FLIGHT = Gauge(
+    "synapse_scenarios_in_flight", "Scenarios currently being processed."
+)
+SCENARIOS_QUEUED = Gauge(
+    "synapse_scenarios_queued", "Scenarios waiting for a concurrency slot."
+)
+SCENARIOS = Counter(
+    "synapse_scenarios_total", "Processed scenarios by path and outcome.", ["path", "status"]
+)
+SCENARIO_LATENCY = Histogram(
+    "synapse_scenario_duration_seconds", "End-to-end scenario latency in seconds.", ["path"]
+)
+AGENT_STEPS = Histogram(
+    "synapse_agent_steps", "Tool calls made per scenario.", ["path"], buckets=STEP_BUCKETS
+)
+
+# Scenario jobs
+JOBS_SUBMITTED = Counter(
+    "synapse_jobs_submitted_total", "Job submissions by outcome (queued/deduplicated).", ["result"]
+)
+JOBS_FINISHED = Counter(
+    "synapse_jobs_finished_total", "Finished jobs by status (succeeded/failed).", ["status"]
+)
+JOBS_QUEUED = Gauge(
+    "synapse_jobs_queued", "Jobs waiting in the durable queue."
+)
+JOBS_RUNNING = Gauge(
+    "synapse_jobs_running", "Jobs currently being run by queue workers."
+)
+JOB_QUEUE_WAIT = Histogram(
+    "synapse_job_queue_wait_seconds", "Time from job submission until a worker starts it."
+)
+JOB_RUN_DURATION = Histogram(
+    "synapse_job_run_duration_seconds", "Time a worker spends running a job."
+)
+
+# Operator WebSocket sessions
+WS_SESSIONS_ACTIVE = Gauge(
+    "synapse_ws_sessions_active", "Open /ws/session connections."
+)
+WS_SCENARIOS = Counter(
+    "synapse_ws_scenarios_total", "Scenarios received over /ws/session by outcome.", ["status"]
+)
+WS_BACKPRESSURE = Counter(
+    "synapse_ws_backpressure_total", "Session events that waited because the client read too slowly."
+)
@@ -0,0 +1,34 @@
+"""
+Offline token counting for prompt budgeting.
+
+Uses tiktoken's ``cl100k_base`` encoding as a close proxy for the model's own
+tokenizer. If the encoding file is not in the local tiktoken cache and
+cannot be downloaded, counts fall back to a characters / 4 estimate.
+"""
+
+from functools import lru_cache
+
+ENCODING_NAME = "cl100k_base"
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(ENCODING_NAME)
+    except Exception:
+        return None
+
+
+def token_counting_method() -> str:
+    """Return the name of the method count_tokens is using."""
+    return f"tiktoken:{ENCODING_NAME}" if _get_encoding() else f"estimate:chars/{CHARS_PER_TOKEN}"
+
+
+def count_tokens(text: str) -> int:
+    """Count the tokens in ``text``."""
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
@@ -0,0 +1,14 @@
+"""
+Shared test setup: import the project from its root and run offline.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# No API key or model calls are needed by the tests
+os.environ.setdefault("LLM_PROVIDER", "scripted")
@@ -0,0 +1,85 @@
+"""
+Concurrent slow tools must overlap instead of serialising on the event loop.
+
+The timing check of scripts/demo_async_tools.py: a blocking sync tool is
+offloaded to the tool pool and an async-native tool awaits on the loop,
+so N concurrent POST /tools/{name} calls finish in about one latency
+(per pool round) and /health keeps answering meanwhile.
+"""
+
+import asyncio
+import math
+import time
+
+import httpx
+import pytest
+from langchain_core.tools import tool
+
+from src.core.config import Config
+from src.mcp.server import TOOL_REGISTRY, app
+from src.tools.registry import prepare_tool
+
+LATENCY = 0.2
+CALLS = 10
+
+
+@tool
+def slow_sync_lookup(order_id: str) -> str:
+    """Look up an order in a slow blocking backend."""
+    time.sleep(LATENCY)
+    return f"Order {order_id} located (sync backend)."
+
+
+@tool
+async def slow_async_lookup(order_id: str) -> str:
+    """Look up an order in a slow async backend."""
+    await asyncio.sleep(LATENCY)
+    return f"Order {order_id} located (async backend)."
+
+
+@pytest.fixture(autouse=True)
+def demo_tools():
+    TOOL_REGISTRY["slow_sync_lookup"] = prepare_tool(slow_sync_lookup)
+    TOOL_REGISTRY["slow_async_lookup"] = prepare_tool(slow_async_lookup)
+    yield
+    TOOL_REGISTRY.pop("slow_sync_lookup", None)
+    TOOL_REGISTRY.pop("slow_async_lookup", None)
+
+
+async def _burst(name: str, calls: int):
+    """Run ``calls`` concurrent tool calls; return (wall seconds, worst /health stall seconds)."""
+    stop = asyncio.Event()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        async def probe():
+            worst = 0.0
+            while not stop.is_set():
+                start = time.perf_counter()
+                await client.get("/health")
+                worst = max(worst, time.perf_counter() - start)
+                await asyncio.sleep(0.01)
+            return worst
+
+        async def call(index):
+            response = await client.post(f"/tools/{name}", json={"args": {"order_id": f"ORD-{index}"}})
+            assert response.json()["success"], response.text
+
+        health = asyncio.create_task(probe())
+        await asyncio.sleep(0.02)
+        start = time.perf_counter()
+        await asyncio.gather(*[call(index) for index in range(calls)])
+        wall = time.perf_counter() - start
+        stop.set()
+        return wall, await health
+
+
+def test_offloaded_sync_tool_calls_overlap():
+    workers = Config.TOOL_EXECUTOR_WORKERS if Config.PARALLEL_TOOL_CALLS else 1
+    wall, stall = asyncio.run(_burst("slow_sync_lookup", CALLS))
+    assert wall < 2 * LATENCY * math.ceil(CALLS / workers)
+    assert stall < LATENCY
+
+
+def test_async_tool_calls_overlap():
+    wall, stall = asyncio.run(_burst("slow_async_lookup", CALLS))
+    assert wall < 2 * LATENCY
+    assert stall < LATENCY
@@ -0,0 +1,62 @@
+"""
+The tool catalog is served from one serialised document with ETag revalidation.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.mcp.catalog import CatalogDocument
+from src.mcp.server import app
+from src.tools.registry import ALL_TOOLS, SIDE_EFFECTING_TOOLS
+
+
+@pytest.fixture(scope="module")
+def client():
+    return TestClient(app)
+
+
+def test_catalog_lists_every_tool_with_its_schema(client):
+    response = client.get("/tools")
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "no-cache"
+    catalog = response.json()
+    assert set(catalog) == {tool.name for tool in ALL_TOOLS}
+    refund = catalog["issue_instant_refund"]
+    assert refund["side_effecting"] and not refund["cacheable"]
+    assert set(refund["schema"]["required"]) == {"customer_id", "reason"}
+    assert catalog["get_merchant_status"]["cacheable"]
+    assert {name for name, entry in catalog.items() if entry["side_effecting"]} == SIDE_EFFECTING_TOOLS
+
+
+@pytest.mark.parametrize("path", ["/tools", "/resources/available-tools", "/"])
+def test_matching_etag_gets_an_empty_304(client, path):
+    first = client.get(path)
+    etag = first.headers["etag"]
+    assert first.content and client.get(path).headers["etag"] == etag
+
+    revalidated = client.get(path, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+
+
+def test_tool_listings_share_one_document(client):
+    assert client.get("/tools").headers["etag"] == client.get("/resources/available-tools").headers["etag"]
+    assert client.get("/tools").headers["etag"] != client.get("/").headers["etag"]
+
+
+@pytest.mark.parametrize("header, matches", [
+    ('"other", {etag}', True),
+    ("W/{etag}", True),
+    ("*", True),
+    ('"other"', False),
+    ("", False),
+])
+def test_if_none_match_comparison(header, matches):
+    document = CatalogDocument({"a": 1})
+    assert document.matches(header.format(etag=document.etag)) is matches
+
+
+def test_stale_etag_gets_the_document(client):
+    response = client.get("/tools", headers={"If-None-Match": '"stale"'})
+    assert response.status_code == 200 and response.json()
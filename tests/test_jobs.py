@@ -0,0 +1,160 @@
+"""
+Scenario jobs: deduplication, claiming, lease recovery and the no-rerun rule.
+"""
+
+import asyncio
+import time
+
+import pytest
+from langchain.callbacks.base import AsyncCallbackHandler
+
+from src.core.agent import SynapseAgent
+from src.core.config import Config
+from src.core.jobs import FAILED, QUEUED, RUNNING, SUCCEEDED, JobQueue, JobStore
+
+LEASE = 0.2
+
+
+@pytest.fixture(autouse=True)
+def short_lease(monkeypatch):
+    monkeypatch.setattr(Config, "JOB_LEASE_SECONDS", LEASE)
+    monkeypatch.setattr(Config, "JOB_POLL_INTERVAL_SECONDS", 0.02)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / "jobs.sqlite"))
+
+
+class _ToolFinished(AsyncCallbackHandler):
+    """Signal once the run's first tool call has returned."""
+
+    def __init__(self):
+        self.event = asyncio.Event()
+
+    async def on_tool_end(self, output, **kwargs):
+        self.event.set()
+
+
+def test_identical_active_submissions_are_deduplicated(store):
+    job, deduplicated = store.submit("Heavy traffic", {"order_id": "O1"})
+    assert not deduplicated and job["status"] == QUEUED
+
+    again, deduplicated = store.submit("  Heavy traffic ", {"order_id": "O1"})
+    assert deduplicated and again["job_id"] == job["job_id"]
+    other, deduplicated = store.submit("Heavy traffic", {"order_id": "O2"})
+    assert not deduplicated and other["job_id"] != job["job_id"]
+
+    # A finished job no longer absorbs resubmissions
+    store.claim()
+    store.finish(job["job_id"], SUCCEEDED, {"success": True})
+    fresh, deduplicated = store.submit("Heavy traffic", {"order_id": "O1"})
+    assert not deduplicated and fresh["job_id"] != job["job_id"]
+
+
+def test_claim_takes_the_oldest_queued_job_once(store):
+    first, _ = store.submit("first", {})
+    second, _ = store.submit("second", {})
+
+    claimed = store.claim()
+    assert claimed["job_id"] == first["job_id"]
+    assert claimed["status"] == RUNNING and claimed["attempts"] == 1
+    assert store.claim()["job_id"] == second["job_id"]
+    assert store.claim() is None
+
+
+def test_only_expired_leases_are_recovered(store):
+    job, _ = store.submit("scenario", {})
+    store.claim()
+    assert store.recover() == (0, 0)
+
+    time.sleep(LEASE * 0.6)
+    assert store.renew(job["job_id"])
+    time.sleep(LEASE * 0.6)
+    # Renewed within the lease: its worker is alive
+    assert store.recover() == (0, 0)
+
+    time.sleep(LEASE)
+    assert store.recover() == (1, 0)
+    assert store.get(job["job_id"])["status"] == QUEUED
+
+
+def test_interrupted_side_effecting_run_is_failed_not_requeued(store):
+    job, _ = store.submit("refund", {})
+    store.claim()
+    store.record_tool_call(job["job_id"], "issue_instant_refund")
+    time.sleep(LEASE * 1.5)
+
+    assert store.recover() == (0, 1)
+    failed = store.get(job["job_id"])
+    assert failed["status"] == FAILED
+    assert "issue_instant_refund" in failed["error"] and "not run again" in failed["error"]
+
+
+def test_job_interrupted_too_often_is_failed(store):
+    job, _ = store.submit("scenario", {})
+    for _ in range(Config.JOB_MAX_ATTEMPTS - 1):
+        store.claim()
+        time.sleep(LEASE * 1.5)
+        assert store.recover() == (1, 0)
+    store.claim()
+    time.sleep(LEASE * 1.5)
+    assert store.recover() == (0, 1)
+    assert store.get(job["job_id"])["error"] == f"Interrupted {Config.JOB_MAX_ATTEMPTS} times; giving up"
+
+
+def test_heartbeat_keeps_a_long_run_and_sweep_recovers_a_crashed_one(store):
+    async def runner(scenario, context, callbacks=None):
+        await asyncio.sleep(LEASE * 3)
+        return {"success": True}
+
+    async def main():
+        queue = JobQueue(runner, store=store, workers=1)
+        await queue.start()
+        try:
+            long_run, _ = await queue.submit("long run", {})
+            finished = await queue.get(long_run["job_id"], wait=5)
+            assert finished["status"] == SUCCEEDED and finished["attempts"] == 1
+
+            # A worker that crashed after claiming stops renewing its lease
+            await queue.stop()
+            crashed, _ = store.submit("crashed", {})
+            assert store.claim()["job_id"] == crashed["job_id"]
+            await queue.start()
+            finished = await queue.get(crashed["job_id"], wait=5)
+            assert finished["status"] == SUCCEEDED and finished["attempts"] == 2
+            assert queue._finished == {}
+        finally:
+            await queue.stop()
+
+    asyncio.run(main())
+
+
+def test_agent_job_cut_off_after_a_side_effect_is_never_rerun(store):
+    agent = SynapseAgent()
+    agent.llm.latency = LEASE
+    signal = _ToolFinished()
+    runs = []
+
+    async def runner(scenario, context, callbacks=None):
+        runs.append(scenario)
+        return await agent.process_scenario(scenario, context, callbacks=[*callbacks, signal])
+
+    async def main():
+        queue = JobQueue(runner, store=store, workers=1)
+        await queue.start()
+        # The scripted dispute starts with initiate_mediation_flow
+        job, _ = await queue.submit("The customer's drink spilled in transit", {"seed": 1})
+        await asyncio.wait_for(signal.event.wait(), timeout=5)
+        await queue.stop()
+
+        await asyncio.sleep(LEASE * 1.5)
+        await queue.start()
+        try:
+            return await queue.get(job["job_id"], wait=LEASE * 3)
+        finally:
+            await queue.stop()
+
+    job = asyncio.run(main())
+    assert job["status"] == FAILED and "initiate_mediation_flow" in job["error"]
+    assert len(runs) == 1
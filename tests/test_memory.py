@@ -0,0 +1,127 @@
+"""
+Scratchpad compaction within a turn and session memory across turns.
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from langchain.agents.output_parsers.tools import ToolAgentAction
+from langchain.callbacks.base import AsyncCallbackHandler
+from langchain_core.messages import AIMessage, ToolMessage
+
+from src.core.agent import SynapseAgent
+from src.core.config import Config
+from src.core.memory import COMPACTED_MARKER, SessionMemory, compact_scratchpad, get_session_memory, session_key
+
+
+class _ModelInputs(AsyncCallbackHandler):
+    """Record the messages of every chat model call."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def on_chat_model_start(self, serialized, messages, **kwargs):
+        self.calls.append(messages[0])
+
+
+def _step(index: int, observation: str):
+    action = ToolAgentAction(
+        tool="check_traffic", tool_input={"route": f"R{index}"}, log="", message_log=[AIMessage(content="")],
+        tool_call_id=f"call_{index}"
+    )
+    return action, observation
+
+
+def test_only_the_latest_observations_are_kept_in_full(monkeypatch):
+    monkeypatch.setattr(Config, "SCRATCHPAD_KEEP_RECENT_STEPS", 2)
+    monkeypatch.setattr(Config, "SCRATCHPAD_COMPACT_CHARS", 11)
+    steps = [_step(index, f"observation {index} " + "x" * 50) for index in range(4)]
+
+    messages = compact_scratchpad(steps)
+    tool_messages = [message for message in messages if isinstance(message, ToolMessage)]
+    # Every tool call still has its paired tool message
+    assert [message.tool_call_id for message in tool_messages] == [f"call_{index}" for index in range(4)]
+    assert [message.content for message in tool_messages[:2]] == [
+        "observation" + COMPACTED_MARKER, "observation" + COMPACTED_MARKER
+    ]
+    assert [message.content for message in tool_messages[2:]] == [steps[2][1], steps[3][1]]
+
+    # Short scratchpads are sent unchanged
+    assert [message.content for message in compact_scratchpad(steps[:2]) if isinstance(message, ToolMessage)] == [
+        steps[0][1], steps[1][1]
+    ]
+
+
+def test_agent_compacts_older_observations_before_each_step(monkeypatch):
+    monkeypatch.setattr(Config, "SCRATCHPAD_COMPACT_CHARS", 12)
+    inputs = _ModelInputs()
+    result = asyncio.run(SynapseAgent().process_scenario(
+        "The customer's drink spilled in transit", {"seed": 3}, callbacks=[inputs]
+    ))
+
+    assert result["success"] and len(result["execution_results"]) == 6
+    observations = [message.content for message in inputs.calls[-1] if isinstance(message, ToolMessage)]
+    keep = Config.SCRATCHPAD_KEEP_RECENT_STEPS
+    assert all(content.endswith(COMPACTED_MARKER) for content in observations[:-keep])
+    assert observations[-keep:] == [execution["result"] for execution in result["execution_results"][-keep:]]
+
+
+def test_session_memory_is_off_by_default():
+    env = {name: value for name, value in os.environ.items() if name != "SESSION_MEMORY_ENABLED"}
+    output = subprocess.run(
+        [sys.executable, "-c", "from src.core.config import Config; print(Config.SESSION_MEMORY_ENABLED)"],
+        cwd=Path(__file__).parent.parent, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "False"
+
+
+def test_disabled_memory_keeps_requests_stateless(monkeypatch):
+    monkeypatch.setattr(Config, "SESSION_MEMORY_ENABLED", False)
+    agent = SynapseAgent()
+    for _ in range(2):
+        result = asyncio.run(agent.process_scenario("Heavy traffic on the route", {"order_id": "O-stateless"}))
+        assert result["success"] and result["session"] is None
+    assert get_session_memory().turns("order:O-stateless") == 0
+
+
+def test_enabled_memory_replays_earlier_turns(monkeypatch):
+    monkeypatch.setattr(Config, "SESSION_MEMORY_ENABLED", True)
+    agent = SynapseAgent()
+    inputs = _ModelInputs()
+    try:
+        first = asyncio.run(agent.process_scenario("Heavy traffic on the route", {"order_id": "O-77"}))
+        assert first["session"] == "order:O-77"
+        asyncio.run(agent.process_scenario("Is there still traffic?", {"order_id": "O-77"}, callbacks=[inputs]))
+
+        # The second turn starts from the first one's scenario and summary
+        _, scenario, summary, current = inputs.calls[0]
+        assert scenario.content == "Heavy traffic on the route" and "check_traffic" in summary.content
+        assert current.content == "Is there still traffic?"
+        assert get_session_memory().turns("order:O-77") == 2
+    finally:
+        get_session_memory().forget("order:O-77")
+
+
+def test_session_keys_and_bounds():
+    assert session_key({"customer_id": "C1", "order_id": "O1"}) == "order:O1"
+    assert session_key({"session_id": "S1", "order_id": "O1"}) == "session:S1"
+    assert session_key({"timestamp": "now"}) is None
+
+    memory = SessionMemory(max_sessions=2, max_turns=2, ttl=0.2)
+    for turn in range(3):
+        memory.record("order:A", f"turn {turn}", "done", [])
+    assert [message.content for message in memory.history("order:A")[::2]] == ["turn 1", "turn 2"]
+
+    memory.record("order:B", "b", "done", [])
+    memory.record("order:C", "c", "done", [])
+    # The least recently used session is evicted
+    assert memory.turns("order:A") == 0 and memory.stats()["sessions"] == 2
+
+    memory.record(None, "one-off", "done", [])
+    assert memory.history(None) == []
+    time.sleep(0.25)
+    assert memory.history("order:C") == []
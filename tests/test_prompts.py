@@ -0,0 +1,72 @@
+"""
+The compiled agent prompts stay within budget and keep the original directives.
+
+The same checks as scripts/check_prompt_budget.py, plus every category
+prompt the agent precompiles. The budget is only meaningful with real
+token counts: without tiktoken's encoding the budget test fails on CI and
+is skipped elsewhere, instead of passing on the characters / 4 estimate.
+"""
+
+import os
+
+import pytest
+
+from src.core.prompts import (
+    BASELINE_DIRECTIVES, DIRECTIVES, check_baseline_directives, check_directive_tools,
+    compile_system_prompt, prompt_token_report
+)
+from src.tools.registry import CATEGORY_TOOL_GROUPS, get_tools_for_category
+
+CATEGORIES = sorted(CATEGORY_TOOL_GROUPS)
+DIRECTIVES_BY_NAME = {directive.name: directive for directive in DIRECTIVES}
+
+
+def _require_tiktoken(report):
+    if report["method"].startswith("tiktoken"):
+        return
+    reason = f"tiktoken's encoding is unavailable; tokens were counted with {report['method']}"
+    if os.environ.get("CI"):
+        pytest.fail(reason)
+    pytest.skip(reason)
+
+
+@pytest.mark.parametrize("category", [None] + CATEGORIES)
+def test_prompt_within_token_budget(category):
+    report = prompt_token_report(get_tools_for_category(category))
+    _require_tiktoken(report)
+    assert report["within_budget"], f"{report['total_tokens']} tokens over a budget of {report['budget']}"
+
+
+def test_full_prompt_keeps_every_baseline_directive():
+    assert check_baseline_directives() == []
+    assert check_directive_tools() == []
+    prompt = compile_system_prompt()
+    for names in BASELINE_DIRECTIVES.values():
+        for name in names:
+            assert DIRECTIVES_BY_NAME[name].text in prompt
+
+
+@pytest.mark.parametrize("category", CATEGORIES)
+def test_category_prompt_keeps_baseline_directives_for_its_tools(category):
+    tools = get_tools_for_category(category)
+    tool_names = {tool.name for tool in tools}
+    prompt = compile_system_prompt(tools)
+    for heading, names in BASELINE_DIRECTIVES.items():
+        for name in names:
+            directive = DIRECTIVES_BY_NAME[name]
+            if directive.applies_to(tool_names):
+                assert directive.text in prompt, f"{heading} ({name}) missing from the {category} prompt"
+
+
+def test_category_prompts_cover_their_workflows():
+    expected = {
+        "delay": {"customer_first"},
+        "damage_dispute": {"damaged_items"},
+        "failed_delivery": {"failed_delivery", "verification_workflow", "otp_failure"},
+        "recipient_access": {"address_resolution"},
+    }
+    for category, names in expected.items():
+        included = set(prompt_token_report(get_tools_for_category(category))["directives"])
+        assert names <= included
+        # The category already settles the dispute type
+        assert "dispute_types" not in included
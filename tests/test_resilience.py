@@ -0,0 +1,149 @@
+"""
+Circuit breakers, deadlines and hedging around tool calls.
+"""
+
+import asyncio
+import time
+
+import pytest
+from langchain_core.tools import tool
+
+from src.core.config import Config
+from src.tools.base import degraded_reason, is_degraded
+from src.tools.resilience import CIRCUIT_BREAKERS, CLOSED, HALF_OPEN, OPEN, CircuitBreaker, resilient_tool
+
+CALLS = []
+BEHAVIOUR = {"delay": 0.0, "fail": False}
+
+
+@tool
+async def flaky_lookup(order_id: str) -> str:
+    """Look up an order in a flaky backend."""
+    CALLS.append(order_id)
+    await asyncio.sleep(BEHAVIOUR["delay"])
+    if BEHAVIOUR["fail"]:
+        raise ConnectionError("backend down")
+    return f"Order {order_id} found"
+
+
+@tool
+async def flaky_refund(customer_id: str) -> str:
+    """Refund a customer in a flaky backend."""
+    CALLS.append(customer_id)
+    await asyncio.sleep(BEHAVIOUR["delay"])
+    return f"Refunded {customer_id}"
+
+
+@pytest.fixture(autouse=True)
+def reset(monkeypatch):
+    CALLS.clear()
+    BEHAVIOUR.update(delay=0.0, fail=False)
+    monkeypatch.setattr(Config, "CIRCUIT_FAILURE_THRESHOLD", 2)
+    monkeypatch.setattr(Config, "CIRCUIT_RESET_SECONDS", 0.1)
+    monkeypatch.setattr(Config, "TOOL_TIMEOUT_SECONDS", 0.1)
+    yield
+    CIRCUIT_BREAKERS.pop("flaky_lookup", None)
+    CIRCUIT_BREAKERS.pop("flaky_refund", None)
+
+
+def test_breaker_opens_half_opens_and_closes():
+    breaker = CircuitBreaker("backend", failure_threshold=2, reset_timeout=0.05)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow() and breaker.rejected == 1
+
+    time.sleep(0.06)
+    # One trial call probes the backend; others keep being rejected
+    assert breaker.allow() and breaker.state == HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.consecutive_failures == 0
+
+
+def test_failed_trial_reopens_and_release_frees_the_trial():
+    breaker = CircuitBreaker("backend", failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    # A cancelled trial says nothing about the backend; the next call may probe
+    breaker.release()
+    assert breaker.state == HALF_OPEN and breaker.allow()
+
+
+def test_errors_degrade_and_open_the_circuit():
+    wrapped = resilient_tool(flaky_lookup)
+    BEHAVIOUR["fail"] = True
+    for _ in range(2):
+        answer = asyncio.run(wrapped.ainvoke({"order_id": "A1"}))
+        assert is_degraded(answer) and "backend down" in degraded_reason(answer)
+    assert CIRCUIT_BREAKERS["flaky_lookup"].state == OPEN
+
+    # The open circuit answers without calling the backend
+    answer = asyncio.run(wrapped.ainvoke({"order_id": "A1"}))
+    assert "circuit open" in answer and len(CALLS) == 2
+
+    BEHAVIOUR["fail"] = False
+    time.sleep(0.11)
+    assert asyncio.run(wrapped.ainvoke({"order_id": "A1"})) == "Order A1 found"
+    assert CIRCUIT_BREAKERS["flaky_lookup"].state == CLOSED
+
+
+def test_read_only_timeout_invites_an_alternative():
+    wrapped = resilient_tool(flaky_lookup, idempotent=True)
+    BEHAVIOUR["delay"] = 0.3
+    answer = asyncio.run(wrapped.ainvoke({"order_id": "A1"}))
+    assert is_degraded(answer)
+    assert "no response within 0.1s" in answer and "use an alternative" in answer
+
+
+def test_side_effecting_timeout_reports_an_unknown_outcome():
+    wrapped = resilient_tool(flaky_refund, side_effecting=True)
+    BEHAVIOUR["delay"] = 0.3
+    answer = asyncio.run(wrapped.ainvoke({"customer_id": "C1"}))
+    assert is_degraded(answer)
+    assert "outcome is unknown" in answer and "Do not call flaky_refund again" in answer
+    assert "use an alternative" not in answer
+
+
+def test_cancelled_call_does_not_count_as_a_failure():
+    wrapped = resilient_tool(flaky_lookup)
+    BEHAVIOUR["delay"] = 0.05
+
+    async def cancel_midway():
+        task = asyncio.create_task(wrapped.ainvoke({"order_id": "A1"}))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_midway())
+    assert CIRCUIT_BREAKERS["flaky_lookup"].snapshot()["total_failures"] == 0
+
+
+def test_hedged_call_takes_the_faster_attempt(monkeypatch):
+    monkeypatch.setattr(Config, "TOOL_HEDGING_ENABLED", True)
+    monkeypatch.setattr(Config, "TOOL_HEDGE_DELAY_SECONDS", 0.02)
+    monkeypatch.setattr(Config, "TOOL_TIMEOUT_SECONDS", 1.0)
+    wrapped = resilient_tool(flaky_lookup, idempotent=True)
+
+    async def slow_then_fast():
+        BEHAVIOUR["delay"] = 0.5
+        call = asyncio.create_task(wrapped.ainvoke({"order_id": "A1"}))
+        await asyncio.sleep(0.01)
+        # The hedge started after the delay finds the backend fast again
+        BEHAVIOUR["delay"] = 0.0
+        start = time.perf_counter()
+        result = await call
+        return result, time.perf_counter() - start
+
+    result, elapsed = asyncio.run(slow_then_fast())
+    assert result == "Order A1 found" and len(CALLS) == 2
+    assert elapsed < 0.3
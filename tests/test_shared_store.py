@@ -0,0 +1,104 @@
+"""
+State shared by server worker processes: entries, caps, counters and rate limits.
+"""
+
+import asyncio
+import multiprocessing
+import time
+
+import pytest
+
+from src.core import shared_store
+from src.core.config import Config
+from src.core.shared_store import LocalStore, SharedStore
+from src.mcp import server
+from src.tools.cache import ToolResultCache
+
+
+@pytest.fixture(params=["shared", "local"])
+def store(request, tmp_path):
+    return SharedStore(str(tmp_path / "state.sqlite")) if request.param == "shared" else LocalStore()
+
+
+@pytest.fixture
+def shared(tmp_path, monkeypatch):
+    """Make get_shared_store() return a SharedStore in a temporary file."""
+    store = SharedStore(str(tmp_path / "state.sqlite"))
+    monkeypatch.setattr(shared_store, "_store", store)
+    return store
+
+
+def _count(path, times):
+    store = SharedStore(path)
+    for _ in range(times):
+        store.incr("count", "hits", ttl=60)
+
+
+def test_entries_expire_and_namespaces_are_separate(store):
+    store.set("a", "key", "1", ttl=60)
+    store.set("b", "key", "2", ttl=0.05)
+    assert store.get("a", "key") == (True, "1")
+    assert store.items("b") == {"key": "2"}
+
+    time.sleep(0.06)
+    assert store.get("b", "key") == (False, None)
+    assert store.purge_expired() == 1
+    store.clear("a")
+    assert store.items("a") == {}
+
+
+def test_max_entries_evicts_the_oldest(store):
+    for index in range(5):
+        store.set("tool:x", f"k{index}", str(index), ttl=60, max_entries=3)
+    assert store.items("tool:x") == {"k2": "2", "k3": "3", "k4": "4"}
+    # Other namespaces do not count towards the cap
+    store.set("tool:y", "k", "y", ttl=60, max_entries=1)
+    assert len(store.items("tool:x")) == 3
+
+
+def test_counter_restarts_when_its_window_expires(store):
+    assert [store.incr("rate", "c", ttl=0.05) for _ in range(3)] == [1, 2, 3]
+    assert store.incr("rate", "c", amount=2, ttl=0.05) == 5
+    time.sleep(0.06)
+    assert store.incr("rate", "c", ttl=0.05) == 1
+
+
+def test_worker_processes_share_counters(tmp_path):
+    path = str(tmp_path / "state.sqlite")
+    SharedStore(path)
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_count, args=(path, 25)) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+    assert SharedStore(path).incr("count", "hits", amount=0) == 50
+
+
+def test_shared_tool_cache_is_capped(shared):
+    cache = ToolResultCache(ttl=60, maxsize=2, name="capped", shared=True)
+    for name in ("A", "B", "C"):
+        cache.set(cache.make_key({"merchant_name": name}), f"{name} open")
+    assert len(shared.items("tool:capped")) == 2
+    assert cache.get(cache.make_key({"merchant_name": "A"})) == (False, None)
+    assert cache.get(cache.make_key({"merchant_name": "C"})) == (True, "C open")
+
+
+def test_rate_limit_window(shared, monkeypatch):
+    monkeypatch.setattr(Config, "AGENT_RATE_LIMIT_PER_MINUTE", 3)
+    clock = [600.0]
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+
+    async def attempts(count, cost=1):
+        return [await server._rate_limit_retry_after("10.0.0.1", cost) for _ in range(count)]
+
+    assert asyncio.run(attempts(3)) == [None, None, None]
+    clock[0] = 615.0
+    # Over the limit until the minute ends
+    assert asyncio.run(attempts(1)) == [45]
+    assert asyncio.run(server._rate_limit_retry_after("10.0.0.2")) is None
+
+    clock[0] = 660.0
+    assert asyncio.run(attempts(1)) == [None]
+    # A batch costs one per scenario
+    assert asyncio.run(attempts(1, cost=3)) == [60]
@@ -0,0 +1,111 @@
+"""
+Read-only tool results are reused for identical arguments, within TTL and size.
+"""
+
+import asyncio
+import time
+
+import pytest
+from langchain_core.tools import tool
+
+from src.tools.base import DEGRADED_PREFIX
+from src.tools.backends import simulation_seed
+from src.tools.cache import ToolResultCache, cached_tool
+from src.tools.registry import TOOL_CACHES, TOOLS_BY_NAME
+
+CALLS = []
+
+
+@tool
+def lookup(merchant_name: str, detail: str = "status") -> str:
+    """Look up a merchant."""
+    CALLS.append((merchant_name, detail))
+    if merchant_name == "Flaky":
+        return f"{DEGRADED_PREFIX} merchant service unavailable"
+    return f"{merchant_name}: {detail} #{len(CALLS)}"
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    CALLS.clear()
+
+
+def _cached(**options):
+    cache = ToolResultCache(**{"ttl": 60, "maxsize": 8, "name": "lookup", "shared": False, **options})
+    return cached_tool(lookup, cache), cache
+
+
+def test_identical_arguments_hit_and_others_miss():
+    cached, cache = _cached()
+    first = cached.invoke({"merchant_name": "Pizza Palace", "detail": "hours"})
+    # Argument order does not matter
+    assert cached.invoke({"detail": "hours", "merchant_name": "Pizza Palace"}) == first
+    assert cached.invoke({"merchant_name": "Sushi Bar", "detail": "hours"}) != first
+
+    assert len(CALLS) == 2
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 2, 2)
+
+
+def test_async_calls_share_the_cache():
+    cached, cache = _cached()
+    first = asyncio.run(cached.ainvoke({"merchant_name": "Pizza Palace"}))
+    assert asyncio.run(cached.ainvoke({"merchant_name": "Pizza Palace"})) == first
+    assert cached.invoke({"merchant_name": "Pizza Palace"}) == first
+    assert len(CALLS) == 1 and cache.hits == 2
+
+
+def test_degraded_results_are_not_cached():
+    cached, cache = _cached()
+    cached.invoke({"merchant_name": "Flaky"})
+    cached.invoke({"merchant_name": "Flaky"})
+    assert len(CALLS) == 2 and cache.hits == 0
+
+
+def test_entries_expire_after_ttl():
+    cached, _ = _cached(ttl=0.05)
+    cached.invoke({"merchant_name": "Pizza Palace"})
+    time.sleep(0.1)
+    cached.invoke({"merchant_name": "Pizza Palace"})
+    assert len(CALLS) == 2
+
+
+def test_least_recently_used_entry_is_evicted():
+    cached, cache = _cached(maxsize=2)
+    for name in ("A", "B", "A", "C"):
+        cached.invoke({"merchant_name": name})
+    assert cache.stats()["size"] == 2
+    # B was the least recently used when C arrived
+    cached.invoke({"merchant_name": "A"})
+    cached.invoke({"merchant_name": "B"})
+    assert CALLS == [("A", "status"), ("B", "status"), ("C", "status"), ("B", "status")]
+
+
+def test_seeded_cache_reuses_results_only_within_a_seed():
+    cached, cache = _cached(seeded=True)
+    with simulation_seed(7):
+        first = cached.invoke({"merchant_name": "Pizza Palace"})
+        assert cached.invoke({"merchant_name": "Pizza Palace"}) == first
+    with simulation_seed(8):
+        assert cached.invoke({"merchant_name": "Pizza Palace"}) != first
+    with simulation_seed(7):
+        assert cached.invoke({"merchant_name": "Pizza Palace"}) == first
+    assert len(CALLS) == 2 and cache.hits == 2
+
+
+def test_simulated_tool_replays_exactly_per_seed():
+    tool = TOOLS_BY_NAME["get_merchant_status"]
+    cache = TOOL_CACHES["get_merchant_status"]
+    cache.clear()
+
+    def run(seed):
+        with simulation_seed(seed):
+            return [asyncio.run(tool.ainvoke({"merchant_name": "Pizza Palace"})) for _ in range(2)]
+
+    first = run(11)
+    assert first[0] == first[1]
+    assert (cache.hits, cache.misses) == (1, 1)
+    # Another seed misses rather than reusing seed 11's outcome
+    run(12)
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert run(11) == first
@@ -0,0 +1,116 @@
+"""
+Operator sessions over /ws/session: bad messages and slow clients.
+"""
+
+import asyncio
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+from src.core.config import Config
+from src.mcp.server import app
+from src.mcp.ws_session import OperatorSession
+from src.utils.metrics import WS_BACKPRESSURE
+
+
+def _receive_until(websocket, event):
+    """Return the events received up to and including the first ``event``."""
+    events = []
+    while not events or events[-1]["event"] != event:
+        events.append(websocket.receive_json())
+    return events
+
+
+@pytest.mark.parametrize("frame, detail", [
+    ("not json", "Invalid message"),
+    ("[1, 2]", "message must be a JSON object"),
+    ('{"type": "scenario", "request_id": true, "scenario": "x"}', "request_id must be a string or an integer"),
+    ('{"type": "scenario", "request_id": {"a": 1}, "scenario": "x"}', "request_id must be a string or an integer"),
+    ('{"type": "scenario", "request_id": "r1"}', "Scenario is required"),
+    ('{"type": "scenario", "request_id": "r1", "scenario": ["x"]}', "Scenario is required"),
+    ('{"type": "scenario", "request_id": "r1", "scenario": "x", "context": [1]}', "context must be a JSON object"),
+    ('{"type": "cancel", "request_id": "missing"}', "No such scenario running"),
+    ('{"type": "shout"}', "Unknown message type 'shout'"),
+])
+def test_malformed_message_is_answered_without_closing_the_session(frame, detail):
+    with TestClient(app).websocket_connect("/ws/session") as websocket:
+        assert websocket.receive_json()["event"] == "session"
+        websocket.send_text(frame)
+        error = websocket.receive_json()
+        assert error["event"] == "error" and detail in error["data"]["detail"]
+
+        # The same connection keeps serving scenarios
+        websocket.send_json({"type": "ping", "request_id": 7})
+        assert websocket.receive_json() == {"request_id": 7, "event": "pong", "data": None}
+        websocket.send_json({"request_id": "r2", "scenario": "Heavy traffic on the route", "stream_tokens": False})
+        result = _receive_until(websocket, "result")[-1]
+        assert result["request_id"] == "r2" and result["data"]["success"]
+
+
+class _SlowWebSocket:
+    """A client that reads nothing until ``reading`` is set."""
+
+    client = None
+
+    def __init__(self):
+        self.reading = asyncio.Event()
+        self.sent = []
+
+    async def send_text(self, text):
+        await self.reading.wait()
+        self.sent.append(orjson.loads(text))
+
+
+def test_slow_client_applies_backpressure(monkeypatch):
+    monkeypatch.setattr(Config, "WS_SEND_QUEUE_SIZE", 2)
+
+    async def main():
+        websocket = _SlowWebSocket()
+        session = OperatorSession(websocket, runner=None)
+        sender = asyncio.create_task(session._send_loop())
+        before = WS_BACKPRESSURE.value()
+
+        # One event is held by the blocked sender, two fill the queue
+        for index in range(3):
+            await asyncio.wait_for(session.emit("tool_end", index), timeout=1)
+        blocked = asyncio.create_task(session.emit("tool_end", 3))
+        await asyncio.sleep(0.05)
+        assert not blocked.done() and session.outbound.qsize() == 2
+        assert WS_BACKPRESSURE.value() == before + 1
+
+        websocket.reading.set()
+        await asyncio.wait_for(blocked, timeout=1)
+        while len(websocket.sent) < 4:
+            await asyncio.sleep(0.01)
+        sender.cancel()
+        return [message["data"] for message in websocket.sent]
+
+    assert asyncio.run(main()) == [0, 1, 2, 3]
+
+
+def test_inflight_limit_rejects_extra_scenarios(monkeypatch):
+    monkeypatch.setattr(Config, "WS_MAX_INFLIGHT_PER_SESSION", 1)
+
+    async def main():
+        release = asyncio.Event()
+
+        async def runner(scenario, context, callbacks=None, agent=None):
+            await release.wait()
+            return {"success": True}
+
+        session = OperatorSession(_SlowWebSocket(), runner)
+        session.outbound = asyncio.Queue()
+        await session._handle(b'{"request_id": "a", "scenario": "first"}')
+        await session._handle(b'{"request_id": "a", "scenario": "again"}')
+        events = [session.outbound.get_nowait() for _ in range(session.outbound.qsize())]
+        assert [event["event"] for event in events] == ["start", "error"]
+        assert events[1]["data"]["detail"] == "A scenario with this request_id is already running"
+
+        await session._handle(b'{"request_id": "b", "scenario": "second"}')
+        assert "Session already runs 1 scenarios" in session.outbound.get_nowait()["data"]["detail"]
+        release.set()
+        await asyncio.gather(*session.runs.values())
+        assert session.runs == {}
+
+    asyncio.run(main())